@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+dbus-speak-notify.py — Speak desktop notifications as they arrive.
+
+Subscribes to Notify calls on org.freedesktop.Notifications as a D-Bus
+monitor and reads the arguments (app_name, replaces_id, app_icon, summary,
+body, ...) as structured data — no dbus-monitor text parsing. Messages are
+handed to the speechq.py queue (priorities, dedup, burst summaries); when the
+queue daemon is not running they go to speech-dispatcher over one persistent
+SSIP connection. Either way a burst of notifications (mail sync, build
+output) costs no process spawns and no fresh speech connections.
+
+What gets said is decided by a rules file (TOML, see
+notify-rules.toml.example). Each rule matches regular expressions against
+app_name, summary and body and then rewrites the message, drops it, or sets
+its queue priority. The rules are compiled at startup into one regular
+expression per field, so a notification is matched in three passes however
+many apps have rules; the file is reloaded when its modification time changes. Without
+a rules file the built-in defaults apply (Claude Code approvals, Proton apps
+collapsed to "Mail").
+
+Replaces dbus-speak-notify.sh and hp-speak-notify.
+
+Usage:
+  dbus-speak-notify.py [--log PATH] [--rules PATH]
+  dbus-speak-notify.py --check [--rules PATH] [APP SUMMARY [BODY]]
+
+Options:
+  --log     Log file (default: ~/.cache/dbus-notify-speak.log)
+  --rules   Rules file (default: ~/.config/scripts/notify-rules.toml)
+  --check   Validate the rules file; with APP SUMMARY [BODY], print what
+            would be spoken for that notification and exit
+
+Requirements:
+  - python-jeepney (D-Bus client)
+  - speech-dispatcher (provides the Python `speechd` module)
+"""
+
+import argparse
+import re
+import string
+import sys
+import time
+import tomllib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from jeepney import HeaderFields, MatchRule, MessageType
+from jeepney.bus_messages import Monitoring
+from jeepney.io.blocking import open_dbus_connection
+
+import speechd
+
+import speechq
+
+DEFAULT_LOG = Path.home() / ".cache" / "dbus-notify-speak.log"
+DEFAULT_RULES = Path.home() / ".config" / "scripts" / "notify-rules.toml"
+
+FIELDS = ("app", "summary", "body")
+
+# Used when the rules file does not exist — the behaviour of the old bash script
+BUILTIN_RULES = [
+    {"name": "claude-approval", "summary": "^claude code$", "body": "permission|approval",
+     "say": "Claude needs approval", "priority": "approval"},
+    {"name": "claude", "summary": "^claude code$", "say": "Claude"},
+    {"name": "proton-app", "app": "proton", "say": "Mail"},
+    {"name": "proton-summary", "summary": "proton", "say": "Mail"},
+]
+
+
+@dataclass
+class Rule:
+    name: str
+    say: str | None = None        # template with {app}, {summary}, {body}
+    drop: bool = False
+    priority: str = "notify"
+    fields: tuple[str, ...] = ()  # fields with a pattern; all must match
+
+
+def compile_rules(entries: list[dict]) -> tuple[dict[str, re.Pattern], list[Rule]]:
+    """Compile rule tables into one matcher per field and the rules in order.
+
+    A field's matcher runs against that field's text alone, so a pattern
+    can never reach into another field. It holds an optional lookahead per
+    rule with a pattern for the field, each followed by an empty group
+    r<index>: one match() reports every rule the field satisfies
+    (match[f"r{i}"] is "" for those, None for the rest).
+    """
+    if not isinstance(entries, list) or not all(isinstance(e, dict) for e in entries):
+        raise ValueError("rules must be [[rule]] tables")
+    parts: dict[str, list[str]] = {field: [] for field in FIELDS}
+    rules = []
+    for i, entry in enumerate(entries):
+        name = entry.get("name", f"rule {i + 1}")
+        if not isinstance(name, str):
+            raise ValueError(f"rule {i + 1}: name must be a string")
+        unknown = set(entry) - {"name", "say", "drop", "priority", *FIELDS}
+        if unknown:
+            raise ValueError(f"{name}: unknown keys {', '.join(sorted(unknown))}")
+        for key in ("say", "priority", *FIELDS):
+            if key in entry and not isinstance(entry[key], str):
+                raise ValueError(f"{name}: {key} must be a string")
+        if not isinstance(entry.get("drop", False), bool):
+            raise ValueError(f"{name}: drop must be true or false")
+        priority = entry.get("priority", "notify")
+        if priority not in speechq.PRIORITIES:
+            raise ValueError(f"{name}: unknown priority {priority!r}")
+        if "say" not in entry and not entry.get("drop") and "priority" not in entry:
+            raise ValueError(f"{name}: needs at least one of say, drop, priority")
+        if "say" in entry:
+            _check_template(name, entry["say"])
+
+        fields = tuple(field for field in FIELDS if field in entry)
+        for field in fields:
+            _check_pattern(name, field, entry[field])
+            parts[field].append(rf"(?:(?=.*?(?:{entry[field]}))(?P<r{i}>))?")
+        rules.append(Rule(name=name, say=entry.get("say"), drop=entry.get("drop", False),
+                          priority=priority, fields=fields))
+
+    matchers = {}
+    for field in FIELDS:
+        try:
+            matchers[field] = re.compile("".join(parts[field]), re.IGNORECASE | re.DOTALL)
+        except (re.error, OverflowError, RecursionError) as e:
+            raise ValueError(f"{field} patterns do not combine: {e}") from None
+    return matchers, rules
+
+
+def _check_pattern(name: str, field: str, pattern: str) -> None:
+    """Reject patterns that would break, or change meaning, once concatenated."""
+    try:
+        compiled = re.compile(pattern)
+    except (re.error, OverflowError, RecursionError) as e:
+        raise ValueError(f"{name}: bad {field} pattern: {e}") from None
+    # Group names must be unique across the combined expression, and group
+    # numbers shift with every rule before this one
+    if compiled.groupindex:
+        raise ValueError(f"{name}: {field} pattern uses named groups; use (?:...)")
+    if compiled.groups and re.search(r"(?<!\\)(?:\\\\)*\\[1-9]", pattern):
+        raise ValueError(f"{name}: {field} pattern uses backreferences")
+
+
+def _check_template(name: str, say: str) -> None:
+    """Reject say templates that str.format would fail on at notification time."""
+    try:
+        parsed = list(string.Formatter().parse(say))
+    except ValueError as e:
+        raise ValueError(f"{name}: bad say template: {e}") from None
+    for _literal, field, _spec, _conversion in parsed:
+        if field is not None and re.split(r"[.\[]", field)[0] not in FIELDS:
+            raise ValueError(f"{name}: say uses {{{field}}}; only "
+                             + ", ".join(f"{{{f}}}" for f in FIELDS) + " are available")
+
+
+class NotifyRules:
+    """The compiled rules file, reloaded when its mtime changes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._mtime: float | None = None
+        self._matchers, self._rules = compile_rules(BUILTIN_RULES)
+
+    def reload_if_changed(self) -> bool:
+        """Recompile if the file changed. Returns True on reload.
+
+        Raises ValueError (and keeps the previous rules) if the file can't be
+        read or is invalid; it is not retried until it changes again.
+        """
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        except OSError as e:
+            raise ValueError(f"{self.path}: {e}") from None
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        if mtime is None:
+            entries = BUILTIN_RULES
+        else:
+            try:
+                with self.path.open("rb") as f:
+                    entries = tomllib.load(f).get("rule", [])
+            except (OSError, tomllib.TOMLDecodeError) as e:
+                raise ValueError(f"{self.path}: {e}") from None
+        try:
+            self._matchers, self._rules = compile_rules(entries)
+        except ValueError as e:
+            raise ValueError(f"{self.path}: {e}") from None
+        return True
+
+    def apply(self, app_name: str, summary: str, body: str) -> tuple[str, str] | None:
+        """Return (text to speak, queue priority), or None to drop the message."""
+        fields = {"app": app_name, "summary": summary, "body": body}
+        default = f"{summary}. {body}" if body else summary
+
+        # A multi-line body is matched as one line, so $ still means its end
+        hits = {f: self._matchers[f].match(" ".join(fields[f].splitlines())) for f in FIELDS}
+        rule = next((rule for i, rule in enumerate(self._rules)
+                     if all(hits[f][f"r{i}"] is not None for f in rule.fields)), None)
+        if rule is None:
+            return default, "notify"
+        if rule.drop:
+            return None
+        if rule.say is None:
+            return default, rule.priority
+        try:
+            return rule.say.format_map(fields).strip(), rule.priority
+        except (KeyError, ValueError, IndexError, AttributeError):
+            return default, rule.priority     # e.g. {body[9]} on a short body
+
+
+class Speaker:
+    """Queue through speechq, else one long-lived speech-dispatcher connection."""
+
+    def __init__(self, name: str = "dbus-speak-notify"):
+        self.name = name
+        self._client: speechd.SSIPClient | None = None
+
+    def _connect(self) -> speechd.SSIPClient:
+        if self._client is None:
+            # autospawn starts speech-dispatcher if it is not running yet
+            self._client = speechd.SSIPClient(self.name, autospawn=True)
+        return self._client
+
+    def speak(self, text: str, priority: str = "notify", source: str = "") -> bool:
+        """Speak text. Returns False if speech-dispatcher could not be reached."""
+        if speechq.say(text, priority=priority, source=source):
+            return True
+        for _ in range(2):
+            try:
+                self._connect().speak(text)
+                return True
+            except (speechd.SSIPCommunicationError, speechd.SpawnError, OSError):
+                # Stale connection: reconnect once. If it is still down, drop
+                # this message; the next notification tries again.
+                self.close()
+        return False
+
+    def close(self) -> None:
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+            self._client = None
+
+
+def notifications():
+    """Yield (app_name, summary, body) for every Notify call on the session bus."""
+    conn = open_dbus_connection(bus="SESSION")
+    rule = MatchRule(
+        type="method_call",
+        interface="org.freedesktop.Notifications",
+        member="Notify",
+    )
+    conn.send_and_get_reply(Monitoring().BecomeMonitor([rule.serialise()]))
+    try:
+        while True:
+            msg = conn.receive()
+            if msg.header.message_type != MessageType.method_call:
+                continue
+            if msg.header.fields.get(HeaderFields.member) != "Notify":
+                continue
+            # Notify(s app_name, u replaces_id, s app_icon, s summary, s body,
+            #        as actions, a{sv} hints, i expire_timeout)
+            app_name, _replaces_id, _icon, summary, body = msg.body[:5]
+            yield app_name, summary, body
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", default=str(DEFAULT_LOG),
+                        help=f"Log file (default: {DEFAULT_LOG})")
+    parser.add_argument("--rules", default=str(DEFAULT_RULES),
+                        help=f"Rules file (default: {DEFAULT_RULES})")
+    parser.add_argument("--check", nargs="*", metavar="FIELD",
+                        help="Validate the rules; with APP SUMMARY [BODY], show the result")
+    args = parser.parse_args()
+
+    rules = NotifyRules(Path(args.rules))
+    if args.check is not None:
+        try:
+            rules.reload_if_changed()
+        except ValueError as e:
+            print(f"Invalid rules: {e}", file=sys.stderr)
+            return 1
+        if len(args.check) not in (0, 2, 3):
+            parser.error("--check takes APP SUMMARY [BODY]")
+        if args.check:
+            app_name, summary, body = (args.check + [""])[:3]
+            result = rules.apply(app_name, summary, body)
+            print("(dropped)" if result is None else f"[{result[1]}] {result[0]}")
+        return 0
+
+    log_path = Path(args.log)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log = log_path.open("w", buffering=1)
+    log.write(f"=== dbus-notify-speak started {datetime.now():%c} ===\n")
+
+    speaker = Speaker()
+    while True:
+        try:
+            for app_name, summary, body in notifications():
+                try:
+                    if rules.reload_if_changed():
+                        log.write(f"Loaded rules from {rules.path}\n")
+                except ValueError as e:
+                    log.write(f"Invalid rules, keeping previous set: {e}\n")
+                result = rules.apply(app_name, summary, body)
+                if result is None:
+                    log.write(f"Dropped: app={app_name} summary={summary}\n")
+                    continue
+                msg, priority = result
+                log.write(f"Speaking: {msg}\n")
+                log.write(f"  app={app_name} summary={summary} body={body}\n")
+                if not speaker.speak(msg, priority=priority, source=app_name):
+                    log.write("  speech-dispatcher unavailable, message dropped\n")
+        except KeyboardInterrupt:
+            break
+        except (ConnectionError, OSError) as e:
+            # Session bus went away (logout, dbus restart) — retry shortly
+            log.write(f"D-Bus connection lost: {e}\n")
+            time.sleep(2)
+
+    speaker.close()
+    log.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+ocrd.py — Resident OCR service for sr-read-screen.sh and sr-read-mouse.sh.
+
+Keeps one Tesseract API handle (tesserocr) warm, so a read no longer pays for
+a tesseract process start and a reload of the language data. Captures come
+from `grim -t ppm -` on stdout and are decoded straight into a NumPy array;
+the ImageMagick pre-processing (alpha off, grayscale, negate, resize,
+contrast stretch, border) is done in memory. No temp files.
+
+Hover mode (`read --mouse --hover`) splits the region into tiles along blank
+background rows and columns (text lines and word groups), hashes each tile
+and only OCRs tiles it has not seen before — recognised text is cached by
+tile hash with LRU eviction. Only text from tiles that were not part of the
+previous hover read is returned, so moving back over the same toolbar is a
+cache hit and repeated triggers over unchanged pixels say nothing new.
+
+Modes match the two shell scripts:
+  mouse   always negate, 200% resize                  (sr-read-mouse.sh)
+  screen  negate only on a dark background, 300%
+          resize, 20px white border                   (sr-read-screen.sh)
+
+Protocol: JSON lines on the stream socket $XDG_RUNTIME_DIR/ocrd.sock
+  {"op": "read", "mode": "mouse", "width": 600, "height": 200}
+  {"op": "read", "mode": "screen", "geometry": "10,20 300x80"}
+  {"op": "read", "mode": "screen", "path": "/path/to/screenshot.png"}
+    -> {"text": "...", "timings_ms": {"capture": ..., "preprocess": ..., "ocr": ...}}
+  add "hover": true to any read for changed-region reading; the reply also
+  carries {"tiles": N, "ocr_tiles": N, "cache_hits": N}
+
+Usage:
+  ocrd.py serve [--lang eng] [--cache-size N]
+  ocrd.py read (--mouse [--width W --height H] | --geometry GEOM | --path PNG) [--mode M] [--hover]
+  ocrd.py ocr [--mode M] IMAGE...            # in-process, no daemon (saved screenshots)
+  ocrd.py bench [--mode M] [-n RUNS] IMAGE...  # per-read latency vs convert | tesseract
+
+`read` exits 1 when the daemon is not running, so callers can fall back to
+the grim | convert | tesseract pipeline.
+
+Requirements:
+  - python-tesserocr, python-numpy, python-pillow
+  - grim; slurp (for sr-read-screen.sh)
+  - imagemagick + tesseract only for `bench` (the pipeline it compares against)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shlex
+import socket
+import statistics
+import subprocess as sp
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageOps
+
+SOCKET_PATH = Path(os.environ.get("XDG_RUNTIME_DIR", "/tmp")) / "ocrd.sock"
+
+MODES = {
+    # negate: True = always, None = only on a dark background
+    "mouse":  {"negate": True, "scale": 2, "border": 0},
+    "screen": {"negate": None, "scale": 3, "border": 20},
+}
+
+# Rec. 709 luma, as used by ImageMagick's -colorspace gray
+_LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+# Hover tiling: a row/column is background if its pixel range stays below
+# BLANK_RANGE; word groups are split on column gaps at least COLUMN_GAP wide.
+BLANK_RANGE = 24.0
+COLUMN_GAP = 12
+MIN_TILE = 4
+
+
+# ── capture ───────────────────────────────────────────────────────────────────
+
+def hypr_cursor() -> tuple[int, int]:
+    """Cursor position via Hyprland IPC (what `hyprctl cursorpos` prints)."""
+    sig = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE", "")
+    path = Path(os.environ.get("XDG_RUNTIME_DIR", "/tmp")) / "hypr" / sig / ".socket.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(path))
+        s.sendall(b"cursorpos")
+        reply = s.recv(256).decode()
+    x, y = (int(float(v)) for v in reply.split(","))
+    return x, y
+
+
+def mouse_geometry(width: int, height: int) -> str:
+    x, y = hypr_cursor()
+    return f"{max(0, x - width // 2)},{max(0, y - height // 2)} {width}x{height}"
+
+
+def decode_ppm(data: bytes) -> np.ndarray:
+    """Decode a binary PPM (P6) into an (h, w, 3) uint8 array without copying."""
+    fields, pos = [], 0
+    while len(fields) < 4:
+        while data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b"#":
+            pos = data.index(b"\n", pos)
+            continue
+        end = pos
+        while not data[end:end + 1].isspace():
+            end += 1
+        fields.append(data[pos:end])
+        pos = end
+    magic, width, height, maxval = fields[0], int(fields[1]), int(fields[2]), int(fields[3])
+    if magic != b"P6" or maxval != 255:
+        raise ValueError("expected an 8-bit binary PPM")
+    pixels = np.frombuffer(data, dtype=np.uint8, count=width * height * 3, offset=pos + 1)
+    return pixels.reshape(height, width, 3)
+
+
+def grab(geometry: str) -> np.ndarray:
+    data = sp.run(["grim", "-g", geometry, "-t", "ppm", "-"],
+                  capture_output=True, check=True).stdout
+    return decode_ppm(data)
+
+
+def load_image(path: str) -> np.ndarray:
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGB"))
+
+
+# ── pre-processing ────────────────────────────────────────────────────────────
+
+def to_gray(rgb: np.ndarray, mode: str) -> np.ndarray:
+    """Grayscale and, depending on the mode, negate to dark text on light."""
+    gray = rgb[..., :3].astype(np.float32) @ _LUMA
+    negate = MODES[mode]["negate"]
+    if negate is None:
+        negate = gray.mean() < 127.5
+    return 255.0 - gray if negate else gray
+
+
+def finish(gray: np.ndarray, mode: str) -> Image.Image:
+    """Contrast stretch → resize → border."""
+    opts = MODES[mode]
+    # -contrast-stretch 0: map the darkest pixel to black and brightest to white
+    lo, hi = float(gray.min()), float(gray.max())
+    if hi > lo:
+        gray = (gray - lo) * (255.0 / (hi - lo))
+
+    img = Image.fromarray(gray.astype(np.uint8))
+    scale = opts["scale"]
+    img = img.resize((img.width * scale, img.height * scale), Image.LANCZOS)
+    if opts["border"]:
+        img = ImageOps.expand(img, border=opts["border"], fill=255)
+    return img
+
+
+def preprocess(rgb: np.ndarray, mode: str) -> Image.Image:
+    """Grayscale → negate → contrast stretch → resize → border, in memory."""
+    return finish(to_gray(rgb, mode), mode)
+
+
+def _runs(mask: np.ndarray, min_gap: int = 1) -> list[tuple[int, int]]:
+    """Return [start, end) spans where mask is True, merging gaps < min_gap."""
+    spans: list[list[int]] = []
+    for i in np.flatnonzero(mask):
+        if spans and i - spans[-1][1] < min_gap:
+            spans[-1][1] = i + 1
+        else:
+            spans.append([i, i + 1])
+    return [(a, b) for a, b in spans]
+
+
+def segment_tiles(gray: np.ndarray) -> list[tuple[int, int, int, int]]:
+    """Split a region into (y0, y1, x0, x1) tiles along blank background.
+
+    Rows are grouped into text lines, then each line is split into word
+    groups on wide blank column gaps. Tiles follow the content, so the same
+    toolbar produces the same tiles wherever it sits in the capture.
+    """
+    tiles = []
+    ink_rows = np.ptp(gray, axis=1) >= BLANK_RANGE
+    for y0, y1 in _runs(ink_rows):
+        band = gray[y0:y1]
+        ink_cols = np.ptp(band, axis=0) >= BLANK_RANGE
+        for x0, x1 in _runs(ink_cols, min_gap=COLUMN_GAP):
+            if y1 - y0 >= MIN_TILE and x1 - x0 >= MIN_TILE:
+                tiles.append((y0, y1, x0, x1))
+    return tiles
+
+
+def tile_hash(rgb: np.ndarray, mode: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{mode}:{rgb.shape}".encode())
+    h.update(np.ascontiguousarray(rgb).tobytes())
+    return h.hexdigest()
+
+
+def clean_text(text: str) -> str:
+    """Collapse newlines and runs of spaces, as the shell scripts do with tr/sed."""
+    return " ".join(text.split())
+
+
+# ── engine ────────────────────────────────────────────────────────────────────
+
+class OcrEngine:
+    """One warm Tesseract handle. Tesseract is not thread-safe; calls are serialised."""
+
+    def __init__(self, lang: str = "eng"):
+        from tesserocr import PSM, PyTessBaseAPI
+        # psm 6: assume a single uniform block of text (same as the scripts)
+        self._api = PyTessBaseAPI(lang=lang, psm=PSM.SINGLE_BLOCK)
+        self._lock = threading.Lock()
+
+    def recognize(self, img: Image.Image) -> str:
+        with self._lock:
+            self._api.SetImage(img)
+            return self._api.GetUTF8Text()
+
+    def read(self, rgb: np.ndarray, mode: str) -> tuple[str, dict]:
+        t0 = time.perf_counter()
+        img = preprocess(rgb, mode)
+        t1 = time.perf_counter()
+        text = clean_text(self.recognize(img))
+        t2 = time.perf_counter()
+        return text, {"preprocess": (t1 - t0) * 1000, "ocr": (t2 - t1) * 1000}
+
+    def close(self) -> None:
+        self._api.End()
+
+
+class TextCache:
+    """OCR text keyed by tile hash, least recently used evicted first."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class HoverReader:
+    """Changed-region reading: OCR only unseen tiles, report only new text."""
+
+    def __init__(self, engine: OcrEngine, cache: TextCache):
+        self.engine = engine
+        self.cache = cache
+        self._last_read: set[str] = set()
+        self._lock = threading.Lock()
+
+    def read(self, rgb: np.ndarray, mode: str) -> tuple[str, dict]:
+        t0 = time.perf_counter()
+        gray = to_gray(rgb, mode)
+        tiles = segment_tiles(gray)
+        ocr_ms = 0.0
+        stats = {"tiles": len(tiles), "ocr_tiles": 0, "cache_hits": 0}
+        seen, new_text = set(), []
+
+        with self._lock:
+            for y0, y1, x0, x1 in tiles:
+                key = tile_hash(rgb[y0:y1, x0:x1], mode)
+                if key in seen:
+                    continue
+                seen.add(key)
+                text = self.cache.get(key)
+                if text is None:
+                    t = time.perf_counter()
+                    text = clean_text(self.engine.recognize(finish(gray[y0:y1, x0:x1], mode)))
+                    ocr_ms += (time.perf_counter() - t) * 1000
+                    self.cache.put(key, text)
+                    stats["ocr_tiles"] += 1
+                else:
+                    stats["cache_hits"] += 1
+                if text and key not in self._last_read:
+                    new_text.append(text)
+            self._last_read = seen
+
+        total_ms = (time.perf_counter() - t0) * 1000
+        return " ".join(new_text), {"preprocess": total_ms - ocr_ms, "ocr": ocr_ms, **stats}
+
+
+# ── daemon ────────────────────────────────────────────────────────────────────
+
+class Server:
+    def __init__(self, engine: OcrEngine, cache_size: int = 1024):
+        self.engine = engine
+        self.hover = HoverReader(engine, TextCache(cache_size))
+
+    def handle_request(self, req: dict) -> dict:
+        if req.get("op") != "read":
+            return {"error": f"unknown op: {req.get('op')}"}
+        mode = req.get("mode", "screen")
+        if mode not in MODES:
+            return {"error": f"unknown mode: {mode}"}
+
+        t0 = time.perf_counter()
+        if req.get("path"):
+            rgb = load_image(req["path"])
+        else:
+            geometry = req.get("geometry") or mouse_geometry(
+                int(req.get("width", 600)), int(req.get("height", 200)))
+            rgb = grab(geometry)
+        capture_ms = (time.perf_counter() - t0) * 1000
+
+        if req.get("hover"):
+            text, timings = self.hover.read(rgb, mode)
+            counts = {k: timings.pop(k) for k in ("tiles", "ocr_tiles", "cache_hits")}
+            return {"text": text, "timings_ms": {"capture": capture_ms, **timings}, **counts}
+        text, timings = self.engine.read(rgb, mode)
+        return {"text": text, "timings_ms": {"capture": capture_ms, **timings}}
+
+    def handle(self, conn: socket.socket) -> None:
+        try:
+            with conn, conn.makefile("rwb") as f:
+                for line in f:
+                    try:
+                        reply = self.handle_request(json.loads(line))
+                    except (ValueError, OSError, sp.CalledProcessError) as e:
+                        reply = {"error": str(e)}
+                    f.write(json.dumps(reply).encode() + b"\n")
+                    f.flush()
+        except OSError:
+            pass  # client went away
+
+    def serve_forever(self) -> None:
+        SOCKET_PATH.unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(SOCKET_PATH))
+        sock.listen()
+        try:
+            while True:
+                conn, _ = sock.accept()
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        finally:
+            sock.close()
+            SOCKET_PATH.unlink(missing_ok=True)
+
+
+def request(req: dict) -> dict:
+    """Send one request to the daemon. Raises OSError if it is not running."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(SOCKET_PATH))
+        s.sendall(json.dumps(req).encode() + b"\n")
+        with s.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("ocrd closed the connection")
+    return json.loads(line)
+
+
+# ── benchmark ─────────────────────────────────────────────────────────────────
+
+def pipeline_cmd(path: str, mode: str) -> str:
+    """The convert | tesseract pipeline the shell scripts used, for comparison."""
+    path = shlex.quote(path)
+    if mode == "mouse":
+        convert = f"convert {path} -alpha off -colorspace gray -negate -resize 200% -contrast-stretch 0 tiff:-"
+    else:
+        # sr-read-screen.sh also measures the mean with a second convert call
+        convert = (f"convert {path} -alpha off -colorspace gray -format '%[fx:mean]' info: >/dev/null; "
+                   f"convert {path} -alpha off -colorspace gray -negate -resize 300% "
+                   f"-contrast-stretch 0 -bordercolor White -border 20x20 tiff:-")
+    return f"{convert} | tesseract stdin stdout -l eng --psm 6 2>/dev/null"
+
+
+def bench(images: list[str], mode: str, runs: int, lang: str) -> None:
+    t0 = time.perf_counter()
+    engine = OcrEngine(lang)
+    print(f"Tesseract handle warm-up: {(time.perf_counter() - t0) * 1000:.0f} ms (paid once per daemon)\n")
+
+    print(f"{'image':<32} {'in-process ms':>14} {'pipeline ms':>12} {'speedup':>8}")
+    for path in images:
+        warm, cold = [], []
+        for _ in range(runs):
+            t = time.perf_counter()
+            engine.read(load_image(path), mode)
+            warm.append((time.perf_counter() - t) * 1000)
+
+            t = time.perf_counter()
+            sp.run(pipeline_cmd(path, mode), shell=True, capture_output=True)
+            cold.append((time.perf_counter() - t) * 1000)
+        w, c = statistics.median(warm), statistics.median(cold)
+        print(f"{Path(path).name[:32]:<32} {w:>14.1f} {c:>12.1f} {c / w:>7.1f}x")
+    engine.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="Run the OCR daemon")
+    p_serve.add_argument("--lang", default="eng", help="Tesseract language (default: eng)")
+    p_serve.add_argument("--cache-size", type=int, default=1024,
+                         help="Hover-mode OCR cache entries (default: 1024)")
+
+    p_read = sub.add_parser("read", help="Ask the daemon to read a region and print the text")
+    src = p_read.add_mutually_exclusive_group(required=True)
+    src.add_argument("--mouse", action="store_true", help="Region centred on the mouse cursor")
+    src.add_argument("--geometry", help='grim geometry, e.g. "10,20 300x80" (from slurp)')
+    src.add_argument("--path", help="Read a saved screenshot instead of capturing")
+    p_read.add_argument("--width", type=int, default=600)
+    p_read.add_argument("--height", type=int, default=200)
+    p_read.add_argument("--mode", choices=list(MODES), default=None,
+                        help="Pre-processing mode (default: mouse for --mouse, else screen)")
+    p_read.add_argument("--hover", action="store_true",
+                        help="Changed-region reading: print only text not in the previous hover read")
+
+    for name, help_text in [("ocr", "OCR saved screenshots in-process (no daemon)"),
+                            ("bench", "Compare per-read latency against convert | tesseract")]:
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("images", nargs="+")
+        p.add_argument("--mode", choices=list(MODES), default="screen")
+        p.add_argument("--lang", default="eng")
+        if name == "bench":
+            p.add_argument("-n", "--runs", type=int, default=5, help="Runs per image (default: 5)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = Server(OcrEngine(args.lang), cache_size=args.cache_size)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "read":
+        mode = args.mode or ("mouse" if args.mouse else "screen")
+        req = {"op": "read", "mode": mode, "hover": args.hover}
+        if args.mouse:
+            req.update(width=args.width, height=args.height)
+        elif args.geometry:
+            req["geometry"] = args.geometry
+        else:
+            req["path"] = str(Path(args.path).resolve())
+        try:
+            reply = request(req)
+        except OSError:
+            print("ocrd is not running", file=sys.stderr)
+            sys.exit(1)
+        if "error" in reply:
+            print(f"ocrd: {reply['error']}", file=sys.stderr)
+            sys.exit(1)
+        print(reply["text"])
+    elif args.command == "ocr":
+        engine = OcrEngine(args.lang)
+        for path in args.images:
+            text, timings = engine.read(load_image(path), args.mode)
+            print(f"== {path} ({timings['preprocess'] + timings['ocr']:.0f} ms)\n{text}")
+        engine.close()
+    elif args.command == "bench":
+        bench(args.images, args.mode, args.runs, args.lang)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+piper-server.py — Resident Piper TTS server with streaming sentence playback.
+
+Loads the Piper voice named by $PIPER_MODEL once and keeps it in memory, so a
+screen read no longer pays the ONNX model load before the first word. Input
+is split into sentences; playback starts as soon as the first sentence is
+synthesized while the rest are synthesized ahead of the player. A cancel
+request (or a new speak request) kills the player immediately and abandons
+the remaining sentences.
+
+Protocol: JSON lines on the stream socket $XDG_RUNTIME_DIR/piper-tts.sock
+  {"op": "speak", "text": "..."}  -> {"done": true}, {"cancelled": true}
+                                     or {"error": "..."}
+  {"op": "cancel"}                -> {"ok": true}
+
+Usage:
+  piper-server.py serve [--model PATH] [--config PATH] [--player CMD]
+  piper-server.py say [--wait] [TEXT]     # TEXT or stdin
+  piper-server.py cancel
+
+`say` and `cancel` exit 1 when the server is not running; `serve` exits 1
+when the player command is not installed.
+
+Requirements:
+  - piper-tts (Python package, in ~/Scripts/.venvs/tts)
+  - aplay (alsa-utils) or another player reading raw S16_LE mono on stdin
+"""
+
+import argparse
+import json
+import os
+import queue
+import re
+import shlex
+import shutil
+import socket
+import subprocess as sp
+import sys
+import threading
+from pathlib import Path
+
+SOCKET_PATH = Path(os.environ.get("XDG_RUNTIME_DIR", "/tmp")) / "piper-tts.sock"
+VOICES = Path.home() / ".local/share/piper/voices/en_US"
+DEFAULT_MODEL = os.environ.get("PIPER_MODEL", str(VOICES / "en_US-amy-medium.onnx"))
+DEFAULT_CONFIG = os.environ.get("PIPER_CONFIG", str(VOICES / "en_US-amy-medium.onnx.json"))
+DEFAULT_PLAYER = "aplay -q -t raw -f S16_LE -c 1 -r {rate}"
+
+# Split after ., ! or ? followed by whitespace, and on blank lines. OCR output
+# often lacks punctuation, so very long runs are also cut at commas.
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_MAX_SENTENCE = 300
+
+
+def split_sentences(text: str) -> list[str]:
+    sentences = []
+    for part in _SENTENCE_END.split(text):
+        part = " ".join(part.split())
+        while len(part) > _MAX_SENTENCE:
+            cut = part.rfind(", ", 0, _MAX_SENTENCE)
+            cut = cut + 1 if cut > 0 else _MAX_SENTENCE
+            sentences.append(part[:cut].strip())
+            part = part[cut:].strip()
+        if part:
+            sentences.append(part)
+    return sentences
+
+
+class Voice:
+    """The loaded Piper voice. Synthesis is serialised — one ONNX session."""
+
+    def __init__(self, model: str, config: str | None):
+        from piper import PiperVoice
+        self._voice = PiperVoice.load(model, config_path=config)
+        self.sample_rate = self._voice.config.sample_rate
+        self._lock = threading.Lock()
+
+    def synthesize(self, sentence: str) -> bytes:
+        with self._lock:
+            if hasattr(self._voice, "synthesize_stream_raw"):
+                # piper-tts 1.2
+                return b"".join(self._voice.synthesize_stream_raw(sentence))
+            # piper-tts >= 1.3 yields AudioChunk objects
+            return b"".join(c.audio_int16_bytes for c in self._voice.synthesize(sentence))
+
+
+class Utterance:
+    """One speak request: a synth loop feeding a player through a queue."""
+
+    def __init__(self, voice: Voice, player_argv: list[str]):
+        self.voice = voice
+        self.cancelled = threading.Event()
+        self._chunks: queue.Queue[bytes | None] = queue.Queue()
+        self._player = sp.Popen(player_argv, stdin=sp.PIPE,
+                                stdout=sp.DEVNULL, stderr=sp.DEVNULL)
+
+    def _feed_player(self) -> None:
+        try:
+            while (chunk := self._chunks.get()) is not None:
+                self._player.stdin.write(chunk)
+                self._player.stdin.flush()
+            self._player.stdin.close()
+        except (BrokenPipeError, ValueError, OSError):
+            pass  # player killed by cancel()
+
+    def run(self, text: str) -> bool:
+        """Speak text; returns False if cancelled before playback finished."""
+        writer = threading.Thread(target=self._feed_player, daemon=True)
+        writer.start()
+        for sentence in split_sentences(text):
+            if self.cancelled.is_set():
+                break
+            self._chunks.put(self.voice.synthesize(sentence))
+        self._chunks.put(None)
+        writer.join()
+        self._player.wait()
+        return not self.cancelled.is_set()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        if self._player.poll() is None:
+            self._player.kill()
+
+
+class Server:
+    def __init__(self, voice: Voice, player: str):
+        self.voice = voice
+        self.player_argv = shlex.split(player.format(rate=voice.sample_rate))
+        self._current: Utterance | None = None
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+
+    def speak(self, text: str) -> bool:
+        utt = Utterance(self.voice, self.player_argv)
+        with self._lock:
+            # Latest request wins — a new read replaces the one still talking
+            if self._current is not None:
+                self._current.cancel()
+            self._current = utt
+        try:
+            return utt.run(text)
+        finally:
+            with self._lock:
+                if self._current is utt:
+                    self._current = None
+
+    def handle(self, conn: socket.socket) -> None:
+        try:
+            with conn, conn.makefile("rwb") as f:
+                for line in f:
+                    try:
+                        req = json.loads(line)
+                    except ValueError:
+                        continue
+                    if req.get("op") == "cancel":
+                        self.cancel()
+                        reply = {"ok": True}
+                    elif req.get("op") == "speak":
+                        try:
+                            finished = self.speak(str(req.get("text", "")))
+                        except OSError as e:
+                            # The player was uninstalled or can't run; say so
+                            print(f"Cannot start {self.player_argv[0]}: {e}", file=sys.stderr)
+                            reply = {"error": f"cannot start player: {e}"}
+                        else:
+                            reply = {"done": True} if finished else {"cancelled": True}
+                    else:
+                        reply = {"error": f"unknown op: {req.get('op')}"}
+                    f.write(json.dumps(reply).encode() + b"\n")
+                    f.flush()
+        except OSError:
+            pass  # client hung up without waiting for the reply (fire-and-forget)
+
+    def serve_forever(self) -> None:
+        SOCKET_PATH.unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(SOCKET_PATH))
+        sock.listen()
+        try:
+            while True:
+                conn, _ = sock.accept()
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        finally:
+            sock.close()
+            SOCKET_PATH.unlink(missing_ok=True)
+
+
+# ── client ────────────────────────────────────────────────────────────────────
+
+def request(req: dict, wait: bool = True) -> dict | None:
+    """Send a request to the server. Raises OSError if it is not running.
+
+    With wait=False the request is sent and the connection closed without
+    waiting for playback to finish.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(SOCKET_PATH))
+        s.sendall(json.dumps(req).encode() + b"\n")
+        if not wait:
+            return None
+        with s.makefile("rb") as f:
+            line = f.readline()
+    return json.loads(line) if line else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="Load the voice and serve requests")
+    p_serve.add_argument("--model", default=DEFAULT_MODEL, help="Piper .onnx voice (default: $PIPER_MODEL)")
+    p_serve.add_argument("--config", default=DEFAULT_CONFIG, help="Voice .onnx.json (default: $PIPER_CONFIG)")
+    p_serve.add_argument("--player", default=DEFAULT_PLAYER,
+                         help=f"Raw audio player command; {{rate}} is filled in (default: '{DEFAULT_PLAYER}')")
+
+    p_say = sub.add_parser("say", help="Speak text (replaces anything currently playing)")
+    p_say.add_argument("text", nargs="?", help="Text to speak (default: read stdin)")
+    p_say.add_argument("--wait", action="store_true", help="Block until playback finishes")
+
+    sub.add_parser("cancel", help="Stop speaking immediately")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        player = shlex.split(args.player)
+        if not player or not shutil.which(player[0]):
+            print(f"Audio player not found: {player[0] if player else '(empty --player)'}",
+                  file=sys.stderr)
+            sys.exit(1)
+        config = args.config if Path(args.config).exists() else None
+        server = Server(Voice(args.model, config), args.player)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    try:
+        if args.command == "say":
+            text = args.text if args.text is not None else sys.stdin.read()
+            reply = request({"op": "speak", "text": text}, wait=args.wait)
+            if reply and reply.get("cancelled"):
+                sys.exit(2)
+            if reply and reply.get("error"):
+                print(f"piper-server: {reply['error']}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            request({"op": "cancel"})
+    except OSError:
+        print("piper-server is not running", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
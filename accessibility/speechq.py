@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+speechq.py — Central speech queue for notifications and screen reading.
+
+Every script that wants to say something sends a request to this daemon
+instead of launching its own synthesizer, so utterances never talk over
+each other:
+
+  - Priorities: approval prompts > OCR reads > ordinary notifications.
+    A higher-priority request interrupts whatever is being spoken; a new OCR
+    read also replaces an OCR read that is still talking.
+  - Duplicates: a notification with the same text from the same source is
+    dropped if it was already queued or spoken within the TTL window. OCR
+    reads and approvals are always spoken, since someone asked for them.
+  - Bursts: when several notifications from one source are waiting, they are
+    spoken as one summary ("5 notifications from Mail").
+
+Protocol: one JSON object per datagram on $XDG_RUNTIME_DIR/speechq.sock
+  {"op": "say", "text": "...", "priority": "notify|ocr|approval",
+   "source": "mail", "engine": "spd|piper"}
+  {"op": "stop"}                       # cancel speech and clear the queue
+
+Usage:
+  speechq.py serve [--ttl SECONDS] [--burst N] [--piper-cmd CMD]
+  speechq.py say [--priority P] [--source S] [--engine E] [TEXT]   # TEXT or stdin
+  speechq.py stop
+
+`say` and `stop` exit 1 when the daemon is not running, so callers can fall
+back to speaking directly.
+
+Requirements:
+  - speech-dispatcher (provides the Python `speechd` module) for engine "spd"
+  - piper-server.py for engine "piper" (falls back to tts_wrapper.py)
+"""
+
+import argparse
+import json
+import os
+import shlex
+import socket
+import subprocess as sp
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+SOCKET_PATH = Path(os.environ.get("XDG_RUNTIME_DIR", "/tmp")) / "speechq.sock"
+PIPER_SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR", "/tmp")) / "piper-tts.sock"
+
+PRIORITIES = {"notify": 1, "ocr": 2, "approval": 3}
+# Priorities where a new request replaces one of the same level mid-sentence
+REPLACE_SAME = {"ocr"}
+
+DEFAULT_PIPER_CMD = str(Path.home() / "Scripts" / "bin" / "tts_wrapper.py")
+
+# An engine that hasn't reported the end of an utterance after this long is
+# assumed stuck (e.g. speech-dispatcher restarted and lost the callback)
+SPEAK_TIMEOUT_BASE = 10.0                    # seconds, plus...
+SLOWEST_CHARS_PER_SEC = 5.0                  # ...the text read at a very slow rate
+
+
+@dataclass
+class Utterance:
+    text: str
+    priority: str = "notify"
+    source: str = ""
+    engine: str = "spd"
+    queued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def rank(self) -> int:
+        return PRIORITIES.get(self.priority, 1)
+
+
+# ── client ────────────────────────────────────────────────────────────────────
+
+def send(request: dict) -> bool:
+    """Send one request to the daemon. Returns False if it is not running."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as s:
+            s.sendto(json.dumps(request).encode(), str(SOCKET_PATH))
+        return True
+    except OSError:
+        return False
+
+
+def say(text: str, priority: str = "notify", source: str = "", engine: str = "spd") -> bool:
+    return send({"op": "say", "text": text, "priority": priority,
+                 "source": source, "engine": engine})
+
+
+# ── engines ───────────────────────────────────────────────────────────────────
+
+class SpdEngine:
+    """speech-dispatcher over one persistent SSIP connection."""
+
+    def __init__(self):
+        import speechd
+        self._speechd = speechd
+        self._client = None
+
+    def _connect(self):
+        if self._client is None:
+            self._client = self._speechd.SSIPClient("speechq", autospawn=True)
+        return self._client
+
+    def speak(self, text: str, done: threading.Event) -> None:
+        cb = self._speechd.CallbackType
+        kwargs = {"callback": lambda _type, *a, **k: done.set(),
+                  "event_types": (cb.END, cb.CANCEL)}
+        try:
+            self._connect().speak(text, **kwargs)
+        except (self._speechd.SSIPCommunicationError, OSError):
+            self._client = None
+            self._connect().speak(text, **kwargs)
+
+    def cancel(self) -> None:
+        if self._client is not None:
+            try:
+                self._client.cancel()
+            except (self._speechd.SSIPCommunicationError, OSError):
+                self._client = None         # reconnect on the next utterance
+
+
+class CommandEngine:
+    """A TTS command that reads text on stdin (tts_wrapper.py for Piper)."""
+
+    def __init__(self, command: str):
+        self.argv = shlex.split(os.path.expanduser(command))
+        self._proc: sp.Popen | None = None
+
+    def speak(self, text: str, done: threading.Event) -> None:
+        self._proc = sp.Popen(self.argv, stdin=sp.PIPE,
+                              stdout=sp.DEVNULL, stderr=sp.DEVNULL, text=True)
+        proc = self._proc
+
+        def wait():
+            try:
+                proc.communicate(text)
+            finally:
+                done.set()
+
+        threading.Thread(target=wait, daemon=True).start()
+
+    def cancel(self) -> None:
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.terminate()
+
+
+class PiperServerEngine:
+    """The resident piper-server.py voice, or a fallback command if it is down."""
+
+    def __init__(self, fallback: CommandEngine):
+        self.fallback = fallback
+        self._using_fallback = False
+
+    def _request(self, req: dict) -> socket.socket:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            s.connect(str(PIPER_SOCKET))
+            s.sendall(json.dumps(req).encode() + b"\n")
+        except OSError:
+            s.close()
+            raise
+        return s
+
+    def speak(self, text: str, done: threading.Event) -> None:
+        try:
+            s = self._request({"op": "speak", "text": text})
+        except OSError:
+            self._using_fallback = True
+            self.fallback.speak(text, done)
+            return
+        self._using_fallback = False
+
+        def wait():
+            # The server replies once playback has finished or been cancelled
+            with s, s.makefile("rb") as f:
+                f.readline()
+            done.set()
+
+        threading.Thread(target=wait, daemon=True).start()
+
+    def cancel(self) -> None:
+        if self._using_fallback:
+            self.fallback.cancel()
+            return
+        try:
+            self._request({"op": "cancel"}).close()
+        except OSError:
+            pass
+
+
+# ── queue ─────────────────────────────────────────────────────────────────────
+
+class SpeechQueue:
+    def __init__(self, engines: dict, ttl: float = 30.0, burst: int = 3):
+        self.engines = engines
+        self.ttl = ttl
+        self.burst = burst
+        self._pending: list[Utterance] = []
+        self._recent: dict[tuple[str, str], float] = {}
+        self._current: Utterance | None = None
+        self._current_done: threading.Event | None = None
+        self._cond = threading.Condition()
+
+    # called from the socket thread
+
+    def submit(self, utt: Utterance) -> None:
+        with self._cond:
+            if self._is_duplicate(utt):
+                return
+            if self._preempts(utt):
+                if utt.priority in REPLACE_SAME:
+                    self._pending = [u for u in self._pending if u.priority != utt.priority]
+                self._cancel_current()
+            self._pending.append(utt)
+            self._cond.notify()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._pending.clear()
+            self._cancel_current()
+
+    def _is_duplicate(self, utt: Utterance) -> bool:
+        # Only notifications repeat on their own; a repeated OCR read is the
+        # user pressing the key again
+        if utt.priority != "notify":
+            return False
+        now = time.monotonic()
+        self._recent = {k: t for k, t in self._recent.items() if now - t < self.ttl}
+        key = (utt.source, " ".join(utt.text.lower().split()))
+        if key in self._recent:
+            return True
+        self._recent[key] = now
+        return False
+
+    def _preempts(self, utt: Utterance) -> bool:
+        cur = self._current
+        if cur is None:
+            return False
+        return utt.rank > cur.rank or (utt.priority == cur.priority and utt.priority in REPLACE_SAME)
+
+    def _cancel_current(self) -> None:
+        if self._current is not None:
+            self.engines[self._current.engine].cancel()
+            if self._current_done is not None:
+                self._current_done.set()
+
+    # called from the speaking thread
+
+    def _next(self) -> Utterance:
+        """Pop the highest-priority utterance, merging a notification burst."""
+        top = max(self._pending, key=lambda u: (u.rank, -u.queued_at))
+        if top.priority == "notify" and top.source:
+            same = [u for u in self._pending if u.priority == "notify" and u.source == top.source]
+            if len(same) >= self.burst:
+                for u in same:
+                    self._pending.remove(u)
+                return Utterance(text=f"{len(same)} notifications from {top.source}",
+                                 priority="notify", source=top.source, engine=top.engine)
+        self._pending.remove(top)
+        return top
+
+    def run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                utt = self._next()
+                done = threading.Event()
+                self._current, self._current_done = utt, done
+            engine = self.engines[utt.engine]
+            try:
+                engine.speak(utt.text, done)
+                if not done.wait(speak_timeout(utt.text)):
+                    print(f"speechq: {utt.engine} never finished speaking, cancelled",
+                          file=sys.stderr)
+                    engine.cancel()
+            except Exception as e:
+                print(f"speechq: {utt.engine} failed: {e}", file=sys.stderr)
+            with self._cond:
+                self._current = self._current_done = None
+
+
+def speak_timeout(text: str) -> float:
+    return SPEAK_TIMEOUT_BASE + len(text) / SLOWEST_CHARS_PER_SEC
+
+
+def parse_request(data: bytes, engines: dict) -> dict | Utterance | None:
+    """A datagram as {"op": "stop"}, an Utterance to say, or None to ignore it.
+
+    Anything can write to the socket, so malformed requests are skipped
+    rather than trusted.
+    """
+    try:
+        req = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(req, dict):
+        return None
+    if req.get("op") == "stop":
+        return req
+    text = req.get("text")
+    if req.get("op") != "say" or not isinstance(text, str) or not text.strip():
+        return None
+    priority, source, engine = req.get("priority"), req.get("source"), req.get("engine")
+    return Utterance(
+        text=text.strip(),
+        priority=priority if isinstance(priority, str) and priority in PRIORITIES else "notify",
+        source=source if isinstance(source, str) else "",
+        engine=engine if isinstance(engine, str) and engine in engines else "spd",
+    )
+
+
+def serve(args) -> None:
+    engines = {"spd": SpdEngine(), "piper": PiperServerEngine(CommandEngine(args.piper_cmd))}
+    queue = SpeechQueue(engines, ttl=args.ttl, burst=args.burst)
+    threading.Thread(target=queue.run, daemon=True).start()
+
+    SOCKET_PATH.unlink(missing_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(str(SOCKET_PATH))
+    try:
+        while True:
+            req = parse_request(sock.recv(256 * 1024), engines)
+            if isinstance(req, Utterance):
+                queue.submit(req)
+            elif req is not None:
+                queue.stop()
+    finally:
+        sock.close()
+        SOCKET_PATH.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="Run the queue daemon")
+    p_serve.add_argument("--ttl", type=float, default=30.0,
+                         help="Notification duplicate suppression window in seconds (default: 30)")
+    p_serve.add_argument("--burst", type=int, default=3,
+                         help="Merge this many queued notifications from one source (default: 3)")
+    p_serve.add_argument("--piper-cmd", default=DEFAULT_PIPER_CMD,
+                         help=f"Fallback TTS command for engine 'piper' when piper-server.py "
+                              f"is not running (default: {DEFAULT_PIPER_CMD})")
+
+    p_say = sub.add_parser("say", help="Queue text to be spoken")
+    p_say.add_argument("text", nargs="?", help="Text to speak (default: read stdin)")
+    p_say.add_argument("--priority", choices=list(PRIORITIES), default="notify")
+    p_say.add_argument("--source", default="")
+    p_say.add_argument("--engine", choices=["spd", "piper"], default="spd")
+
+    sub.add_parser("stop", help="Stop speaking and clear the queue")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            serve(args)
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "say":
+        text = args.text if args.text is not None else sys.stdin.read()
+        if not say(text, args.priority, args.source, args.engine):
+            sys.exit(1)
+    elif args.command == "stop":
+        if not send({"op": "stop"}):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
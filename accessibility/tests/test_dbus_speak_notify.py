@@ -0,0 +1,95 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("jeepney")
+pytest.importorskip("speechd")
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+_spec = importlib.util.spec_from_file_location("dbus_speak_notify", HERE.parent / "dbus-speak-notify.py")
+notify = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(notify)
+
+
+def rules_from(tmp_path, text: str):
+    path = tmp_path / "notify-rules.toml"
+    path.write_text(text)
+    rules = notify.NotifyRules(path)
+    return rules, path
+
+
+def rewrite(path: Path, text: str) -> None:
+    mtime = path.stat().st_mtime
+    path.write_text(text)
+    os.utime(path, (mtime + 1, mtime + 1))
+
+
+def test_builtin_rules():
+    rules = notify.NotifyRules(Path("/nonexistent/notify-rules.toml"))
+    assert rules.apply("claude", "Claude Code", "Needs permission") == ("Claude needs approval", "approval")
+    assert rules.apply("claude", "Claude Code", "Done") == ("Claude", "notify")
+    assert rules.apply("Proton Mail", "New message", "") == ("Mail", "notify")
+    assert rules.apply("firefox", "Download", "finished") == ("Download. finished", "notify")
+
+
+def test_patterns_stay_within_their_field(tmp_path):
+    rules, _ = rules_from(tmp_path, r'''
+[[rule]]
+app = 'a\s+b'
+say = "spaced app"
+
+[[rule]]
+summary = '^x[^y]*z$'
+say = "xz"
+''')
+    rules.reload_if_changed()
+    # "a" and "b" only meet across the app/summary boundary
+    assert rules.apply("a", "b", "") == ("b", "notify")
+    assert rules.apply("a  b", "hi", "") == ("spaced app", "notify")
+    # [^y]* must not run from the summary on into the body
+    assert rules.apply("app", "x", "z") == ("x. z", "notify")
+    assert rules.apply("app", "x-z", "") == ("xz", "notify")
+
+
+def test_first_rule_matching_every_field_wins(tmp_path):
+    rules, _ = rules_from(tmp_path, '''
+[[rule]]
+app = "^mail$"
+body = "urgent"
+say = "Urgent mail"
+priority = "approval"
+
+[[rule]]
+app = "^mail$"
+drop = true
+''')
+    rules.reload_if_changed()
+    assert rules.apply("mail", "Boss", "Urgent:\\nreply") == ("Urgent mail", "approval")
+    assert rules.apply("mail", "Newsletter", "weekly") is None
+
+
+@pytest.mark.parametrize("text, message", [
+    ("[rule]\nsay = 'x'\n", "[[rule]] tables"),
+    ("rule = [1, 2]\n", "[[rule]] tables"),
+    ("[[rule]]\napp = 1\nsay = 'x'\n", "app must be a string"),
+    ("[[rule]]\nsay = ['x']\n", "say must be a string"),
+    ("[[rule]]\napp = 'x'\ndrop = 'yes'\n", "drop must be true or false"),
+    ("[[rule]]\nname = 3\nsay = 'x'\n", "name must be a string"),
+    ("[[rule]]\napp = '(?P<a>x)'\nsay = 'x'\n", "named groups"),
+    ("[[rule]]\nsay = '{sender}'\n", "say uses {sender}"),
+    ("[[rule\n", "notify-rules.toml"),
+])
+def test_bad_edit_raises_value_error_and_keeps_previous_rules(tmp_path, text, message):
+    rules, path = rules_from(tmp_path, "[[rule]]\napp = '^slack$'\ndrop = true\n")
+    assert rules.reload_if_changed()
+    rewrite(path, text)
+    with pytest.raises(ValueError, match=message.replace("[", r"\[").replace("{", r"\{")):
+        rules.reload_if_changed()
+    assert rules.apply("slack", "ping", "") is None
+    # Not retried until the file changes again
+    assert not rules.reload_if_changed()
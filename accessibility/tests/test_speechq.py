@@ -0,0 +1,78 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import speechq      # noqa: E402
+from speechq import SpeechQueue, Utterance, parse_request      # noqa: E402
+
+ENGINES = {"spd": None, "piper": None}
+
+
+@pytest.mark.parametrize("data", [
+    b"not json", b"[]", b'"say"', b"1", b"null",
+    b'{"op": "say", "text": 5}',
+    b'{"op": "say", "text": ["hi"]}',
+    b'{"op": "say", "text": "   "}',
+    b'{"op": "dance"}',
+])
+def test_malformed_requests_are_ignored(data):
+    assert parse_request(data, ENGINES) is None
+
+
+def test_say_request_fields_are_sanitised():
+    utt = parse_request(b'{"op": "say", "text": " hi ", "priority": ["x"], '
+                        b'"source": {"a": 1}, "engine": []}', ENGINES)
+    assert (utt.text, utt.priority, utt.source, utt.engine) == ("hi", "notify", "", "spd")
+    utt = parse_request(b'{"op": "say", "text": "read", "priority": "ocr", '
+                        b'"source": "ocrd", "engine": "piper"}', ENGINES)
+    assert (utt.priority, utt.source, utt.engine) == ("ocr", "ocrd", "piper")
+    assert parse_request(b'{"op": "stop"}', ENGINES) == {"op": "stop"}
+
+
+def test_only_notifications_are_deduplicated():
+    queue = SpeechQueue({})
+    queue.submit(Utterance("New mail", source="mail"))
+    queue.submit(Utterance("new  MAIL", source="mail"))
+    queue.submit(Utterance("Page text", priority="ocr"))
+    queue.submit(Utterance("Page text", priority="ocr"))
+    queue.submit(Utterance("Allow?", priority="approval"))
+    queue.submit(Utterance("Allow?", priority="approval"))
+    assert [u.text for u in queue._pending] == [
+        "New mail", "Page text", "Page text", "Allow?", "Allow?"]
+
+
+class SilentEngine:
+    """Never reports the end of an utterance, like a lost speechd callback."""
+
+    def __init__(self):
+        self.spoken, self.cancels = [], 0
+        self.all_spoken = threading.Event()
+
+    def speak(self, text, done):
+        self.spoken.append(text)
+        if len(self.spoken) == 2:
+            self.all_spoken.set()
+
+    def cancel(self):
+        self.cancels += 1
+
+
+def test_stuck_engine_is_cancelled_and_the_queue_moves_on(monkeypatch):
+    monkeypatch.setattr(speechq, "SPEAK_TIMEOUT_BASE", 0.05)
+    monkeypatch.setattr(speechq, "SLOWEST_CHARS_PER_SEC", 1e9)
+    engine = SilentEngine()
+    queue = SpeechQueue({"spd": engine})
+    queue.submit(Utterance("first", source="a"))
+    queue.submit(Utterance("second", source="b"))
+    threading.Thread(target=queue.run, daemon=True).start()
+    assert engine.all_spoken.wait(5)
+    assert engine.spoken == ["first", "second"]
+    assert engine.cancels >= 1
+
+
+def test_speak_timeout_grows_with_text():
+    assert speechq.speak_timeout("x" * 1000) > speechq.speak_timeout("hi") >= speechq.SPEAK_TIMEOUT_BASE
@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+"""
+linode-bastion.py — spin up a cheap Linode for reverse-SSH tunnelling,
+                    then optionally destroy it.
+
+Talks to the Linode API v4 directly over kept-alive HTTPS connections (no
+linode-cli, no jq). Bring-up is a handful of requests: look up the SSH key,
+create the instance (its IP comes back in the create response), then probe
+the SSH banner on that IP until sshd answers — "up" returns when the tunnel
+can actually connect, not merely when the API says "running". Teardown lists
+the bastions with one filtered request and deletes them all concurrently.
+
+`bake` builds a private image once: a stock Ubuntu Linode gets upgraded, a
+shell-less `tunnel` user that may only forward localhost:2222, and an sshd
+drop-in (keys only, keepalives, fresh host keys per instance). The image ID
+is saved in ~/.local/state/linode-bastion/image.json and every later `up`
+boots from it, so nothing is configured after boot.
+
+Usage:
+  linode-bastion.py up      # create the server and print connection info
+  linode-bastion.py down    # destroy every bastion (stop paying)
+  linode-bastion.py bake    # build (or rebuild) the private bastion image
+
+Options:
+  --stock         Boot the stock image even if a baked one exists
+  --api-url URL   API base URL (default: $LINODE_API_URL or
+                  https://api.linode.com/v4). http:// URLs are accepted so
+                  the script can be pointed at a local fake API server.
+  --ssh-port N    Port the readiness probe connects to (default: 22); with a
+                  fake API handing out 127.0.0.1, point it at a local stand-in
+  --timeout SECS  Give up waiting for SSH after this long (default: 600)
+
+Requirements:
+  - LINODE_TOKEN exported with a personal access token (Linodes read/write,
+    Account/SSH keys read/write)
+  - an SSH key pair at ~/.ssh/ssh_tunnel (offered to generate if missing)
+
+Messages are deliberately verbose so a screen reader can narrate each step.
+"""
+
+import argparse
+import email.utils
+import getpass
+import http.client
+import json
+import os
+import queue
+import secrets
+import shlex
+import socket
+import subprocess as sp
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# ── configuration — edit these once if you want different defaults ───────────
+
+LABEL_PREFIX = "homelab-bastion"
+LINODE_TYPE = "g6-nanode-1"                  # cheapest Linode (1 vCPU, 1 GB RAM)
+LINODE_REGION = "eu-central"                 # Frankfurt region (low latency in EU)
+LINODE_IMAGE = "linode/ubuntu22.04"          # Ubuntu 22.04 LTS (change to archlinux if you wish)
+SSH_KEY_LABEL = f"homelab-key-{getpass.getuser()}"   # name for the imported key on Linode
+SSH_KEY_PATH = Path.home() / ".ssh" / "ssh_tunnel"
+
+DEFAULT_API_URL = "https://api.linode.com/v4"
+POLL_INITIAL = 2.0                           # first status poll after create (s)
+POLL_MAX = 10.0                              # backoff ceiling between polls (s)
+PROBE_INTERVAL = 0.5                         # between SSH banner probes (s)
+PROBE_TIMEOUT = 2.0                          # connect/read timeout per probe (s)
+IMAGE_TIMEOUT = 1800                         # private image creation (s)
+MAX_WORKERS = 8                              # concurrent deletes
+
+
+def die(msg: str) -> None:
+    print(f"❌ {msg}", file=sys.stderr)
+    sys.exit(1)
+
+
+# ── API client ───────────────────────────────────────────────────────────────
+
+class LinodeError(Exception):
+    def __init__(self, status: int, body: dict | str):
+        if isinstance(body, dict):
+            reasons = "; ".join(e.get("reason", "") for e in body.get("errors", []))
+        else:
+            reasons = body.strip()
+        super().__init__(f"Linode API {status}: {reasons or 'request failed'}")
+        self.status = status
+
+
+class LinodeAPI:
+    """Linode API v4 over a small pool of kept-alive connections.
+
+    Each thread checks a connection out for the length of one request, so
+    concurrent callers never share one; idle connections are reused.
+    """
+
+    RETRY_STATUSES = {429, 502, 503, 504}
+    # A gateway error or dropped connection can come after the API acted, and
+    # a repeated POST could boot a second Linode, so only these methods are
+    # retried on them. A 429 means nothing was done: any request is retried.
+    IDEMPOTENT = {"GET", "HEAD", "PUT", "DELETE"}
+    RETRY_AFTER_MAX = 60.0
+
+    def __init__(self, token: str, base_url: str = DEFAULT_API_URL, timeout: float = 30):
+        url = urlsplit(base_url)
+        if url.scheme not in ("https", "http"):
+            raise ValueError(f"Unsupported API URL: {base_url}")
+        self.scheme = url.scheme
+        self.host = url.hostname
+        self.port = url.port
+        self.prefix = url.path.rstrip("/")
+        self.timeout = timeout
+        self.headers = {"Authorization": f"Bearer {token}", "Accept": "application/json",
+                        "User-Agent": "linode-bastion.py"}
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self.requests = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            return cls(self.host, self.port, timeout=self.timeout)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def request(self, method: str, path: str, body: dict | None = None,
+                headers: dict | None = None) -> dict:
+        payload = json.dumps(body).encode() if body is not None else None
+        hdrs = dict(self.headers, **(headers or {}))
+        if payload is not None:
+            hdrs["Content-Type"] = "application/json"
+
+        idempotent = method in self.IDEMPOTENT
+        for attempt in range(4):
+            conn = self._connect()
+            try:
+                conn.request(method, self.prefix + path, body=payload, headers=hdrs)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Usually a kept-alive connection the server already closed
+                conn.close()
+                if attempt == 3 or not idempotent:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+            self.requests += 1
+            if resp.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+            if resp.status in self.RETRY_STATUSES and attempt < 3 \
+                    and (idempotent or resp.status == 429):
+                time.sleep(self.retry_delay(resp.getheader("Retry-After"), attempt))
+                continue
+            try:
+                parsed = json.loads(data) if data else {}
+            except ValueError:
+                parsed = data.decode(errors="replace")
+            if resp.status >= 400:
+                raise LinodeError(resp.status, parsed)
+            return parsed
+        raise LinodeError(resp.status, "retries exhausted")
+
+    def retry_delay(self, retry_after: str | None, attempt: int) -> float:
+        """Seconds to wait: Retry-After as seconds or an HTTP date, else backoff."""
+        delay = float(2 ** attempt)
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    pass
+        if not delay >= 0:      # negative, or "nan"
+            delay = 0.0
+        return min(delay, self.RETRY_AFTER_MAX)
+
+    def paginate(self, path: str, filter: dict | None = None) -> list[dict]:
+        """All items of a paginated collection (500 per page)."""
+        headers = {"X-Filter": json.dumps(filter)} if filter else None
+        items, page = [], 1
+        while True:
+            result = self.request("GET", f"{path}?page={page}&page_size=500", headers=headers)
+            items.extend(result.get("data", []))
+            if page >= result.get("pages", 1):
+                return items
+            page += 1
+
+
+# ── SSH key ──────────────────────────────────────────────────────────────────
+
+def ensure_local_key() -> str:
+    pubkey = SSH_KEY_PATH.with_suffix(".pub")
+    if not pubkey.exists():
+        print(f"⚠️  SSH key not found at {pubkey}")
+        response = input("Would you like to generate a new key pair? [y/N] ")
+        if response.strip().lower() != "y":
+            die(f"Cannot proceed without SSH key at {pubkey}")
+        print("🔑 Generating new ED25519 key pair...")
+        SSH_KEY_PATH.parent.mkdir(mode=0o700, exist_ok=True)
+        sp.run(["ssh-keygen", "-t", "ed25519", "-f", str(SSH_KEY_PATH),
+                "-C", "homelab-bastion", "-N", ""], check=True)
+        SSH_KEY_PATH.chmod(0o600)
+        pubkey.chmod(0o644)
+        print(f"✅ Key pair created at {SSH_KEY_PATH}")
+    return pubkey.read_text().strip()
+
+
+def import_ssh_key(api: LinodeAPI, pubkey: str) -> None:
+    keys = api.paginate("/profile/sshkeys", {"label": SSH_KEY_LABEL})
+    if any(k.get("label") == SSH_KEY_LABEL for k in keys):
+        print(f'🔑 SSH key "{SSH_KEY_LABEL}" already exists on Linode.')
+        return
+    print(f'🔑 Importing SSH key "{SSH_KEY_LABEL}" to Linode...')
+    api.request("POST", "/profile/sshkeys", {"label": SSH_KEY_LABEL, "ssh_key": pubkey})
+
+
+# ── readiness probe ──────────────────────────────────────────────────────────
+
+def ssh_banner(host: str, port: int = 22, timeout: float = PROBE_TIMEOUT) -> str | None:
+    """The server's SSH identification line, or None if sshd isn't answering yet.
+
+    A TCP connect alone is not enough: during boot the port can accept and
+    then drop the connection before sshd has host keys.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as s:
+            s.settimeout(timeout)
+            data = b""
+            while len(data) < 4096:
+                chunk = s.recv(1024)
+                if not chunk:
+                    return None
+                data += chunk
+                # RFC 4253 allows other lines before the identification string
+                for line in data.split(b"\n")[:-1]:
+                    if line.startswith(b"SSH-"):
+                        return line.rstrip(b"\r").decode(errors="replace")
+    except OSError:
+        return None
+    return None
+
+
+def wait_for_status(api: LinodeAPI, instance: dict, want: str, timeout: float) -> dict:
+    """Poll the instance with backoff until its status is `want`."""
+    deadline = time.monotonic() + timeout
+    delay = POLL_INITIAL
+    while instance.get("status") != want:
+        if time.monotonic() + delay > deadline:
+            die(f"Linode {instance['id']} still {instance.get('status')!r} after {timeout:.0f}s")
+        time.sleep(delay)
+        delay = min(delay * 1.5, POLL_MAX)
+        instance = api.request("GET", f"/linode/instances/{instance['id']}")
+    return instance
+
+
+def wait_until_ready(api: LinodeAPI, instance: dict, ip: str, port: int, timeout: float) -> str:
+    """Probe the SSH banner until sshd answers; returns the banner.
+
+    The API status is still polled (with backoff) so each stage can be
+    narrated and a failed boot is caught, but "running" only means the kernel
+    started — readiness is decided by the probe alone.
+    """
+    deadline = time.monotonic() + timeout
+    status = instance.get("status")
+    delay = POLL_INITIAL
+    next_poll = time.monotonic() + delay
+    while True:
+        banner = ssh_banner(ip, port)
+        if banner:
+            return banner
+        now = time.monotonic()
+        if now >= deadline:
+            die(f"SSH on {ip}:{port} not answering after {timeout:.0f}s (Linode is {status!r})")
+        if status != "running" and now >= next_poll:
+            instance = api.request("GET", f"/linode/instances/{instance['id']}")
+            if instance.get("status") != status:
+                status = instance.get("status")
+                print(f"   Linode status: {status}")
+            if status == "offline":
+                die(f"Linode {instance['id']} went offline while booting")
+            delay = min(delay * 1.5, POLL_MAX)
+            next_poll = now + delay
+        time.sleep(PROBE_INTERVAL)
+
+
+# ── bring-up ─────────────────────────────────────────────────────────────────
+
+def prompt_root_password() -> str:
+    password = getpass.getpass("🔐 Enter root password for the Linode bastion: ")
+    confirm = getpass.getpass("🔐 Confirm password: ")
+    if password != confirm:
+        die("Passwords do not match!")
+    if len(password) < 8:
+        die("Password must be at least 8 characters long!")
+    return password
+
+
+def public_ipv4(instance: dict) -> str | None:
+    return next(iter(instance.get("ipv4") or []), None)
+
+
+def create_linode(api: LinodeAPI, label: str, image: str, pubkey: str, root_pass: str) -> dict:
+    print(f'🚀 Creating Linode "{label}" ({LINODE_TYPE}, {image})…')
+    return api.request("POST", "/linode/instances", {
+        "label": label,
+        "type": LINODE_TYPE,
+        "region": LINODE_REGION,
+        "image": image,
+        "root_pass": root_pass,
+        "authorized_keys": [pubkey],
+        "tags": ["homelab", "bastion"],
+    })
+
+
+def bring_up(api: LinodeAPI, label: str, image: str, pubkey: str, root_pass: str,
+             ssh_port: int, timeout: float) -> tuple[dict, str]:
+    """Create a Linode and wait until its sshd answers; returns (instance, ip)."""
+    start = time.monotonic()
+    instance = create_linode(api, label, image, pubkey, root_pass)
+    return instance, await_ssh(api, instance, ssh_port, timeout, start)
+
+
+def await_ssh(api: LinodeAPI, instance: dict, ssh_port: int, timeout: float, start: float) -> str:
+    """Wait until a new Linode's sshd answers; returns its IP."""
+    ip = public_ipv4(instance)
+    if not ip:
+        instance = wait_for_status(api, instance, "running", timeout)
+        ip = public_ipv4(instance) or die(f"Linode {instance['id']} has no public IPv4 address")
+    print(f"⏳ Waiting for SSH to answer on {ip} (Linode {instance['id']})…")
+    banner = wait_until_ready(api, instance, ip, ssh_port, timeout)
+    print(f"✅ SSH is up after {time.monotonic() - start:.0f}s ({banner}). Public IP: {ip}")
+    return ip
+
+
+def print_reverse_ssh_snippet(ip: str, user: str) -> None:
+    if user == "root":
+        test_step = f"""#    ssh -i ~/.ssh/ssh_tunnel root@{ip}
+#    (should connect without asking for password)"""
+        two_step = f"""#
+# Or in two steps:
+#    ssh root@{ip}           # Connect to bastion
+#    ssh -p 2222 localhost           # Connect to your target VM
+"""
+    else:
+        test_step = f"""#    ssh -i ~/.ssh/ssh_tunnel -N {user}@{ip}
+#    (should connect without asking for password and sit silently;
+#    the {user} account has no shell, press Ctrl-C to leave)"""
+        two_step = ""
+    print(f"""
+# --------------------------------------------------------------
+# Paste the following into a root-owned file on the TARGET VM:
+#   /etc/systemd/system/reverse-ssh.service
+# --------------------------------------------------------------
+[Unit]
+Description=Reverse SSH tunnel to Linode bastion
+After=network-online.target
+Wants=network-online.target
+
+[Service]
+User=YOUR_USERNAME_HERE
+ExecStart=/usr/bin/ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null -i /home/YOUR_USERNAME_HERE/.ssh/ssh_tunnel -N -R 2222:localhost:22 {user}@{ip}
+Restart=always
+RestartSec=10
+
+[Install]
+WantedBy=multi-user.target
+# --------------------------------------------------------------
+
+# SETUP STEPS ON YOUR TARGET VM:
+#
+# 1. If you don't have the SSH key yet, generate it:
+#    ssh-keygen -t ed25519 -f ~/.ssh/ssh_tunnel -C "homelab-bastion"
+#    chmod 600 ~/.ssh/ssh_tunnel
+#    chmod 644 ~/.ssh/ssh_tunnel.pub
+#
+#    NOTE: The script automatically adds your public key to the Linode,
+#    so you should be able to connect WITHOUT running ssh-copy-id!
+#
+# 2. Test the connection works without password:
+{test_step}
+#
+# 3. Save the systemd service file above to:
+#    sudo nano /etc/systemd/system/reverse-ssh.service
+#    (replace YOUR_USERNAME_HERE with your actual username from 'whoami')
+#
+# 4. Enable and start the service:
+#    sudo systemctl daemon-reload
+#    sudo systemctl enable --now reverse-ssh.service
+#    sudo systemctl status reverse-ssh.service
+#
+# --------------------------------------------------------------
+# HOW TO CONNECT FROM YOUR LAPTOP:
+#
+# Once the reverse tunnel is running on your target VM, you can
+# SSH into it from anywhere via the Linode bastion:
+#
+#    ssh -J {user}@{ip} -p 2222 localhost
+{two_step}# --------------------------------------------------------------
+""")
+    print(f"✅ Linode bastion is ready at {ip}")
+    print("📋 Follow the setup steps above to configure your target VM")
+
+
+# ── baked image ──────────────────────────────────────────────────────────────
+
+# Runs as root on the build Linode. $PUBKEY is prepended by bake().
+BAKE_SCRIPT = r"""
+set -euo pipefail
+export DEBIAN_FRONTEND=noninteractive
+apt-get -qq update
+apt-get -qq -y -o Dpkg::Options::=--force-confold full-upgrade
+
+# Tunnel user: no shell, may only listen on / connect to localhost:2222
+id tunnel &>/dev/null || useradd --create-home --shell /usr/sbin/nologin tunnel
+install -d -m 700 -o tunnel -g tunnel /home/tunnel/.ssh
+echo "restrict,port-forwarding,permitlisten=\"localhost:2222\",permitopen=\"localhost:2222\" $PUBKEY" \
+    > /home/tunnel/.ssh/authorized_keys
+chown tunnel:tunnel /home/tunnel/.ssh/authorized_keys
+chmod 600 /home/tunnel/.ssh/authorized_keys
+
+cat > /etc/ssh/sshd_config.d/10-bastion.conf <<'CONF'
+PasswordAuthentication no
+KbdInteractiveAuthentication no
+UseDNS no
+ClientAliveInterval 15
+ClientAliveCountMax 3
+
+Match User tunnel
+    AllowTcpForwarding yes
+    GatewayPorts no
+    X11Forwarding no
+    PermitTTY no
+    ForceCommand /usr/sbin/nologin
+CONF
+sshd -t
+
+# Every instance booted from the image gets its own host keys
+mkdir -p /etc/systemd/system/ssh.service.d
+cat > /etc/systemd/system/ssh.service.d/10-hostkeys.conf <<'CONF'
+[Service]
+ExecStartPre=
+ExecStartPre=/usr/bin/ssh-keygen -A
+ExecStartPre=/usr/sbin/sshd -t
+CONF
+rm -f /etc/ssh/ssh_host_*
+
+apt-get -qq clean
+cloud-init clean --logs >/dev/null 2>&1 || true
+"""
+
+
+def state_file() -> Path:
+    base = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(base) / "linode-bastion" / "image.json"
+
+
+def baked_image() -> dict | None:
+    try:
+        return json.loads(state_file().read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def run_bake_script(ip: str, port: int, pubkey: str) -> None:
+    print("🔧 Installing the tunnel user and sshd config…")
+    script = f"PUBKEY={shlex.quote(pubkey)}\n{BAKE_SCRIPT}"
+    result = sp.run(["ssh", "-o", "BatchMode=yes", "-o", "StrictHostKeyChecking=no",
+                     "-o", "UserKnownHostsFile=/dev/null", "-o", "LogLevel=ERROR",
+                     "-i", str(SSH_KEY_PATH), "-p", str(port), f"root@{ip}", "bash -s"],
+                    input=script, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"setup script failed with exit code {result.returncode}")
+
+
+def wait_for_image(api: LinodeAPI, image: dict, timeout: float) -> dict:
+    deadline = time.monotonic() + timeout
+    delay = POLL_INITIAL
+    while image.get("status") != "available":
+        if time.monotonic() + delay > deadline:
+            raise RuntimeError(f"image {image['id']} still {image.get('status')!r} after {timeout:.0f}s")
+        time.sleep(delay)
+        delay = min(delay * 1.5, POLL_MAX * 3)
+        image = api.request("GET", f"/images/{image['id']}")
+    return image
+
+
+def bake(api: LinodeAPI, pubkey: str, ssh_port: int, timeout: float) -> None:
+    """Build a private image with the tunnel user baked in and remember it."""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    start = time.monotonic()
+    instance = create_linode(api, f"{LABEL_PREFIX}-build-{int(time.time())}", LINODE_IMAGE,
+                             pubkey, secrets.token_urlsafe(24))
+    # From here on every way out, die() and Ctrl-C included, names the paid Linode
+    baked = False
+    try:
+        ip = await_ssh(api, instance, ssh_port, timeout, start)
+        run_bake_script(ip, ssh_port, pubkey)
+
+        print("⏻ Shutting the build Linode down…")
+        api.request("POST", f"/linode/instances/{instance['id']}/shutdown")
+        wait_for_status(api, dict(instance, status="shutting_down"), "offline", timeout)
+
+        disks = api.paginate(f"/linode/instances/{instance['id']}/disks")
+        disk = next((d for d in disks if d.get("filesystem") != "swap"), None)
+        if not disk:
+            raise RuntimeError(f"Linode {instance['id']} has no system disk")
+        print(f'📸 Creating private image from disk "{disk.get("label")}" (this takes a few minutes)…')
+        image = api.request("POST", "/images", {
+            "disk_id": disk["id"],
+            "label": f"{LABEL_PREFIX}-{stamp}",
+            "description": f"Reverse-SSH bastion based on {LINODE_IMAGE}",
+        })
+        image = wait_for_image(api, image, IMAGE_TIMEOUT)
+        baked = True
+    except (RuntimeError, LinodeError, OSError) as e:
+        die(f"Bake failed: {e}")
+    finally:
+        if not baked:
+            print(f"   The build Linode {instance['id']} is left running for inspection; "
+                  "`linode-bastion.py down` removes it.", file=sys.stderr)
+
+    print(f"🗑️  Destroying build Linode {instance['id']}...")
+    try:
+        api.request("DELETE", f"/linode/instances/{instance['id']}")
+    except (LinodeError, OSError) as e:
+        print(f"⚠️  Could not destroy {instance['id']}: {e}; "
+              "`linode-bastion.py down` removes it.", file=sys.stderr)
+
+    previous = baked_image()
+    path = state_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"id": image["id"], "label": image["label"], "base": LINODE_IMAGE,
+                                "created": stamp}) + "\n")
+    if previous and previous.get("id") != image["id"]:
+        print(f"🗑️  Deleting the previous image {previous['id']} ({previous.get('label')})...")
+        try:
+            api.request("DELETE", f"/images/{previous['id']}")
+        except LinodeError as e:
+            if e.status != 404:
+                print(f"⚠️  Could not delete {previous['id']}: {e}", file=sys.stderr)
+    print(f"✅ Image {image['id']} is ready; `up` will use it from now on.")
+
+
+# ── teardown ─────────────────────────────────────────────────────────────────
+
+def destroy_linodes(api: LinodeAPI) -> None:
+    print(f"🔍 Looking for Linodes with '{LABEL_PREFIX}' in the label...")
+    # The filter keeps the listing small; the label check below is authoritative
+    found = api.paginate("/linode/instances", {"label": {"+contains": LABEL_PREFIX}})
+    bastions = [i for i in found if LABEL_PREFIX in i.get("label", "")]
+    if not bastions:
+        print("ℹ️  No bastion Linodes found to destroy.")
+        return
+
+    def destroy(instance: dict) -> str | None:
+        try:
+            api.request("DELETE", f"/linode/instances/{instance['id']}")
+        except (LinodeError, OSError) as e:
+            return str(e)
+        return None
+
+    for instance in bastions:
+        print(f"🗑️  Destroying Linode {instance['id']} ({instance['label']})...")
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(bastions))) as pool:
+        results = list(pool.map(destroy, bastions))
+    failed = 0
+    for instance, error in zip(bastions, results):
+        if error:
+            failed += 1
+            print(f"❌ Could not destroy {instance['label']}: {error}", file=sys.stderr)
+        else:
+            print(f"✅ Destroyed {instance['label']}")
+    if failed:
+        sys.exit(1)
+
+
+# ── main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["up", "down", "bake"])
+    parser.add_argument("--stock", action="store_true",
+                        help=f"Boot {LINODE_IMAGE} even if a baked image exists")
+    parser.add_argument("--api-url", default=os.environ.get("LINODE_API_URL") or DEFAULT_API_URL,
+                        help="API base URL (default: $LINODE_API_URL or the public API)")
+    parser.add_argument("--ssh-port", type=int, default=22,
+                        help="Port the readiness probe connects to (default: 22)")
+    parser.add_argument("--timeout", type=float, default=600,
+                        help="Seconds to wait for SSH to answer (default: 600)")
+    args = parser.parse_args()
+
+    token = os.environ.get("LINODE_TOKEN")
+    if not token:
+        die("Export LINODE_TOKEN with your Linode API token before running.")
+    api = LinodeAPI(token, args.api_url)
+    try:
+        if args.command == "up":
+            pubkey = ensure_local_key()
+            baked = None if args.stock else baked_image()
+            if baked:
+                print(f'📦 Using baked image {baked["id"]} ({baked.get("label")}).')
+            import_ssh_key(api, pubkey)
+            root_pass = prompt_root_password()
+            label = f"{LABEL_PREFIX}-{int(time.time())}"   # unique name each run
+            image = baked["id"] if baked else LINODE_IMAGE
+            try:
+                _, ip = bring_up(api, label, image, pubkey, root_pass, args.ssh_port, args.timeout)
+            except LinodeError as e:
+                if baked and e.status in (400, 404):
+                    die(f"{e}\n   The baked image may be gone: run `bake` again or use --stock.")
+                raise
+            print_reverse_ssh_snippet(ip, "tunnel" if baked else "root")
+        elif args.command == "bake":
+            pubkey = ensure_local_key()
+            import_ssh_key(api, pubkey)
+            bake(api, pubkey, args.ssh_port, args.timeout)
+        else:
+            destroy_linodes(api)
+    except LinodeError as e:
+        die(str(e))
+    except OSError as e:
+        die(f"Cannot reach the Linode API at {args.api_url}: {e}")
+    finally:
+        api.close()
+    print(f"({api.requests} API request{'s' * (api.requests != 1)})")
+
+
+if __name__ == "__main__":
+    main()
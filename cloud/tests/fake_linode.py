@@ -0,0 +1,164 @@
+"""
+fake_linode.py — a Linode API v4 stand-in on 127.0.0.1
+
+Just enough of the API for linode-bastion.py up/down:
+
+  GET    /v4/profile/sshkeys           paginated, X-Filter
+  POST   /v4/profile/sshkeys
+  GET    /v4/linode/instances          paginated, X-Filter
+  POST   /v4/linode/instances          created "running" with ipv4 = [`ip`]
+  GET    /v4/linode/instances/{id}
+  DELETE /v4/linode/instances/{id}
+
+X-Filter supports plain equality and {"+contains": ...} on top-level fields.
+Pages are capped at `max_page_size` so pagination can be exercised with a few
+items. Statuses queued in `fail` are returned (with `retry_after` as the
+Retry-After header) in place of the next responses, without acting on the
+request, to exercise retries.
+
+Usage:
+  with FakeLinode() as linode:
+      api = LinodeAPI("token", linode.url)
+"""
+
+import http.server
+import json
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+TOKEN = "fake-token"
+
+
+class FakeLinode:
+    def __init__(self, ip: str = "127.0.0.1", max_page_size: int = 500):
+        self.ip = ip
+        self.max_page_size = max_page_size
+        self.keys: list[dict] = []
+        self.instances: dict[int, dict] = {}
+        self.requests: list[tuple[str, str, str | None]] = []   # (method, path, X-Filter)
+        self.connections = 0
+        self.fail: list[int] = []
+        self.retry_after = "0"
+        self._next_id = 100
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "FakeLinode":
+        fake = self
+
+        class Handler(_Handler):
+            server_fake = fake
+
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}/v4"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_instance(self, label: str, status: str = "running") -> dict:
+        with self._lock:
+            instance = {"id": self._next_id, "label": label, "status": status,
+                        "ipv4": [self.ip], "tags": []}
+            self.instances[self._next_id] = instance
+            self._next_id += 1
+            return instance
+
+    def ops(self, method: str = "", prefix: str = "") -> list[tuple[str, str, str | None]]:
+        return [r for r in self.requests if r[0].startswith(method) and r[1].startswith(prefix)]
+
+
+def _matches(item: dict, filter: dict) -> bool:
+    for key, want in filter.items():
+        if isinstance(want, dict) and "+contains" in want:
+            if want["+contains"] not in str(item.get(key, "")):
+                return False
+        elif item.get(key) != want:
+            return False
+    return True
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_fake: FakeLinode
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server_fake._lock:
+            self.server_fake.connections += 1
+
+    def log_message(self, fmt, *args) -> None:
+        pass
+
+    def _reply(self, status: int, body: dict, headers: dict | None = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, reason: str, headers: dict | None = None) -> None:
+        self._reply(status, {"errors": [{"reason": reason}]}, headers)
+
+    def _page(self, items: list[dict], query: dict) -> None:
+        raw = self.headers.get("X-Filter")
+        if raw:
+            items = [i for i in items if _matches(i, json.loads(raw))]
+        size = min(int(query.get("page_size", ["100"])[0]), self.server_fake.max_page_size)
+        page = int(query.get("page", ["1"])[0])
+        pages = max(1, -(-len(items) // size))
+        self._reply(200, {"data": items[(page - 1) * size:page * size],
+                          "page": page, "pages": pages, "results": len(items)})
+
+    def _route(self, method: str) -> None:
+        fake = self.server_fake
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        with fake._lock:
+            fake.requests.append((method, url.path, self.headers.get("X-Filter")))
+            status = fake.fail.pop(0) if fake.fail else None
+        if status:
+            return self._error(status, "injected failure", {"Retry-After": fake.retry_after})
+        if self.headers.get("Authorization") != f"Bearer {TOKEN}":
+            return self._error(401, "Invalid Token")
+
+        path, query = url.path.removeprefix("/v4"), parse_qs(url.query)
+        if path == "/profile/sshkeys":
+            if method == "GET":
+                return self._page(fake.keys, query)
+            if method == "POST":
+                key = {"id": len(fake.keys) + 1, **body}
+                fake.keys.append(key)
+                return self._reply(200, key)
+        if path == "/linode/instances":
+            if method == "GET":
+                return self._page(list(fake.instances.values()), query)
+            if method == "POST":
+                return self._reply(200, fake.add_instance(body["label"]))
+        parts = path.strip("/").split("/")
+        if parts[:2] == ["linode", "instances"] and len(parts) == 3 and parts[2].isdigit():
+            instance = fake.instances.get(int(parts[2]))
+            if instance is None:
+                return self._error(404, "Not found")
+            if method == "GET":
+                return self._reply(200, instance)
+            if method == "DELETE":
+                with fake._lock:
+                    del fake.instances[instance["id"]]
+                return self._reply(200, {})
+        self._error(404, f"no route for {method} {path}")
+
+    def do_GET(self) -> None:
+        self._route("GET")
+
+    def do_POST(self) -> None:
+        self._route("POST")
+
+    def do_DELETE(self) -> None:
+        self._route("DELETE")
@@ -0,0 +1,63 @@
+"""
+fake_sshd.py — a TCP listener that behaves like sshd at different boot stages
+
+  FakeSSHD(drop=N)      accepts and immediately closes the first N connections,
+                        like a port that is open before sshd has host keys
+                        (drop=None: every connection)
+  FakeSSHD(silent=True) accepts and says nothing
+  otherwise             sends `pre_banner` lines (RFC 4253 allows them), then
+                        the identification string, one send() per line
+
+Usage:
+  with FakeSSHD(drop=2) as sshd:
+      ssh_banner("127.0.0.1", sshd.port)
+"""
+
+import socket
+import threading
+
+BANNER = "SSH-2.0-OpenSSH_9.6p1 Ubuntu-3ubuntu13"
+
+
+class FakeSSHD:
+    def __init__(self, drop: int | None = 0, silent: bool = False,
+                 pre_banner: tuple[str, ...] = ("Welcome to the bastion",),
+                 banner: str = BANNER):
+        self.drop = drop
+        self.silent = silent
+        self.pre_banner = pre_banner
+        self.banner = banner
+        self.connections = 0
+        self._sock = socket.create_server(("127.0.0.1", 0))
+        self.port = self._sock.getsockname()[1]
+        self._closing = threading.Event()
+
+    def __enter__(self) -> "FakeSSHD":
+        threading.Thread(target=self._serve, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._closing.set()
+        self._sock.close()
+
+    def _serve(self) -> None:
+        while not self._closing.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            with conn:
+                if self.drop is None or self.connections <= self.drop:
+                    continue
+                if self.silent:
+                    self._closing.wait(5)
+                    continue
+                for line in (*self.pre_banner, self.banner):
+                    conn.sendall(line.encode() + b"\r\n")
+                # Real sshd then waits for the client's identification
+                conn.settimeout(1)
+                try:
+                    conn.recv(1024)
+                except OSError:
+                    pass
@@ -0,0 +1,204 @@
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from fake_linode import TOKEN, FakeLinode  # noqa: E402
+from fake_sshd import BANNER, FakeSSHD      # noqa: E402
+
+_spec = importlib.util.spec_from_file_location("linode_bastion", HERE.parent / "linode-bastion.py")
+bastion = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bastion)
+
+
+@pytest.fixture(autouse=True)
+def fast_probe(monkeypatch):
+    monkeypatch.setattr(bastion, "PROBE_INTERVAL", 0.01)
+
+
+@pytest.fixture
+def linode():
+    with FakeLinode() as fake:
+        yield fake
+
+
+def run_main(monkeypatch, tmp_path, *argv):
+    monkeypatch.setenv("LINODE_TOKEN", TOKEN)
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))   # no baked image
+    monkeypatch.setattr(bastion, "ensure_local_key", lambda: "ssh-ed25519 AAAA test@host")
+    monkeypatch.setattr(bastion, "prompt_root_password", lambda: "correct horse battery")
+    monkeypatch.setattr(sys, "argv", ["linode-bastion.py", *argv])
+    bastion.main()
+
+
+# ── readiness probe ──────────────────────────────────────────────────────────
+
+def test_probe_rejects_a_port_that_accepts_and_closes():
+    with FakeSSHD(drop=None) as sshd:
+        assert bastion.ssh_banner("127.0.0.1", sshd.port) is None
+        assert sshd.connections == 1
+
+
+def test_probe_rejects_a_port_that_never_speaks():
+    with FakeSSHD(silent=True) as sshd:
+        assert bastion.ssh_banner("127.0.0.1", sshd.port, timeout=0.2) is None
+
+
+def test_probe_skips_pre_banner_lines():
+    with FakeSSHD(pre_banner=("Authorized use only", "", "Ubuntu 22.04")) as sshd:
+        assert bastion.ssh_banner("127.0.0.1", sshd.port) == BANNER
+
+
+def test_wait_until_ready_returns_once_sshd_answers():
+    # "running" already, so only the probe runs — the API is never touched
+    with FakeSSHD(drop=3) as sshd:
+        banner = bastion.wait_until_ready(None, {"id": 1, "status": "running"},
+                                          "127.0.0.1", sshd.port, timeout=10)
+        assert banner == BANNER
+        assert sshd.connections == 4
+
+
+def test_wait_until_ready_gives_up_on_a_dropping_port():
+    with FakeSSHD(drop=None) as sshd:
+        with pytest.raises(SystemExit):
+            bastion.wait_until_ready(None, {"id": 1, "status": "running"},
+                                     "127.0.0.1", sshd.port, timeout=0.2)
+        assert sshd.connections >= 2
+
+
+# ── API client against the fake Linode API ───────────────────────────────────
+
+def test_up_is_three_requests_on_one_connection(monkeypatch, tmp_path, capsys, linode):
+    with FakeSSHD(drop=2) as sshd:
+        run_main(monkeypatch, tmp_path, "up", "--api-url", linode.url,
+                 "--ssh-port", str(sshd.port), "--timeout", "10")
+    # Key lookup (filtered), key import, create — the IP comes back in the create
+    # response and readiness is the probe's job, so there is no status polling
+    assert [(m, p) for m, p, _ in linode.requests] == [
+        ("GET", "/v4/profile/sshkeys"), ("POST", "/v4/profile/sshkeys"),
+        ("POST", "/v4/linode/instances")]
+    assert linode.requests[0][2] == json.dumps({"label": bastion.SSH_KEY_LABEL})
+    assert linode.connections == 1
+    out = capsys.readouterr().out
+    assert "SSH is up" in out and "(3 API requests)" in out
+
+    # Second run: the key is already there
+    linode.requests.clear()
+    with FakeSSHD() as sshd:
+        run_main(monkeypatch, tmp_path, "up", "--api-url", linode.url,
+                 "--ssh-port", str(sshd.port), "--timeout", "10")
+    assert len(linode.requests) == 2
+    assert len(linode.instances) == 2
+
+
+def test_down_lists_once_and_deletes_only_bastions(monkeypatch, tmp_path, capsys, linode):
+    for n in range(3):
+        linode.add_instance(f"{bastion.LABEL_PREFIX}-{n}")
+    keep = linode.add_instance("database")
+    run_main(monkeypatch, tmp_path, "down", "--api-url", linode.url)
+
+    assert linode.ops("GET") == [("GET", "/v4/linode/instances",
+                                  json.dumps({"label": {"+contains": bastion.LABEL_PREFIX}}))]
+    assert len(linode.ops("DELETE")) == 3
+    assert list(linode.instances.values()) == [keep]
+    # Concurrent deletes need their own connections, but no more than one each
+    assert linode.connections <= 3
+    assert "(4 API requests)" in capsys.readouterr().out
+
+
+def test_down_pages_through_a_long_listing(monkeypatch, tmp_path, capsys):
+    with FakeLinode(max_page_size=2) as linode:
+        for n in range(5):
+            linode.add_instance(f"{bastion.LABEL_PREFIX}-{n}")
+        run_main(monkeypatch, tmp_path, "down", "--api-url", linode.url)
+        assert len(linode.ops("GET")) == 3
+        assert len(linode.ops("DELETE")) == 5
+        assert not linode.instances
+    assert "(8 API requests)" in capsys.readouterr().out
+
+
+def test_request_retries_rate_limits_and_gateway_errors(linode):
+    api = bastion.LinodeAPI(TOKEN, linode.url)
+    linode.fail = [429, 503, 502]
+    assert api.request("GET", "/linode/instances")["data"] == []
+    assert len(linode.requests) == 4 and api.requests == 4
+    assert linode.connections == 1
+
+    # A persistent failure gives up after four attempts
+    linode.requests.clear()
+    linode.fail = [502] * 4
+    with pytest.raises(bastion.LinodeError, match="502"):
+        api.request("GET", "/linode/instances")
+    assert len(linode.requests) == 4
+    api.close()
+
+
+def test_create_is_retried_only_on_rate_limits(linode):
+    api = bastion.LinodeAPI(TOKEN, linode.url)
+    linode.fail = [429]
+    api.request("POST", "/linode/instances", {"label": "first"})
+    assert len(linode.requests) == 2
+
+    # A gateway timeout may come after the Linode was created: don't make another
+    linode.requests.clear()
+    linode.fail = [504]
+    with pytest.raises(bastion.LinodeError, match="504"):
+        api.request("POST", "/linode/instances", {"label": "second"})
+    assert len(linode.requests) == 1
+    assert [i["label"] for i in linode.instances.values()] == ["first"]
+    api.close()
+
+
+def test_retry_after_is_parsed_defensively(monkeypatch, linode):
+    api = bastion.LinodeAPI(TOKEN, linode.url)
+    assert api.retry_delay("3", 0) == 3
+    assert api.retry_delay("soon", 2) == 4
+    assert api.retry_delay("-5", 0) == api.retry_delay("nan", 0) == 0
+    assert api.retry_delay("Wed, 21 Oct 2015 07:28:00 GMT", 1) == 0      # in the past
+    assert api.retry_delay("86400", 0) == api.RETRY_AFTER_MAX
+
+    sleeps = []
+    monkeypatch.setattr(bastion.time, "sleep", sleeps.append)
+    linode.retry_after = "Wed, 21 Oct 2015 07:28:00 GMT"
+    linode.fail = [429]
+    api.request("GET", "/linode/instances")
+    assert sleeps == [0]
+    api.close()
+
+
+def test_client_errors_are_not_retried(linode):
+    api = bastion.LinodeAPI("wrong-token", linode.url)
+    with pytest.raises(bastion.LinodeError, match="Invalid Token"):
+        api.request("GET", "/linode/instances")
+    assert len(linode.requests) == 1
+    api.close()
+
+
+# ── bake ─────────────────────────────────────────────────────────────────────
+
+def test_bake_names_the_build_linode_when_sshd_never_answers(capsys, linode):
+    api = bastion.LinodeAPI(TOKEN, linode.url)
+    with FakeSSHD(drop=None) as sshd, pytest.raises(SystemExit):
+        bastion.bake(api, "ssh-ed25519 AAAA test@host", sshd.port, timeout=0.2)
+    [instance] = linode.instances.values()
+    assert f"build Linode {instance['id']} is left running" in capsys.readouterr().err
+    api.close()
+
+
+def test_bake_names_the_build_linode_when_ssh_cannot_run(monkeypatch, capsys, linode):
+    def no_ssh(*args):
+        raise FileNotFoundError("ssh")
+    monkeypatch.setattr(bastion, "run_bake_script", no_ssh)
+    api = bastion.LinodeAPI(TOKEN, linode.url)
+    with FakeSSHD() as sshd, pytest.raises(SystemExit):
+        bastion.bake(api, "ssh-ed25519 AAAA test@host", sshd.port, timeout=10)
+    [instance] = linode.instances.values()
+    err = capsys.readouterr().err
+    assert "Bake failed: ssh" in err
+    assert f"build Linode {instance['id']} is left running" in err
+    api.close()
@@ -0,0 +1,804 @@
+#!/usr/bin/env python3
+"""
+calibre-import.py — Import downloaded ebooks into a Calibre Docker container
+
+Streams all new items into the container as one tar archive through the
+Docker Engine API socket, then runs `calibredb add` inside it. No shared volume
+mount, no temp files on the host and no docker CLI processes — a backlog of
+hundreds of books is one transfer. Works with any Calibre Docker setup.
+
+`calibredb add` runs over bounded chunks of the staged items. Its output is
+read per item: books it reports as already existing are recorded as
+duplicates, and the rest of a chunk is recorded straight away once the
+"Added/Merged book ids" it prints are exactly the books expected from its
+folders (one per distinct file name). A failing chunk, or one whose ids don't
+add up (a folder with no usable book file), is split: items that calibredb's
+output names are retried on their own, otherwise the chunk is bisected until
+the bad item is isolated — so one corrupt EPUB fails alone
+instead of blocking the backlog. Failed items are tracked and given up on
+after IMPORT_MAX_ATTEMPTS runs until the file changes.
+
+Import state lives in a SQLite database keyed by item name, with each item's
+size, mtime and content hash. A run loads the known names once and compares
+stat results from a single directory scan, so already-imported items cost a
+dictionary lookup — not a scan of an ever-growing log file. Only new or
+changed items are hashed; an item whose content matches something already
+imported (renamed or re-downloaded release) is recorded and skipped.
+
+Candidates are also checked against a cached index of the Calibre library
+itself (format hashes plus normalized title/author, see library_index.py),
+refreshed incrementally when there is something to check. A book that is
+already in the library under another folder name is skipped before staging.
+
+With --watch the script stays running and imports as downloads finish:
+inotify on DOWNLOAD_DIR reports new entries, and an item counts as complete
+once its total size and newest mtime have been stable for
+WATCH_SETTLE_SECONDS and it contains no partial-download files (.part, .!qB,
+.crdownload). Items that finish close together are imported as one batch.
+The hourly timer keeps running as a catch-up sweep; a lock file keeps the two
+from importing at the same time.
+
+Configuration via environment variables or a .env file in the same directory:
+
+  CALIBRE_CONTAINER     Name of the running Calibre Docker container
+                        Default: calibre
+
+  DOWNLOAD_DIR          Directory containing book subdirectories or loose ebook files
+                        Required — no default
+
+  CALIBRE_LIBRARY_PATH  Path to the Calibre library inside the container
+                        Default: /config/Calibre Library
+
+  DOCKER_HOST           Docker daemon socket
+                        Default: unix:///var/run/docker.sock
+
+  IMPORT_CHUNK_SIZE     Items per calibredb add call
+                        Default: 20
+
+  IMPORT_MAX_ATTEMPTS   Runs an item may fail before it is skipped until it changes
+                        Default: 3
+
+  WATCH_SETTLE_SECONDS  --watch: how long an item must stay unchanged to count as complete
+                        Default: 10
+
+  WATCH_BATCH_SECONDS   --watch: how long to wait for other arrivals once one is complete
+                        Default: 20
+
+  STATE_DB              SQLite database tracking already-imported items
+                        Default: ~/.local/share/calibre-import/state.db
+
+  PROCESSED_LOG         Import-tracking log of the old calibre-import.sh. Read once
+                        and migrated into STATE_DB; never written.
+                        Default: ~/.local/share/calibre-import/processed.log
+
+  LOG_FILE              Path for the human-readable run log
+                        Default: ~/.local/share/calibre-import/import.log
+
+  STATUS_FILE           Path for a JSON status file (optional)
+                        When set, written after each run for dashboard integration
+                        Default: unset (disabled)
+
+  HISTORY_FILE          Ring buffer of recent runs (run_history.py), served with
+                        the status by calibre-status-server.py
+                        Default: history.bin next to STATUS_FILE, else in the data dir
+
+Usage:
+  calibre-import.py            # one sweep (timer)
+  calibre-import.py --watch    # import as downloads complete
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import inotify
+from docker_api import DockerAPI, DockerError, TarStream
+from library_index import LibraryIndex
+from run_history import RunHistory, RunRecord
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+# The archive's top-level directory is created by the extract — no mkdir exec
+CONTAINER_STAGING = "/tmp/calibre-import-staging"
+EBOOK_SUFFIXES = {".epub", ".mobi", ".azw3", ".pdf", ".zip"}
+BOOK_FORMATS = EBOOK_SUFFIXES - {".zip"}
+STATUS_VALUES = {"ok", "idle", "error"}
+# Download clients write to these names and rename on completion
+PARTIAL_SUFFIXES = (".part", ".!qb", ".crdownload")
+HASH_CHUNK = 1 << 20
+
+
+def load_env_file(path: Path) -> None:
+    """Load KEY=VALUE lines into os.environ; variables already set win."""
+    if not path.is_file():
+        return
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key, value = key.strip().removeprefix("export "), value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        os.environ.setdefault(key, value)
+
+
+class Config:
+    def __init__(self, env=os.environ):
+        data_dir = Path(env.get("XDG_DATA_HOME") or Path.home() / ".local/share") / "calibre-import"
+        self.container = env.get("CALIBRE_CONTAINER") or "calibre"
+        self.download_dir = env.get("DOWNLOAD_DIR", "")
+        self.library_path = env.get("CALIBRE_LIBRARY_PATH") or "/config/Calibre Library"
+        self.state_db = Path(env.get("STATE_DB") or data_dir / "state.db")
+        self.processed_log = Path(env.get("PROCESSED_LOG") or data_dir / "processed.log")
+        self.log_file = Path(env.get("LOG_FILE") or data_dir / "import.log")
+        self.status_file = Path(env["STATUS_FILE"]) if env.get("STATUS_FILE") else None
+        history_dir = self.status_file.parent if self.status_file else data_dir
+        self.history_file = Path(env.get("HISTORY_FILE") or history_dir / "history.bin")
+        self.chunk_size = max(1, int(env.get("IMPORT_CHUNK_SIZE") or 20))
+        self.max_attempts = max(1, int(env.get("IMPORT_MAX_ATTEMPTS") or 3))
+        self.lock_file = self.state_db.with_suffix(".lock")
+        self.settle = float(env.get("WATCH_SETTLE_SECONDS") or 10)
+        self.batch = float(env.get("WATCH_BATCH_SECONDS") or 20)
+
+    def validate(self) -> str | None:
+        """Return an error message, or None if the configuration is usable."""
+        if not self.download_dir:
+            return "DOWNLOAD_DIR is not set. Copy .env.example to .env and fill it in."
+        if not os.path.isdir(self.download_dir):
+            return f"DOWNLOAD_DIR '{self.download_dir}' does not exist or is not a directory."
+        # Restrict container name to safe characters — it ends up in API paths
+        if not re.fullmatch(r"[a-zA-Z0-9_.-]+", self.container):
+            return f"CALIBRE_CONTAINER '{self.container}' contains invalid characters."
+        return None
+
+
+# ── State store ──────────────────────────────────────────────────────────────
+
+class StateStore:
+    """Imported and failed items in SQLite: name → (size, mtime_ns, sha256)."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS imported (
+            name        TEXT PRIMARY KEY,
+            size        INTEGER,
+            mtime_ns    INTEGER,
+            sha256      TEXT,
+            imported_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS imported_sha256 ON imported (sha256);
+        CREATE TABLE IF NOT EXISTS failed (
+            name        TEXT PRIMARY KEY,
+            size        INTEGER,
+            mtime_ns    INTEGER,
+            sha256      TEXT,
+            attempts    INTEGER NOT NULL,
+            last_error  TEXT,
+            failed_at   TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(self.SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def migrate_processed_log(self, log_path: Path) -> int:
+        """Import basenames from the old processed.log once. Returns rows added.
+
+        Migrated rows have no size, mtime or hash; they are skipped by name
+        exactly as before.
+        """
+        if self.db.execute("SELECT 1 FROM meta WHERE key = 'processed_log_migrated'").fetchone():
+            return 0
+        added = 0
+        if log_path.is_file():
+            now = datetime.now().isoformat(timespec="seconds")
+            names = {line for line in log_path.read_text(errors="replace").splitlines() if line}
+            with self.db:
+                before = self.count()
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO imported (name, imported_at) VALUES (?, ?)",
+                    ((name, now) for name in names))
+                added = self.count() - before
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('processed_log_migrated', ?)",
+                            (str(log_path),))
+        return added
+
+    def known(self) -> dict[str, tuple[int | None, int | None]]:
+        """All imported names with their recorded (size, mtime_ns)."""
+        return {name: (size, mtime) for name, size, mtime
+                in self.db.execute("SELECT name, size, mtime_ns FROM imported")}
+
+    def name_for_hash(self, sha256: str) -> str | None:
+        row = self.db.execute("SELECT name FROM imported WHERE sha256 = ? LIMIT 1", (sha256,)).fetchone()
+        return row[0] if row else None
+
+    def record(self, items: list["Item"]) -> None:
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO imported (name, size, mtime_ns, sha256, imported_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((i.name, i.size, i.mtime_ns, i.sha256, now) for i in items))
+            self.db.executemany("DELETE FROM failed WHERE name = ?", ((i.name,) for i in items))
+
+    def failures(self) -> dict[str, tuple[int, int, int]]:
+        """Failed names with their (size, mtime_ns, attempts) at the last failure."""
+        return {name: (size, mtime, attempts) for name, size, mtime, attempts
+                in self.db.execute("SELECT name, size, mtime_ns, attempts FROM failed")}
+
+    def record_failure(self, item: "Item", error: str) -> int:
+        """Count a failed import; attempts restart when the item has changed."""
+        row = self.db.execute("SELECT size, mtime_ns, attempts FROM failed WHERE name = ?",
+                              (item.name,)).fetchone()
+        attempts = 1
+        if row is not None and (row[0], row[1]) == (item.size, item.mtime_ns):
+            attempts = row[2] + 1
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO failed "
+                "(name, size, mtime_ns, sha256, attempts, last_error, failed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (item.name, item.size, item.mtime_ns, item.sha256, attempts, error,
+                 datetime.now().isoformat(timespec="seconds")))
+        return attempts
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM imported").fetchone()[0]
+
+    def failed_count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM failed").fetchone()[0]
+
+
+# ── Scanning ─────────────────────────────────────────────────────────────────
+
+class Item:
+    """A candidate in DOWNLOAD_DIR: a release directory or a loose ebook file."""
+
+    def __init__(self, entry: os.DirEntry):
+        st = entry.stat()
+        self.path = entry.path
+        self.name = entry.name
+        self.is_dir = entry.is_dir()
+        # For a release directory these come from the directory itself: its
+        # mtime changes whenever files are added, removed or renamed in it
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.sha256: str | None = None
+        # Path → SHA-256 of each ebook file in the item, filled in by content_hash()
+        self.book_files: dict[str, str] = {}
+        self.staged = posixpath.join(CONTAINER_STAGING, self.name)
+
+    def content_hash(self) -> str:
+        """SHA-256 over the file, or over relative paths and contents for a directory.
+
+        The same pass hashes each ebook file on its own for the library index.
+        """
+        if self.sha256 is None:
+            h = hashlib.sha256()
+            if self.is_dir:
+                for root, dirs, files in os.walk(self.path):
+                    dirs.sort()
+                    for fname in sorted(files):
+                        full = os.path.join(root, fname)
+                        h.update(os.path.relpath(full, self.path).encode() + b"\0")
+                        self._hash_file(h, full)
+            else:
+                self._hash_file(h, self.path)
+            self.sha256 = h.hexdigest()
+        return self.sha256
+
+    def expected_books(self) -> int:
+        """Books calibredb add --recurse should make of this item (after content_hash()).
+
+        It groups a directory's files by name, so book.epub and book.mobi are
+        one book in two formats and other.epub is a second book.
+        """
+        if not self.is_dir:
+            return 1
+        return len({os.path.splitext(path)[0] for path in self.book_files})
+
+    def _hash_file(self, h, path: str) -> None:
+        own = hashlib.sha256() if os.path.splitext(path)[1].lower() in BOOK_FORMATS else None
+        with open(path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK):
+                h.update(chunk)
+                if own is not None:
+                    own.update(chunk)
+        if own is not None:
+            self.book_files[path] = own.hexdigest()
+
+
+def scan(download_dir: str) -> list[Item]:
+    """Top-level subdirectories and loose ebook/zip files, in name order."""
+    items = []
+    with os.scandir(download_dir) as it:
+        for entry in it:
+            if entry.is_dir():
+                items.append(Item(entry))
+            elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in EBOOK_SUFFIXES:
+                items.append(Item(entry))
+    items.sort(key=lambda i: (not i.is_dir, i.name))
+    return items
+
+
+def is_partial(name: str) -> bool:
+    return name.lower().endswith(PARTIAL_SUFFIXES)
+
+
+def has_partial_files(path: str) -> bool:
+    """True if a release directory still contains partial-download files."""
+    return any(is_partial(f) for _, _, files in os.walk(path) for f in files)
+
+
+def signature(path: str) -> tuple[int, int, bool] | None:
+    """(total size, newest mtime_ns, has partial files) of an item, None if gone."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if not os.path.isdir(path):
+        return st.st_size, st.st_mtime_ns, is_partial(path)
+    size, mtime, partial = 0, st.st_mtime_ns, False
+    for root, _, files in os.walk(path):
+        for f in files:
+            partial = partial or is_partial(f)
+            try:
+                fst = os.stat(os.path.join(root, f))
+            except FileNotFoundError:
+                continue
+            size += fst.st_size
+            mtime = max(mtime, fst.st_mtime_ns)
+    return size, mtime, partial
+
+
+def select_new(items: list[Item], state: StateStore, log, max_attempts: int = 3) -> list[Item]:
+    """Filter scanned items down to those that still need importing."""
+    known = state.known()
+    failed = state.failures()
+    new, seen_hashes, already, given_up = [], {}, [], 0
+    for item in items:
+        recorded = known.get(item.name)
+        if recorded is not None:
+            size, mtime_ns = recorded
+            # Migrated from processed.log (no stat recorded) or unchanged
+            if size is None or (size, mtime_ns) == (item.size, item.mtime_ns):
+                continue
+        failure = failed.get(item.name)
+        if failure is not None and failure[:2] == (item.size, item.mtime_ns) \
+                and failure[2] >= max_attempts:
+            given_up += 1
+            continue
+        if item.is_dir and has_partial_files(item.path):
+            log(f"Waiting: {item.name} (download in progress)")
+            continue
+        try:
+            sha = item.content_hash()
+        except OSError as e:
+            # Left unrecorded so the next run hashes it again
+            log(f"Waiting: {item.name} (could not read: {e})")
+            continue
+        if sha in seen_hashes:
+            # Duplicate within this run; picked up by hash once the first is imported
+            continue
+        match = state.name_for_hash(sha)
+        if match is not None:
+            if match != item.name:
+                log(f"Skipping: {item.name} (same content as {match})")
+            already.append(item)
+            continue
+        seen_hashes[sha] = item.name
+        new.append(item)
+    # Unchanged content under a new name or a touched mtime — remember it
+    if already:
+        state.record(already)
+    if given_up:
+        log(f"Skipping {given_up} item(s) that failed {max_attempts} times; "
+            f"replace or touch them to retry.")
+    return new
+
+
+# ── Importing ────────────────────────────────────────────────────────────────
+
+def chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def named_in(output: str, items: list[Item]) -> list[Item]:
+    """Items whose staged path appears in calibredb's output."""
+    return [i for i in items
+            if re.search(re.escape(i.staged) + r"(?:/|[\s'\":]|$)", output, re.MULTILINE)]
+
+
+def parse_add_output(output: str, items: list[Item]) -> tuple[int, list[Item]]:
+    """(number of book ids added or merged, items reported as already existing).
+
+    calibredb add prints "Added book ids: 1, 2" and "Merged book ids: 3" on
+    stdout. Books it skips as duplicates are listed under "...were not added
+    as they already exist...", one indented title or path per line.
+    """
+    ids = 0
+    for match in re.finditer(r"^(?:Added|Merged) book ids: *(.*)$", output, re.MULTILINE):
+        ids += len(re.findall(r"\d+", match[1]))
+    skipped = re.search(r"not added as they already exist.*\n((?:[ \t]+.*(?:\n|$))*)", output)
+    return ids, named_in(skipped[1], items) if skipped else []
+
+
+def import_chunk(chunk: list[Item], add, on_success, on_failure, on_duplicate) -> None:
+    """Run add(chunk) and work out what happened to each item.
+
+    add() returns (ok, output). Exit status 0 is not proof that every item
+    went in: calibredb also exits 0 when --recurse finds no book in a
+    directory, or when it skips duplicates. So items it lists as already
+    existing go to on_duplicate(), and the rest only count as imported when
+    the reported book ids are exactly the books expected from them; the ids
+    don't say which folder they came from, so a folder that made more books
+    than expected could otherwise hide one that made none. A single item
+    counts as imported if it made any book. Otherwise, and on a failing run,
+    the chunk is split: items calibredb names are retried on their own and
+    the rest as one chunk; if it names none (or all), the chunk is bisected.
+    Re-adding items that already went in is harmless with --automerge
+    ignore — they come back as merged ids.
+    """
+    ok, output = add(chunk)
+    if ok:
+        book_ids, duplicates = parse_add_output(output, chunk)
+        if duplicates:
+            on_duplicate(duplicates)
+        chunk = [i for i in chunk if i not in duplicates]
+        if not chunk:
+            return
+        if len(chunk) == 1:
+            if book_ids:
+                on_success(chunk, output)
+            else:
+                on_failure(chunk[0], "calibredb add found no book to import")
+            return
+        expected = [i.expected_books() for i in chunk]
+        if all(expected) and book_ids == sum(expected):
+            on_success(chunk, output)
+            return
+        suspects = []       # nothing to go on but the count
+    else:
+        if len(chunk) == 1:
+            on_failure(chunk[0], first_error(output))
+            return
+        suspects = named_in(output, chunk)
+    if suspects and len(suspects) < len(chunk):
+        rest = [i for i in chunk if i not in suspects]
+        parts = [rest] + [[i] for i in suspects]
+    else:
+        mid = len(chunk) // 2
+        parts = [chunk[:mid], chunk[mid:]]
+    for part in parts:
+        import_chunk(part, add, on_success, on_failure, on_duplicate)
+
+
+def first_error(output: str) -> str:
+    lines = [line.strip() for line in output.splitlines() if line.strip()]
+    for line in reversed(lines):
+        if re.search(r"error|fail|exception|invalid|corrupt", line, re.IGNORECASE):
+            return line[:500]
+    return lines[-1][:500] if lines else "calibredb add failed"
+
+
+@dataclass
+class RunStats:
+    imported: int = 0
+    failed: int = 0
+    duplicates: int = 0
+    bytes: int = 0
+    calibredb_calls: int = 0
+    started: float = 0.0
+    duration: float = 0.0
+
+
+# ── Main ─────────────────────────────────────────────────────────────────────
+
+class Runner:
+    def __init__(self, cfg: Config, docker: DockerAPI):
+        self.cfg = cfg
+        self.docker = docker
+        self.stats = RunStats(started=time.monotonic())
+        cfg.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self.state = StateStore(cfg.state_db)
+
+    def log(self, msg: str) -> None:
+        line = f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {msg}"
+        print(line, flush=True)
+        with self.cfg.log_file.open("a") as f:
+            f.write(line + "\n")
+
+    def write_status(self, run_status: str, last_count: int, stats: RunStats | None = None) -> None:
+        # Validate status value against known-good set
+        if run_status not in STATUS_VALUES:
+            run_status = "error"
+        stats = stats or RunStats()
+        RunHistory(self.cfg.history_file).append(RunRecord(
+            time=time.time(), duration_s=stats.duration, status=run_status,
+            items=last_count, failed=stats.failed, bytes=stats.bytes,
+            calibredb_calls=stats.calibredb_calls))
+        if self.cfg.status_file is None:
+            return
+        status = {
+            "status": run_status,
+            "last_run": f"{datetime.now():%Y-%m-%d %H:%M}",
+            "last_count": last_count,
+            "total_imported": self.state.count(),
+            "last_failed": stats.failed,
+            "total_failed": self.state.failed_count(),
+            "last_bytes": stats.bytes,
+            "last_duration_s": round(stats.duration, 1),
+            "items_per_min": round(last_count * 60 / stats.duration, 1) if stats.duration else 0,
+            "mb_per_s": round(stats.bytes / 1e6 / stats.duration, 2) if stats.duration else 0,
+        }
+        path = self.cfg.status_file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so the status server never serves a half-written file
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(status, separators=(",", ":")) + "\n")
+        os.replace(tmp, path)
+
+    def calibredb_add(self, chunk: list[Item], stats: RunStats) -> tuple[bool, str]:
+        stats.calibredb_calls += 1
+        exit_code, stdout, stderr = self.docker.exec(self.cfg.container, [
+            "calibredb", "add", "--with-library", self.cfg.library_path,
+            "--recurse", "--automerge", "ignore", *(item.staged for item in chunk)])
+        output = stdout + stderr
+        if output:
+            print(output, end="" if output.endswith("\n") else "\n", flush=True)
+        return exit_code == 0, output
+
+    def skip_library_duplicates(self, items: list[Item]) -> list[Item]:
+        """Drop (and record) candidates that are already in the Calibre library."""
+        library = LibraryIndex(self.state.db, self.docker, self.cfg.container, self.cfg.library_path)
+        try:
+            updated, removed, total = library.refresh()
+        except (RuntimeError, ValueError) as e:
+            self.log(f"WARNING: Library index refresh failed, not checking duplicates: {e}")
+            return items
+        if updated or removed:
+            self.log(f"Library index: {total} books ({updated} updated, {removed} removed).")
+
+        new, duplicates = [], []
+        for item in items:
+            match = library.match(item.book_files)
+            if match is None:
+                new.append(item)
+            else:
+                self.log(f"Skipping: {item.name} (already in library: {match})")
+                duplicates.append(item)
+        if duplicates:
+            self.state.record(duplicates)
+        return new
+
+    def run(self, exclude: frozenset[str] = frozenset()) -> int:
+        """One import sweep; names in `exclude` (still downloading) are left alone."""
+        stats = self.stats = RunStats(started=time.monotonic())
+        migrated = self.state.migrate_processed_log(self.cfg.processed_log)
+        if migrated:
+            self.log(f"Migrated {migrated} entries from {self.cfg.processed_log}.")
+
+        # Anything touched within the settle window may still be arriving
+        fresh_ns = time.time_ns() - int(self.cfg.settle * 1e9)
+        items = [i for i in scan(self.cfg.download_dir)
+                 if i.name not in exclude and i.mtime_ns < fresh_ns]
+        new_items = select_new(items, self.state, self.log, self.cfg.max_attempts)
+        if new_items:
+            new_items = self.skip_library_duplicates(new_items)
+        if not new_items:
+            self.log("No new books to import.")
+            stats.duration = time.monotonic() - stats.started
+            self.write_status("idle", 0, stats)
+            return 0
+
+        self.log(f"Found {len(new_items)} new item(s) to import.")
+        container = self.cfg.container
+        staging_parent, staging_name = os.path.split(CONTAINER_STAGING)
+
+        # Stage everything in one streamed archive, then import
+        stream = TarStream(staging_name, [item.path for item in new_items],
+                           on_item=lambda path: self.log(f"Staging: {os.path.basename(path)}"))
+        try:
+            self.docker.put_archive(container, staging_parent, stream)
+            stats.bytes = stream.bytes_sent
+            self.log(f"Staged {len(new_items)} item(s), {stream.bytes_sent / 1e6:.1f} MB in one transfer.")
+
+            def on_success(chunk: list[Item], _output: str) -> None:
+                # Recorded per chunk, so a later failure or crash keeps this progress
+                self.state.record(chunk)
+                stats.imported += len(chunk)
+
+            def on_failure(item: Item, error: str) -> None:
+                attempts = self.state.record_failure(item, error)
+                stats.failed += 1
+                self.log(f"FAILED: {item.name} (attempt {attempts}/{self.cfg.max_attempts}): {error}")
+
+            def on_duplicate(items: list[Item]) -> None:
+                for item in items:
+                    self.log(f"Skipping: {item.name} (calibredb: already in library)")
+                self.state.record(items)
+                stats.duplicates += len(items)
+
+            batches = list(chunks(new_items, self.cfg.chunk_size))
+            for n, chunk in enumerate(batches, 1):
+                self.log(f"Running calibredb add ({n}/{len(batches)}, {len(chunk)} item(s))...")
+                import_chunk(chunk, lambda c: self.calibredb_add(c, stats),
+                             on_success, on_failure, on_duplicate)
+
+            stats.duration = time.monotonic() - stats.started
+            if stats.failed and not stats.imported and not stats.duplicates:
+                self.log(f"ERROR: calibredb add failed for all {stats.failed} item(s). Nothing recorded as processed.")
+                self.write_status("error", 0, stats)
+                return 1
+            skipped = f", {stats.duplicates} already in library" if stats.duplicates else ""
+            if stats.failed:
+                self.log(f"Done. {stats.imported} item(s) imported{skipped}, {stats.failed} failed "
+                         f"({stats.calibredb_calls} calibredb runs, {stats.duration:.0f}s).")
+            else:
+                self.log(f"Done. {stats.imported} item(s) imported successfully{skipped}.")
+            self.write_status("ok", stats.imported, stats)
+            return 0
+        finally:
+            # Clean up staging directory inside the container
+            try:
+                self.docker.exec(container, ["rm", "-rf", CONTAINER_STAGING])
+            except (DockerError, OSError):
+                pass
+
+    def locked_run(self, exclude: frozenset[str] = frozenset(), wait: bool = True) -> int:
+        """run() under the lock file shared by the timer and --watch."""
+        with self.cfg.lock_file.open("w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+            except BlockingIOError:
+                self.log("Another import is running; skipping this sweep.")
+                return 0
+            try:
+                return self.run(exclude)
+            except (DockerError, OSError) as e:
+                self.log(f"ERROR: Docker request failed: {e}")
+                self.stats.duration = time.monotonic() - self.stats.started
+                self.write_status("error", 0, self.stats)
+                return 1
+
+
+# ── Watch mode ───────────────────────────────────────────────────────────────
+
+WATCH_MASK = (inotify.IN_CREATE | inotify.IN_MOVED_TO | inotify.IN_CLOSE_WRITE
+              | inotify.IN_MODIFY | inotify.IN_ATTRIB)
+POLL_SECONDS = 2.0
+
+
+class Pending:
+    """An arrival being watched until its signature stops changing."""
+
+    def __init__(self, sig: tuple[int, int, bool], now: float):
+        self.sig = sig
+        self.changed_at = now
+
+    def update(self, sig: tuple[int, int, bool], now: float) -> None:
+        if sig != self.sig:
+            self.sig = sig
+            self.changed_at = now
+
+    def complete(self, now: float, settle: float) -> bool:
+        return not self.sig[2] and now - self.changed_at >= settle
+
+
+def watch(runner: Runner) -> None:
+    """Import items as they finish downloading, batching close arrivals."""
+    cfg = runner.cfg
+    pending: dict[str, Pending] = {}
+    first_ready: float | None = None
+
+    with inotify.Inotify() as ino:
+        ino.add_watch(cfg.download_dir, WATCH_MASK | inotify.IN_ONLYDIR)
+        runner.log(f"Watching {cfg.download_dir} (settle {cfg.settle:.0f}s, batch {cfg.batch:.0f}s).")
+        # Catch up on anything that arrived while we weren't watching
+        runner.locked_run()
+
+        while True:
+            events = ino.read(timeout=POLL_SECONDS if pending else None)
+            now = time.monotonic()
+            for _wd, mask, name in events:
+                if mask & inotify.IN_Q_OVERFLOW:
+                    # Lost events — fall back to treating every entry as an arrival
+                    names = os.listdir(cfg.download_dir)
+                elif name and not is_partial(name):
+                    names = [name]
+                else:
+                    continue
+                for n in names:
+                    sig = signature(os.path.join(cfg.download_dir, n))
+                    if sig is None:
+                        continue
+                    if n in pending:
+                        pending[n].update(sig, now)
+                    else:
+                        pending[n] = Pending(sig, now)
+
+            for name in list(pending):
+                sig = signature(os.path.join(cfg.download_dir, name))
+                if sig is None:
+                    del pending[name]
+                else:
+                    pending[name].update(sig, now)
+
+            ready = [n for n, p in pending.items() if p.complete(now, cfg.settle)]
+            if not ready:
+                first_ready = None
+                continue
+            first_ready = first_ready or now
+            # Run once everything pending is complete, or the batch window is up
+            if len(ready) < len(pending) and now - first_ready < cfg.batch:
+                continue
+
+            runner.log(f"{len(ready)} download(s) complete: {', '.join(sorted(ready))}")
+            still_downloading = frozenset(pending) - set(ready)
+            runner.locked_run(exclude=still_downloading)
+            for name in ready:
+                del pending[name]
+            first_ready = None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and import items as their downloads complete")
+    args = parser.parse_args()
+
+    load_env_file(SCRIPT_DIR / ".env")
+    cfg = Config()
+
+    error = cfg.validate()
+    if error:
+        print(f"ERROR: {error}", file=sys.stderr)
+        return 1
+
+    docker = DockerAPI()
+    try:
+        # Verify the container is actually running before doing any work
+        if not docker.container_running(cfg.container):
+            print(f"ERROR: Container '{cfg.container}' is not running.", file=sys.stderr)
+            return 1
+    except (DockerError, OSError) as e:
+        print(f"ERROR: Cannot reach the Docker daemon: {e}", file=sys.stderr)
+        return 1
+
+    runner = Runner(cfg, docker)
+    try:
+        if args.watch:
+            watch(runner)
+            return 0
+        # The timer sweep skips rather than queue behind a running import
+        return runner.locked_run(wait=False)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        runner.state.close()
+        docker.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+calibre-status-server.py — HTTP status endpoints for calibre-import
+
+Replaces `python3 -m http.server` over the status directory. Serves:
+
+  /status.json    the last-run JSON written by calibre-import.py (unchanged contract)
+  /history.json   recent runs from the run-history ring buffer, oldest first
+                  (?limit=N for the last N)
+  /metrics        Prometheus text format: last-run gauges, lifetime counters
+                  and recent throughput
+
+Responses are built once per change of the underlying files (keyed on
+mtime and size) and served from memory with an ETag; a poll with a matching
+If-None-Match gets 304 Not Modified and no body. Anything else is 404.
+
+Usage:
+  calibre-status-server.py --bind ADDR [--port 8999]
+                           [--status-file PATH] [--history-file PATH]
+
+Options:
+  --bind          Address to listen on — use the LAN IP, not 0.0.0.0
+  --port          Port (default: 8999)
+  --status-file   Status JSON (default: /var/lib/calibre-import/status.json)
+  --history-file  Run history (default: history.bin next to the status file)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from run_history import STATUSES, RunHistory, RunRecord, Totals
+
+DEFAULT_STATUS = Path("/var/lib/calibre-import/status.json")
+THROUGHPUT_WINDOW = 24 * 3600
+
+
+def _file_key(*paths: Path) -> tuple:
+    key = []
+    for p in paths:
+        try:
+            st = p.stat()
+            key.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            key.append(None)
+    return tuple(key)
+
+
+def _number(value: float) -> str:
+    # repr keeps full precision (timestamps); whole numbers print without ".0"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_metrics(status: dict | None, records: list[RunRecord], totals: Totals) -> str:
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{name}{labels} {_number(value)}" for labels, value in samples)
+
+    metric("calibre_import_runs_total", "counter", "Import runs by result.",
+           [(f'{{status="{s}"}}', totals.runs.get(s, 0)) for s in STATUSES])
+    metric("calibre_import_items_total", "counter", "Items imported.", [("", totals.items)])
+    metric("calibre_import_failures_total", "counter", "Item import failures.", [("", totals.failed)])
+    metric("calibre_import_bytes_total", "counter", "Bytes staged into the container.", [("", totals.bytes)])
+
+    if records:
+        last = records[-1]
+        metric("calibre_import_last_run_timestamp_seconds", "gauge", "Start of the last run.", [("", last.time)])
+        metric("calibre_import_last_run_duration_seconds", "gauge", "Duration of the last run.", [("", last.duration_s)])
+        metric("calibre_import_last_run_items", "gauge", "Items imported by the last run.", [("", last.items)])
+        metric("calibre_import_last_run_failed", "gauge", "Items that failed in the last run.", [("", last.failed)])
+        metric("calibre_import_last_run_bytes", "gauge", "Bytes staged by the last run.", [("", last.bytes)])
+
+        recent = [r for r in records if r.time >= time.time() - THROUGHPUT_WINDOW and r.items]
+        busy = sum(r.duration_s for r in recent)
+        metric("calibre_import_items_per_minute_24h", "gauge",
+               "Import throughput over runs that imported something in the last 24h.",
+               [("", sum(r.items for r in recent) * 60 / busy if busy else 0)])
+        metric("calibre_import_bytes_per_second_24h", "gauge",
+               "Staging throughput over runs that imported something in the last 24h.",
+               [("", sum(r.bytes for r in recent) / busy if busy else 0)])
+
+    if status:
+        metric("calibre_import_library_imported", "gauge", "Items recorded as imported.",
+               [("", status.get("total_imported", 0))])
+        metric("calibre_import_failing_items", "gauge", "Items currently failing to import.",
+               [("", status.get("total_failed", 0))])
+    return "\n".join(lines) + "\n"
+
+
+class StatusCache:
+    """Rendered responses, rebuilt only when the status or history file changes."""
+
+    def __init__(self, status_file: Path, history_file: Path):
+        self.status_file = status_file
+        self.history = RunHistory(history_file)
+        self._cache: dict[str, tuple[tuple, bytes, str, str]] = {}
+        self._lock = threading.Lock()
+
+    def _status(self) -> dict | None:
+        try:
+            return json.loads(self.status_file.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _history(self) -> tuple[list[RunRecord], Totals]:
+        # A truncated or foreign file reads as no history, like a bad status file
+        try:
+            return self.history.load()
+        except ValueError:
+            return [], Totals(runs=dict.fromkeys(STATUSES, 0))
+
+    def _render(self, path: str, query: dict) -> tuple[bytes, str] | None:
+        if path == "/status.json":
+            try:
+                return self.status_file.read_bytes(), "application/json"
+            except FileNotFoundError:
+                return b'{"status":"unknown"}\n', "application/json"
+        if path == "/history.json":
+            records, _ = self._history()
+            limit = query.get("limit", [""])[0]
+            if limit.isdigit():
+                records = records[-int(limit):] if int(limit) else []
+            body = json.dumps([r.to_json() for r in records], separators=(",", ":"))
+            return body.encode() + b"\n", "application/json"
+        if path == "/metrics":
+            return render_metrics(self._status(), *self._history()).encode(), "text/plain; version=0.0.4"
+        return None
+
+    def get(self, path: str, query: dict) -> tuple[bytes, str, str] | None:
+        """(body, content type, ETag) for a path, or None for 404."""
+        key = _file_key(self.status_file, self.history.path)
+        limit = query.get("limit", [""])[0]
+        cache_key = f"{path}?{limit if limit.isdigit() else ''}"
+        # /metrics includes a time-windowed gauge, so it also expires each minute
+        if path == "/metrics":
+            key += (int(time.time() // 60),)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached and cached[0] == key:
+                return cached[1:]
+            rendered = self._render(path, query)
+            if rendered is None:
+                return None
+            body, ctype = rendered
+            etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+            self._cache[cache_key] = (key, body, ctype, etag)
+            return body, ctype, etag
+
+
+class Handler(BaseHTTPRequestHandler):
+    cache: StatusCache
+
+    def do_GET(self) -> None:
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool) -> None:
+        url = urlsplit(self.path)
+        result = self.cache.get(url.path, parse_qs(url.query))
+        if result is None:
+            self.send_error(404)
+            return
+        body, ctype, etag = result
+        if etag in (t.strip() for t in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass  # dashboards poll constantly; keep the journal quiet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bind", required=True, help="Address to listen on (LAN IP)")
+    parser.add_argument("--port", type=int, default=8999, help="Port (default: 8999)")
+    parser.add_argument("--status-file", type=Path,
+                        default=Path(os.environ.get("STATUS_FILE") or DEFAULT_STATUS),
+                        help=f"Status JSON (default: {DEFAULT_STATUS})")
+    parser.add_argument("--history-file", type=Path, default=None,
+                        help="Run history ring buffer (default: history.bin next to the status file)")
+    args = parser.parse_args()
+
+    history_file = args.history_file or Path(os.environ.get("HISTORY_FILE") or
+                                             args.status_file.parent / "history.bin")
+    Handler.cache = StatusCache(args.status_file, history_file)
+    server = ThreadingHTTPServer((args.bind, args.port), Handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+docker_api.py — Minimal Docker Engine API client for calibre-import.py
+
+Talks HTTP/1.1 to the daemon socket named by $DOCKER_HOST (default
+unix:///var/run/docker.sock; tcp://host:port also works) over one kept-alive
+connection. Covers only what the importer needs:
+
+  - container inspect (is it running?)
+  - PUT /containers/{id}/archive — upload a tar stream, sent with chunked
+    transfer encoding so it is generated on the fly with no temp file
+  - exec create / start / inspect — run a command and collect its output
+
+`exec start` without a TTY hijacks the connection for the multiplexed output
+stream and the daemon closes it afterwards; http.client reopens it on the
+next request.
+"""
+
+import http.client
+import json
+import os
+import socket
+import struct
+import tarfile
+import time
+from urllib.parse import quote, urlencode, urlsplit
+
+DEFAULT_HOST = "unix:///var/run/docker.sock"
+READ_CHUNK = 1 << 20
+
+
+class DockerError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Docker API {status}: {message}")
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float | None = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DockerAPI:
+    def __init__(self, host: str | None = None, timeout: float | None = None):
+        url = urlsplit(host or os.environ.get("DOCKER_HOST") or DEFAULT_HOST)
+        if url.scheme == "unix":
+            self.conn = _UnixHTTPConnection(url.path, timeout=timeout)
+        elif url.scheme in ("tcp", "http"):
+            self.conn = http.client.HTTPConnection(url.hostname, url.port or 2375, timeout=timeout)
+        else:
+            raise ValueError(f"Unsupported DOCKER_HOST: {host}")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _request(self, method: str, path: str, body=None, headers: dict | None = None,
+                 **kwargs) -> http.client.HTTPResponse:
+        headers = dict(headers or {})
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        try:
+            self.conn.request(method, path, body=body, headers=headers, **kwargs)
+            resp = self.conn.getresponse()
+        except (ConnectionError, http.client.HTTPException):
+            # Kept-alive connection dropped by the daemon between requests
+            self.conn.close()
+            raise
+        if resp.status >= 400:
+            data = resp.read()
+            try:
+                message = json.loads(data).get("message", "")
+            except ValueError:
+                message = data.decode(errors="replace")
+            raise DockerError(resp.status, message.strip())
+        return resp
+
+    def _json(self, method: str, path: str, body=None):
+        data = self._request(method, path, body).read()
+        return json.loads(data) if data else None
+
+    # ── containers ───────────────────────────────────────────────────────────
+
+    def container_running(self, name: str) -> bool:
+        try:
+            info = self._json("GET", f"/containers/{quote(name)}/json")
+        except DockerError as e:
+            if e.status == 404:
+                return False
+            raise
+        return bool(info.get("State", {}).get("Running"))
+
+    def put_archive(self, name: str, path: str, stream) -> None:
+        """Extract a tar stream (an iterable of bytes) into `path` in the container."""
+        query = urlencode({"path": path})
+        self._request("PUT", f"/containers/{quote(name)}/archive?{query}", body=stream,
+                      headers={"Content-Type": "application/x-tar"},
+                      encode_chunked=True).read()
+
+    # ── exec ─────────────────────────────────────────────────────────────────
+
+    def exec(self, name: str, cmd: list[str]) -> tuple[int, str, str]:
+        """Run cmd in the container; returns (exit code, stdout, stderr)."""
+        created = self._json("POST", f"/containers/{quote(name)}/exec", {
+            "Cmd": cmd, "AttachStdout": True, "AttachStderr": True, "Tty": False,
+        })
+        exec_id = created["Id"]
+        resp = self._request("POST", f"/exec/{exec_id}/start", {"Detach": False, "Tty": False})
+        stdout, stderr = _demux(resp)
+
+        # The stream can end a moment before the exit code is recorded
+        for _ in range(50):
+            info = self._json("GET", f"/exec/{exec_id}/json")
+            if not info.get("Running"):
+                return info.get("ExitCode") or 0, stdout, stderr
+            time.sleep(0.1)
+        return -1, stdout, stderr
+
+
+def _demux(resp: http.client.HTTPResponse) -> tuple[str, str]:
+    """Read a non-TTY exec stream: frames of [type, 0, 0, 0, size32] + payload.
+
+    Stream type 1 is stdout and 2 is stderr.
+    """
+    out, err = bytearray(), bytearray()
+    while header := resp.read(8):
+        if len(header) < 8:
+            break
+        stream, size = struct.unpack(">BxxxI", header)
+        (err if stream == 2 else out).extend(resp.read(size))
+    resp.close()
+    return out.decode(errors="replace"), err.decode(errors="replace")
+
+
+# ── tar streaming ────────────────────────────────────────────────────────────
+
+class TarStream:
+    """Iterate a tar archive of local paths under one top-level directory.
+
+    Headers come from TarInfo.tobuf() and file data is read in chunks, so the
+    archive is never held in memory or written to disk. `on_item` is called
+    with each path as it starts streaming; `bytes_sent` counts file payload.
+    """
+
+    def __init__(self, root: str, paths: list[str], on_item=None):
+        self.root = root
+        self.paths = paths
+        self.on_item = on_item
+        self.bytes_sent = 0
+
+    def __iter__(self):
+        yield self._dir_header(self.root, time.time())
+        for path in self.paths:
+            if self.on_item is not None:
+                self.on_item(path)
+            arcbase = f"{self.root}/{os.path.basename(path)}"
+            if os.path.isdir(path):
+                yield from self._walk(path, arcbase)
+            else:
+                yield from self._file(path, arcbase)
+        # End of archive: two zero blocks
+        yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+    def _walk(self, top: str, arcbase: str):
+        yield self._dir_header(arcbase, os.stat(top).st_mtime)
+        for root, dirs, files in os.walk(top):
+            dirs.sort()
+            rel = os.path.relpath(root, top)
+            arcroot = arcbase if rel == "." else f"{arcbase}/{rel}"
+            for d in dirs:
+                yield self._dir_header(f"{arcroot}/{d}", os.stat(os.path.join(root, d)).st_mtime)
+            for f in sorted(files):
+                full = os.path.join(root, f)
+                if os.path.isfile(full):
+                    yield from self._file(full, f"{arcroot}/{f}")
+
+    @staticmethod
+    def _dir_header(name: str, mtime: float) -> bytes:
+        info = tarfile.TarInfo(name)
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+        info.mtime = int(mtime)
+        return info.tobuf(tarfile.PAX_FORMAT)
+
+    def _file(self, path: str, arcname: str):
+        st = os.stat(path)
+        info = tarfile.TarInfo(arcname)
+        info.size = st.st_size
+        info.mode = 0o644
+        info.mtime = int(st.st_mtime)
+        yield info.tobuf(tarfile.PAX_FORMAT)
+
+        # Send exactly the size in the header, even if the file changes under us
+        remaining = st.st_size
+        with open(path, "rb") as f:
+            while remaining > 0:
+                chunk = f.read(min(READ_CHUNK, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        if remaining:
+            yield tarfile.NUL * remaining
+        self.bytes_sent += st.st_size
+        padding = -st.st_size % tarfile.BLOCKSIZE
+        if padding:
+            yield tarfile.NUL * padding
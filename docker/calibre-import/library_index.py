@@ -0,0 +1,177 @@
+"""
+library_index.py — Local index of the Calibre library for duplicate detection
+
+Caches, in the importer's SQLite state database, every book in the library
+with the SHA-256 of each format file and normalized title/author keys. The
+index is refreshed from one `calibredb list --for-machine` exec; only books
+that are new or whose last_modified changed have their format files hashed
+(`sha256sum` inside the container), and deleted books are dropped.
+
+Candidates are then checked locally, before anything is staged: a candidate
+is a duplicate if one of its ebook files has the same hash as a library
+format, or if an EPUB's own metadata (OPF title and creators) matches a
+library book's title and one of its authors after normalization.
+"""
+
+import json
+import os
+import re
+import unicodedata
+import xml.etree.ElementTree as ET
+import zipfile
+
+HASH_BATCH = 200
+
+_NS = {
+    "c": "urn:oasis:names:tc:opendocument:xmlns:container",
+    "opf": "http://www.idpf.org/2007/opf",
+    "dc": "http://purl.org/dc/elements/1.1/",
+}
+_ARTICLES = re.compile(r"^(the|a|an) ")
+
+
+def normalize(text: str) -> str:
+    """Casefold, strip accents and punctuation, drop a leading article."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = text.replace("&", " and ")
+    text = " ".join(re.sub(r"[^\w]+", " ", text).split())
+    return _ARTICLES.sub("", text)
+
+
+def normalize_author(name: str) -> str:
+    # "Le Guin, Ursula K." → "Ursula K. Le Guin"
+    if name.count(",") == 1:
+        last, first = (part.strip() for part in name.split(","))
+        name = f"{first} {last}"
+    return normalize(name)
+
+
+def title_keys(title: str, authors: list[str]) -> set[str]:
+    title = normalize(title)
+    if not title:
+        return set()
+    return {f"{title}|{a}" for a in map(normalize_author, authors) if a}
+
+
+def epub_metadata(path: str) -> tuple[str, list[str]] | None:
+    """(title, authors) from an EPUB's OPF package document, or None."""
+    try:
+        with zipfile.ZipFile(path) as z:
+            container = ET.fromstring(z.read("META-INF/container.xml"))
+            rootfile = container.find(".//c:rootfile", _NS)
+            if rootfile is None:
+                return None
+            opf = ET.fromstring(z.read(rootfile.get("full-path")))
+    except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError):
+        return None
+    metadata = opf.find("opf:metadata", _NS)
+    if metadata is None:
+        return None
+    title = metadata.findtext("dc:title", default="", namespaces=_NS).strip()
+    authors = [c.text.strip() for c in metadata.findall("dc:creator", _NS)
+               if c.text and c.get(f"{{{_NS['opf']}}}role", "aut") == "aut"]
+    return (title, authors) if title else None
+
+
+class LibraryIndex:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS library_books (
+            id            INTEGER PRIMARY KEY,
+            title         TEXT,
+            authors       TEXT,
+            last_modified TEXT
+        );
+        CREATE TABLE IF NOT EXISTS library_formats (
+            book_id INTEGER NOT NULL,
+            sha256  TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS library_formats_sha256 ON library_formats (sha256);
+        CREATE INDEX IF NOT EXISTS library_formats_book ON library_formats (book_id);
+        CREATE TABLE IF NOT EXISTS library_titles (
+            key     TEXT NOT NULL,
+            book_id INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS library_titles_key ON library_titles (key);
+        CREATE INDEX IF NOT EXISTS library_titles_book ON library_titles (book_id);
+    """
+
+    def __init__(self, db, docker, container: str, library_path: str):
+        self.db = db
+        self.docker = docker
+        self.container = container
+        self.library_path = library_path
+        self.db.executescript(self.SCHEMA)
+
+    def _exec(self, cmd: list[str]) -> str:
+        code, stdout, stderr = self.docker.exec(self.container, cmd)
+        if code != 0:
+            raise RuntimeError(f"{cmd[0]} exited {code}: {stderr.strip()[-300:]}")
+        return stdout
+
+    def refresh(self) -> tuple[int, int, int]:
+        """Sync with the library. Returns (books updated, books removed, total)."""
+        books = json.loads(self._exec([
+            "calibredb", "list", "--with-library", self.library_path, "--for-machine",
+            "--fields", "title,authors,formats,last_modified"]))
+        cached = dict(self.db.execute("SELECT id, last_modified FROM library_books"))
+        current = {b["id"] for b in books}
+        changed = [b for b in books if cached.get(b["id"]) != str(b.get("last_modified"))]
+        removed = [book_id for book_id in cached if book_id not in current]
+
+        # Hash the changed books' formats inside the container, batched per exec
+        paths = [(b["id"], p) for b in changed for p in b.get("formats") or []]
+        hashes: dict[str, str] = {}
+        for start in range(0, len(paths), HASH_BATCH):
+            batch = [p for _, p in paths[start:start + HASH_BATCH]]
+            code, stdout, _ = self.docker.exec(self.container, ["sha256sum", "--", *batch])
+            # Non-zero when a file vanished mid-refresh; keep what was hashed
+            for line in stdout.splitlines():
+                digest, _, path = line.partition("  ")
+                if path:
+                    hashes[path] = digest
+
+        with self.db:
+            stale = [(i,) for i in removed] + [(b["id"],) for b in changed]
+            for table, column in (("library_books", "id"), ("library_formats", "book_id"),
+                                  ("library_titles", "book_id")):
+                self.db.executemany(f"DELETE FROM {table} WHERE {column} = ?", stale)
+            for b in changed:
+                authors = [a.strip() for a in str(b.get("authors", "")).split("&") if a.strip()]
+                self.db.execute("INSERT INTO library_books VALUES (?, ?, ?, ?)",
+                                (b["id"], b.get("title", ""), " & ".join(authors),
+                                 str(b.get("last_modified"))))
+                self.db.executemany("INSERT INTO library_titles VALUES (?, ?)",
+                                    ((k, b["id"]) for k in title_keys(b.get("title", ""), authors)))
+            self.db.executemany("INSERT INTO library_formats VALUES (?, ?)",
+                                ((book_id, hashes[p]) for book_id, p in paths if p in hashes))
+        return len(changed), len(removed), len(books)
+
+    def match(self, book_files: dict[str, str]) -> str | None:
+        """Describe the library book a candidate duplicates, or None.
+
+        book_files maps each local ebook file of the candidate to its SHA-256.
+        """
+        for path, sha in book_files.items():
+            row = self.db.execute("SELECT book_id FROM library_formats WHERE sha256 = ? LIMIT 1",
+                                  (sha,)).fetchone()
+            if row:
+                return self._describe(row[0], f"same file as {os.path.basename(path)}")
+        for path in book_files:
+            if not path.lower().endswith(".epub"):
+                continue
+            meta = epub_metadata(path)
+            if meta is None:
+                continue
+            for key in title_keys(*meta):
+                row = self.db.execute("SELECT book_id FROM library_titles WHERE key = ? LIMIT 1",
+                                      (key,)).fetchone()
+                if row:
+                    return self._describe(row[0], "same title and author")
+        return None
+
+    def _describe(self, book_id: int, reason: str) -> str:
+        row = self.db.execute("SELECT title, authors FROM library_books WHERE id = ?",
+                              (book_id,)).fetchone()
+        title, authors = row if row else ("?", "?")
+        return f"book #{book_id} '{title}' by {authors}, {reason}"
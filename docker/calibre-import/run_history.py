@@ -0,0 +1,124 @@
+"""
+run_history.py — Fixed-size ring buffer of calibre-import runs
+
+One small binary file: a header with the ring position and lifetime
+counters, followed by CAPACITY fixed-width records (48 bytes each), so the
+file never grows and a reader gets the whole history with one read. Writers
+replace the file atomically (write + rename); import runs are already
+serialized by the importer's lock file.
+
+Record: time, duration, items imported, items failed, bytes staged,
+calibredb calls and run status. The lifetime counters (runs per status,
+items, failures, bytes) only ever increase, for Prometheus counters.
+"""
+
+import os
+import struct
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+MAGIC = b"CIRH"
+VERSION = 1
+CAPACITY = 1024
+STATUSES = ("ok", "idle", "error")
+
+# magic, version, capacity, next slot, count,
+# runs ok/idle/error, items, failed, bytes (lifetime totals)
+_HEADER = struct.Struct("<4sHHII3QQQQ")
+# time, duration, items, failed, bytes, calibredb calls, status index
+_RECORD = struct.Struct("<ddIIQHB13x")
+
+
+@dataclass
+class RunRecord:
+    time: float
+    duration_s: float
+    status: str
+    items: int = 0
+    failed: int = 0
+    bytes: int = 0
+    calibredb_calls: int = 0
+
+    def to_json(self) -> dict:
+        d = asdict(self)
+        d["time"] = datetime.fromtimestamp(self.time).isoformat(timespec="seconds")
+        d["duration_s"] = round(self.duration_s, 2)
+        return d
+
+
+@dataclass
+class Totals:
+    runs: dict[str, int]
+    items: int = 0
+    failed: int = 0
+    bytes: int = 0
+
+
+class RunHistory:
+    def __init__(self, path: Path, capacity: int = CAPACITY):
+        self.path = Path(path)
+        self.capacity = capacity
+
+    def load(self) -> tuple[list[RunRecord], Totals]:
+        """All stored runs, oldest first, and the lifetime totals."""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return [], Totals(runs=dict.fromkeys(STATUSES, 0))
+        return self.parse(data)
+
+    @staticmethod
+    def parse(data: bytes) -> tuple[list[RunRecord], Totals]:
+        """Raises ValueError for anything but a whole run history file."""
+        if len(data) < _HEADER.size:
+            raise ValueError("truncated run history file")
+        (magic, version, capacity, next_slot, count,
+         ok, idle, error, items, failed, nbytes) = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a calibre-import run history file")
+        if not capacity or count > capacity or len(data) < _HEADER.size + capacity * _RECORD.size:
+            raise ValueError("truncated run history file")
+        totals = Totals(runs={"ok": ok, "idle": idle, "error": error},
+                        items=items, failed=failed, bytes=nbytes)
+        records = []
+        start = (next_slot - count) % capacity
+        for i in range(count):
+            slot = (start + i) % capacity
+            t, duration, r_items, r_failed, r_bytes, calls, status = _RECORD.unpack_from(
+                data, _HEADER.size + slot * _RECORD.size)
+            if status >= len(STATUSES):
+                raise ValueError(f"bad status {status} in run history slot {slot}")
+            records.append(RunRecord(time=t, duration_s=duration, status=STATUSES[status],
+                                     items=r_items, failed=r_failed, bytes=r_bytes,
+                                     calibredb_calls=calls))
+        return records, totals
+
+    def append(self, record: RunRecord) -> None:
+        try:
+            buf = bytearray(self.path.read_bytes())
+            header = list(_HEADER.unpack_from(buf))
+            if header[0] != MAGIC or header[2] != self.capacity \
+                    or len(buf) != _HEADER.size + self.capacity * _RECORD.size:
+                raise ValueError
+        except (FileNotFoundError, ValueError, struct.error):
+            buf = bytearray(_HEADER.size + self.capacity * _RECORD.size)
+            header = [MAGIC, VERSION, self.capacity, 0, 0, 0, 0, 0, 0, 0, 0]
+
+        status = STATUSES.index(record.status) if record.status in STATUSES else STATUSES.index("error")
+        next_slot = header[3]
+        _RECORD.pack_into(buf, _HEADER.size + next_slot * _RECORD.size,
+                          record.time, record.duration_s, record.items, record.failed,
+                          record.bytes, min(record.calibredb_calls, 0xFFFF), status)
+        header[3] = (next_slot + 1) % self.capacity
+        header[4] = min(header[4] + 1, self.capacity)
+        header[5 + status] += 1
+        header[8] += record.items
+        header[9] += record.failed
+        header[10] += record.bytes
+        _HEADER.pack_into(buf, 0, *header)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_bytes(buf)
+        os.replace(tmp, self.path)
@@ -0,0 +1,284 @@
+"""
+fake_docker.py — a Docker Engine API stand-in on a unix socket
+
+Just enough of the daemon for calibre-import.py and docker_api.py:
+
+  GET  /containers/{name}/json          State.Running for the one container
+  PUT  /containers/{name}/archive       extracts the (chunked) tar into `root`
+  POST /containers/{name}/exec          exec create
+  POST /exec/{id}/start                 raw multiplexed stream, then closes the
+                                        connection like a hijacked exec does
+  GET  /exec/{id}/json                  exit code
+
+The "container" filesystem is a host directory (`root`), and exec runs a few
+commands against it in Python: `calibredb add|list` over an in-memory library,
+`sha256sum`, `rm -rf` and `echo`. A book file whose content starts with
+CORRUPT makes `calibredb add` fail naming its path; an empty one is skipped
+without a word. A book whose file hash is
+already in the library is merged with --automerge (reported as "Merged book
+ids"), otherwise listed under "not added as they already exist".
+
+Usage:
+  with FakeDocker(tmp_path / "container") as docker:
+      api = DockerAPI(docker.host)
+"""
+
+import hashlib
+import http.server
+import json
+import os
+import shutil
+import socketserver
+import struct
+import tarfile
+import tempfile
+import threading
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+BOOK_SUFFIXES = {".epub", ".mobi", ".azw3", ".pdf"}
+
+
+class FakeDocker:
+    def __init__(self, root: Path, container: str = "calibre"):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.container = container
+        self.library: list[dict] = []       # {"id", "title", "authors", "formats", "last_modified"}
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        self.archive_bytes = 0
+        self.chunked_uploads = 0
+        self._execs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._dir = tempfile.mkdtemp(prefix="fake-docker-")
+        self.socket_path = os.path.join(self._dir, "docker.sock")
+        self.host = f"unix://{self.socket_path}"
+
+    # ── lifecycle ────────────────────────────────────────────────────────────
+
+    def __enter__(self) -> "FakeDocker":
+        fake = self
+
+        class Handler(_Handler):
+            server_fake = fake
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def ops(self, prefix: str = "") -> list[tuple[str, str]]:
+        return [r for r in self.requests if r[1].startswith(prefix)]
+
+    def host_path(self, path: str) -> Path:
+        return self.root / path.lstrip("/")
+
+    # ── commands run by exec ─────────────────────────────────────────────────
+
+    def run(self, cmd: list[str]) -> tuple[int, str, str]:
+        if cmd[:2] == ["calibredb", "add"]:
+            return self._calibredb_add(cmd[2:])
+        if cmd[:2] == ["calibredb", "list"]:
+            public = [{k: v for k, v in b.items() if not k.startswith("_")} for b in self.library]
+            return 0, json.dumps(public), ""
+        if cmd[0] == "sha256sum":
+            out, code = [], 0
+            for path in cmd[2:]:
+                try:
+                    out.append(f"{_sha256(self.host_path(path))}  {path}")
+                except FileNotFoundError:
+                    code = 1
+            return code, "".join(line + "\n" for line in out), ""
+        if cmd[:2] == ["rm", "-rf"]:
+            for path in cmd[2:]:
+                shutil.rmtree(self.host_path(path), ignore_errors=True)
+            return 0, "", ""
+        if cmd[0] == "echo":
+            return 0, " ".join(cmd[1:]) + "\n", ""
+        return 127, "", f"{cmd[0]}: not found\n"
+
+    def _calibredb_add(self, args: list[str]) -> tuple[int, str, str]:
+        paths, library_path, automerge, i = [], "/config/Calibre Library", False, 0
+        while i < len(args):
+            if args[i] in ("--with-library", "--automerge"):
+                if args[i] == "--with-library":
+                    library_path = args[i + 1]
+                else:
+                    automerge = args[i + 1] != "disabled"
+                i += 2
+                continue
+            if not args[i].startswith("--"):
+                paths.append(args[i])
+            i += 1
+
+        # Files grouped into books by directory and stem, as calibredb --recurse does
+        books: dict[tuple[str, str], list[str]] = {}
+        for path in paths:
+            host = self.host_path(path)
+            files = [host] if host.is_file() else sorted(p for p in host.rglob("*") if p.is_file())
+            for f in files:
+                if f.suffix.lower() not in BOOK_SUFFIXES:
+                    continue
+                data = f.read_bytes()
+                if not data:
+                    continue
+                if data.startswith(b"CORRUPT"):
+                    container_path = "/" + str(f.relative_to(self.root))
+                    return 1, "", (f"Traceback (most recent call last):\n"
+                                   f"calibre.ebooks.DRMError: Failed to read {container_path}: "
+                                   f"corrupt or invalid file\n")
+                books.setdefault((str(f.parent), f.stem), []).append(str(f))
+
+        known = {h: book["id"] for book in self.library for h in book["_hashes"]}
+        added, merged, duplicates = [], [], []
+        for (_, stem), files in books.items():
+            hashes = [_sha256(Path(f)) for f in files]
+            existing = next((known[h] for h in hashes if h in known), None)
+            if existing is not None:
+                if automerge:
+                    merged.append(existing)
+                else:
+                    duplicates.append((stem, files))
+                continue
+            book_id = len(self.library) + 1
+            folder = f"{library_path}/{stem} ({book_id})"
+            self.host_path(folder).mkdir(parents=True, exist_ok=True)
+            formats = []
+            for f in files:
+                dest = f"{folder}/{Path(f).name}"
+                shutil.copyfile(f, self.host_path(dest))
+                formats.append(dest)
+            self.library.append({"id": book_id, "title": stem, "authors": "Unknown",
+                                 "formats": formats, "last_modified": f"2026-01-01T00:00:{book_id:02d}",
+                                 "_hashes": hashes})
+            known.update(dict.fromkeys(hashes, book_id))
+            added.append(book_id)
+
+        out, err = "", ""
+        if duplicates:
+            err = ("The following books were not added as they already exist in the database "
+                   "(see --duplicates option or --automerge option):\n")
+            for stem, files in duplicates:
+                err += f"  {stem}\n" + "".join(
+                    f"    /{Path(f).relative_to(self.root)}\n" for f in files)
+        if added:
+            out += "Added book ids: " + ", ".join(map(str, added)) + "\n"
+        if merged:
+            out += "Merged book ids: " + ", ".join(map(str, merged)) + "\n"
+        return 0, out, err
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_fake: FakeDocker
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server_fake._lock:
+            self.server_fake.connections += 1
+
+    def address_string(self) -> str:
+        return "unix"
+
+    def log_message(self, fmt, *args) -> None:
+        pass
+
+    def _body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            with self.server_fake._lock:
+                self.server_fake.chunked_uploads += 1
+            data = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass        # trailers
+                    return bytes(data)
+                data.extend(self.rfile.read(size))
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _reply(self, status: int, body=None) -> None:
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self, method: str) -> None:
+        fake = self.server_fake
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        body = self._body()
+        with fake._lock:
+            fake.requests.append((method, url.path))
+
+        if parts[0] == "containers" and parts[1] != fake.container:
+            return self._reply(404, {"message": f"No such container: {parts[1]}"})
+        if method == "GET" and parts[0] == "containers" and parts[2:] == ["json"]:
+            return self._reply(200, {"State": {"Running": True}})
+        if method == "PUT" and parts[0] == "containers" and parts[2:] == ["archive"]:
+            dest = fake.host_path(parse_qs(url.query)["path"][0])
+            with tarfile.open(fileobj=_Reader(body), mode="r|") as tar:
+                tar.extractall(dest, filter="data")
+            fake.archive_bytes += len(body)
+            return self._reply(200)
+        if method == "POST" and parts[0] == "containers" and parts[2:] == ["exec"]:
+            exec_id = f"exec{len(fake._execs) + 1}"
+            fake._execs[exec_id] = {"cmd": json.loads(body)["Cmd"], "result": None}
+            return self._reply(201, {"Id": exec_id})
+        if parts[0] == "exec" and parts[1] in fake._execs:
+            record = fake._execs[parts[1]]
+            if method == "POST" and parts[2:] == ["start"]:
+                return self._stream(record)
+            if method == "GET" and parts[2:] == ["json"]:
+                return self._reply(200, {"Running": False, "ExitCode": record["result"]})
+        self._reply(404, {"message": f"page not found: {method} {url.path}"})
+
+    def _stream(self, record: dict) -> None:
+        code, out, err = self.server_fake.run(record["cmd"])
+        record["result"] = code
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.docker.raw-stream")
+        self.end_headers()
+        for stream, text in ((1, out), (2, err)):
+            data = text.encode()
+            if data:
+                self.wfile.write(struct.pack(">BxxxI", stream, len(data)) + data)
+        # The daemon hijacks the connection for the stream and closes it after
+        self.close_connection = True
+
+    def do_GET(self) -> None:
+        self._route("GET")
+
+    def do_PUT(self) -> None:
+        self._route("PUT")
+
+    def do_POST(self) -> None:
+        self._route("POST")
+
+
+class _Reader:
+    """Minimal file object over bytes for tarfile's stream mode."""
+
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+        self._pos = 0
+
+    def read(self, n: int = -1) -> bytes:
+        end = len(self._data) if n < 0 else self._pos + n
+        chunk = bytes(self._data[self._pos:end])
+        self._pos += len(chunk)
+        return chunk
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
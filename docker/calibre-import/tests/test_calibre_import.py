@@ -0,0 +1,171 @@
+import importlib.util
+import io
+import sys
+import tarfile
+from pathlib import Path
+
+import pytest
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from docker_api import DockerAPI, TarStream     # noqa: E402
+from fake_docker import FakeDocker              # noqa: E402
+
+_spec = importlib.util.spec_from_file_location("calibre_import", HERE.parent / "calibre-import.py")
+calibre_import = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(calibre_import)
+
+
+@pytest.fixture
+def docker(tmp_path):
+    with FakeDocker(tmp_path / "container") as fake:
+        yield fake
+
+
+def make_runner(tmp_path, docker, **env):
+    config = calibre_import.Config(env={
+        "DOWNLOAD_DIR": str(tmp_path / "downloads"),
+        "XDG_DATA_HOME": str(tmp_path / "data"),
+        "DOCKER_HOST": docker.host,
+        "WATCH_SETTLE_SECONDS": "0",
+        **env,
+    })
+    return calibre_import.Runner(config, DockerAPI(docker.host))
+
+
+def write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_exec_demuxes_and_reconnects_after_hijack(docker):
+    api = DockerAPI(docker.host)
+    assert api.exec("calibre", ["echo", "one"]) == (0, "one\n", "")
+    # The exec stream closed the connection; the next request reopens it
+    assert api.container_running("calibre")
+    assert not api.container_running("other")
+    code, out, err = api.exec("calibre", ["nosuchcmd"])
+    assert (code, out) == (127, "") and "not found" in err
+    api.close()
+
+
+def test_tar_stream_round_trip(tmp_path):
+    write(tmp_path / "Book" / "book.epub", b"e" * 3000)
+    write(tmp_path / "Book" / "extras" / "cover.jpg", b"j" * 10)
+    write(tmp_path / "loose.pdf", b"p" * 513)
+    seen = []
+    stream = TarStream("staging", [str(tmp_path / "Book"), str(tmp_path / "loose.pdf")],
+                       on_item=seen.append)
+    data = b"".join(stream)
+
+    assert len(data) % tarfile.BLOCKSIZE == 0
+    with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+        files = {m.name: tar.extractfile(m).read() for m in tar if m.isfile()}
+    assert files == {"staging/Book/book.epub": b"e" * 3000,
+                     "staging/Book/extras/cover.jpg": b"j" * 10,
+                     "staging/loose.pdf": b"p" * 513}
+    assert stream.bytes_sent == 3000 + 10 + 513
+    assert [Path(p).name for p in seen] == ["Book", "loose.pdf"]
+
+
+def test_import_run_against_fake_docker(tmp_path, docker):
+    downloads = tmp_path / "downloads"
+    write(downloads / "Alpha" / "alpha.epub", b"alpha book")
+    write(downloads / "Alpha" / "alpha.mobi", b"alpha mobi")
+    write(downloads / "beta.epub", b"beta book")
+    write(downloads / "Notes" / "readme.txt", b"no book in here")
+    write(downloads / "Broken" / "broken.epub", b"CORRUPT zip")
+    runner = make_runner(tmp_path, docker)
+
+    assert runner.run() == 0
+    imported = set(runner.state.known())
+    assert imported == {"Alpha", "beta.epub"}
+    assert set(runner.state.failures()) == {"Notes", "Broken"}
+    assert [b["title"] for b in docker.library] == ["alpha", "beta"]
+    assert not docker.host_path(calibre_import.CONTAINER_STAGING).exists()
+
+    # One streamed upload; exec streams close their connection, everything
+    # else reuses the kept-alive one
+    assert len(docker.ops("/containers/calibre/archive")) == 1
+    assert docker.chunked_uploads == 1
+    starts = len([r for r in docker.requests if r[1].endswith("/start")])
+    assert docker.connections <= starts + 1
+    assert runner.stats.imported == 2 and runner.stats.failed == 2
+
+    # Second sweep: imported items are skipped without touching the container's files
+    docker.requests.clear()
+    runner.run()
+    assert set(runner.state.known()) == imported
+    assert runner.state.failures()["Broken"][2] == 2
+    runner.state.close()
+    runner.docker.close()
+
+
+def test_extra_books_from_one_folder_do_not_cover_for_another(tmp_path, docker):
+    downloads = tmp_path / "downloads"
+    write(downloads / "Omnibus" / "one.epub", b"first book")
+    write(downloads / "Omnibus" / "one.mobi", b"first book, kindle")
+    write(downloads / "Omnibus" / "two.epub", b"second book")
+    write(downloads / "Stub" / "stub.epub", b"")       # calibredb makes nothing of it
+    runner = make_runner(tmp_path, docker)
+
+    runner.run()
+    # Two ids for two folders, but both came from Omnibus
+    assert set(runner.state.known()) == {"Omnibus"}
+    assert set(runner.state.failures()) == {"Stub"}
+    assert sorted(b["title"] for b in docker.library) == ["one", "two"]
+    runner.state.close()
+    runner.docker.close()
+
+
+def test_unreadable_item_is_hashed_again_next_run(monkeypatch, tmp_path, docker):
+    downloads = tmp_path / "downloads"
+    write(downloads / "Flaky" / "flaky.epub", b"flaky book")
+    write(downloads / "steady.epub", b"steady book")
+    hash_file = calibre_import.Item._hash_file
+
+    def failing(self, h, path):
+        if "flaky" in path:
+            raise OSError(5, "Input/output error", path)
+        hash_file(self, h, path)
+    monkeypatch.setattr(calibre_import.Item, "_hash_file", failing)
+    runner = make_runner(tmp_path, docker)
+
+    assert runner.run() == 0
+    assert set(runner.state.known()) == {"steady.epub"}
+    assert not runner.state.failures()
+
+    monkeypatch.setattr(calibre_import.Item, "_hash_file", hash_file)
+    runner.run()
+    assert set(runner.state.known()) == {"steady.epub", "Flaky"}
+    runner.state.close()
+    runner.docker.close()
+
+
+def test_skipped_duplicates_are_not_recorded_as_imported(tmp_path, docker):
+    """Without --automerge calibredb exits 0 but lists the books it skipped."""
+    downloads = tmp_path / "downloads"
+    write(downloads / "Gamma" / "gamma.epub", b"gamma book")
+    write(downloads / "Delta" / "delta.epub", b"delta book")
+    items = calibre_import.scan(str(downloads))
+    runner = make_runner(tmp_path, docker)
+    runner.docker.put_archive("calibre", "/tmp", TarStream("calibre-import-staging",
+                                                             [i.path for i in items]))
+    # Gamma is already in the library
+    write(docker.root / "incoming" / "gamma.epub", b"gamma book")
+    docker.run(["calibredb", "add", "/incoming"])
+
+    def add(chunk):
+        code, out, err = docker.run(["calibredb", "add", *(i.staged for i in chunk)])
+        return code == 0, out + err
+
+    results = {}
+    calibre_import.import_chunk(
+        items, add,
+        lambda c, _out: results.update({i.name: "ok" for i in c}),
+        lambda i, e: results.update({i.name: e}),
+        lambda d: results.update({i.name: "duplicate" for i in d}))
+    assert results == {"Gamma": "duplicate", "Delta": "ok"}
+    runner.state.close()
+    runner.docker.close()
@@ -0,0 +1,41 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from run_history import RunHistory, RunRecord     # noqa: E402
+
+_spec = importlib.util.spec_from_file_location("calibre_status_server",
+                                               HERE.parent / "calibre-status-server.py")
+server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(server)
+
+
+def test_history_is_served(tmp_path):
+    history = RunHistory(tmp_path / "history.bin", capacity=4)
+    for n in range(6):
+        history.append(RunRecord(time=1_700_000_000 + n, duration_s=1.5, status="ok", items=n))
+    cache = server.StatusCache(tmp_path / "status.json", history.path)
+    body, _, _ = cache.get("/history.json", {"limit": ["2"]})
+    assert body.count(b'"items"') == 2 and b'"items":5' in body
+    assert b'calibre_import_runs_total{status="ok"} 6' in cache.get("/metrics", {})[0]
+
+
+@pytest.mark.parametrize("data", [b"", b"CIRH\x01", b"not a history file at all" * 4, "truncated"])
+def test_bad_history_file_serves_empty_history(tmp_path, data):
+    path = tmp_path / "history.bin"
+    if data == "truncated":
+        RunHistory(path).append(RunRecord(time=1_700_000_000, duration_s=1, status="ok"))
+        data = path.read_bytes()[:100]
+    path.write_bytes(data)
+    cache = server.StatusCache(tmp_path / "status.json", path)
+    assert cache.get("/history.json", {})[0] == b"[]\n"
+    assert b'calibre_import_runs_total{status="ok"} 0' in cache.get("/metrics", {})[0]
+
+    # The next run starts a fresh history
+    RunHistory(path).append(RunRecord(time=1_700_000_100, duration_s=1, status="ok"))
+    assert len(RunHistory(path).load()[0]) == 1
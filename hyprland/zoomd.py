@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+zoomd.py — Resident zoom daemon for Hyprland's cursor:zoom_factor.
+
+Receives step requests ("+1", "-1", "=3") on a Unix datagram socket and
+animates the zoom factor towards the requested target at a fixed frame rate
+with ease-out easing. Requests that arrive while an animation is running are
+merged into the target, so holding Super+Scroll (or sending "+4") produces one
+smooth motion instead of a burst of hyprctl process launches.
+
+The current factor is queried from Hyprland once at startup and then kept in
+memory. Every frame is written straight to Hyprland's IPC socket — no hyprctl
+process per frame.
+
+Usage:
+  zoomd.py [--fps N] [--duration SECONDS]   # run the daemon
+  zoomd.py step +1                          # send a request to the daemon
+
+Options:
+  --fps        Animation frame rate (default: 60)
+  --duration   Time for one animation segment in seconds (default: 0.18)
+
+Hyprland binds (the existing zoomup.py / zoomdown.py forward to the daemon
+and fall back to a direct hyprctl call if it is not running):
+  exec-once = ~/Scripts/hyprland/zoomd.py
+  bind = $mainMod, mouse_up,   exec, ~/Scripts/hyprland/zoomup.py
+  bind = $mainMod, mouse_down, exec, ~/Scripts/hyprland/zoomdown.py
+"""
+
+import argparse
+import json
+import os
+import select
+import socket
+import sys
+import time
+from pathlib import Path
+
+ZOOM_MIN = 1.0
+DAEMON_SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR", "/tmp")) / "zoomd.sock"
+
+
+def hypr_socket() -> Path:
+    """Return the path of Hyprland's request socket for this session."""
+    sig = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE", "")
+    runtime = Path(os.environ.get("XDG_RUNTIME_DIR", "/tmp")) / "hypr" / sig / ".socket.sock"
+    if runtime.exists():
+        return runtime
+    # Hyprland < 0.40 kept its sockets under /tmp
+    return Path("/tmp/hypr") / sig / ".socket.sock"
+
+
+def hypr_request(command: str) -> str:
+    """Send one request over Hyprland IPC and return the reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(hypr_socket()))
+        s.sendall(command.encode())
+        chunks = []
+        while chunk := s.recv(4096):
+            chunks.append(chunk)
+    return b"".join(chunks).decode()
+
+
+def get_zoom() -> float:
+    reply = json.loads(hypr_request("j/getoption cursor:zoom_factor"))
+    return float(reply["float"])
+
+
+def set_zoom(factor: float) -> None:
+    hypr_request(f"keyword cursor:zoom_factor {factor:.4f}")
+
+
+def ease_out_cubic(t: float) -> float:
+    return 1 - (1 - t) ** 3
+
+
+def apply_request(target: float, request: str) -> float:
+    """Merge a step request into the current target.
+
+    "+N" / "-N" move the target relative to where the animation is heading,
+    "=N" sets it absolutely. The result is clamped at ZOOM_MIN.
+    """
+    request = request.strip()
+    if request.startswith("="):
+        target = float(request[1:])
+    else:
+        target += float(request)
+    return max(ZOOM_MIN, target)
+
+
+class Animator:
+    """Tracks the displayed zoom factor and eases it towards a target."""
+
+    def __init__(self, current: float, duration: float):
+        self.current = current
+        self.target = current
+        self.duration = duration
+        self._start_value = current
+        self._start_time = 0.0
+
+    @property
+    def animating(self) -> bool:
+        return self.current != self.target
+
+    def retarget(self, target: float, now: float) -> None:
+        # Restart the easing segment from wherever the zoom is right now so a
+        # merged request continues the motion instead of jumping.
+        self.target = target
+        self._start_value = self.current
+        self._start_time = now
+
+    def frame(self, now: float) -> float:
+        t = min(1.0, (now - self._start_time) / self.duration)
+        if t >= 1.0:
+            self.current = self.target
+        else:
+            span = self.target - self._start_value
+            self.current = self._start_value + span * ease_out_cubic(t)
+        return self.current
+
+
+def serve(fps: int, duration: float) -> None:
+    DAEMON_SOCKET.unlink(missing_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(str(DAEMON_SOCKET))
+    sock.setblocking(False)
+
+    try:
+        current = get_zoom()
+    except (OSError, ValueError, KeyError):
+        current = ZOOM_MIN
+    anim = Animator(current, duration)
+    frame_interval = 1.0 / fps
+
+    try:
+        while True:
+            timeout = frame_interval if anim.animating else None
+            readable, _, _ = select.select([sock], [], [], timeout)
+            now = time.monotonic()
+
+            if readable:
+                target = anim.target
+                # Drain everything queued (key repeat) into a single target
+                while True:
+                    try:
+                        data = sock.recv(64)
+                    except BlockingIOError:
+                        break
+                    try:
+                        target = apply_request(target, data.decode())
+                    except ValueError:
+                        continue
+                if target != anim.target:
+                    anim.retarget(target, now)
+
+            if anim.animating:
+                try:
+                    set_zoom(anim.frame(now))
+                except OSError as e:
+                    print(f"zoomd: Hyprland IPC failed: {e}", file=sys.stderr)
+    finally:
+        sock.close()
+        DAEMON_SOCKET.unlink(missing_ok=True)
+
+
+def send_step(request: str) -> bool:
+    """Send a request to a running daemon. Returns False if none is listening."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as s:
+            s.sendto(request.encode(), str(DAEMON_SOCKET))
+        return True
+    except OSError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fps", type=int, default=60, help="Animation frame rate (default: 60)")
+    parser.add_argument("--duration", type=float, default=0.18,
+                        help="Seconds per animation segment (default: 0.18)")
+    sub = parser.add_subparsers(dest="command")
+    step = sub.add_parser("step", help="Send a step request to the running daemon")
+    step.add_argument("request", help='"+N", "-N" or "=N"')
+    args = parser.parse_args()
+
+    if args.command == "step":
+        if not send_step(args.request):
+            print("zoomd is not running", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    try:
+        serve(args.fps, args.duration)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,19 @@
 #!/usr/bin/env python3
 
+import os
+import socket
 import subprocess
 
+# Forward the step to zoomd.py if it is running — it animates the change,
+# merges key repeats and clamps at 1.0 itself.
+DAEMON_SOCKET = os.path.join(os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "zoomd.sock")
+try:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as s:
+        s.sendto(b"-1", DAEMON_SOCKET)
+    raise SystemExit(0)
+except OSError:
+    pass
+
 # Get current zoom factor directly without shell pipes
 result = subprocess.run(["hyprctl", "getoption", "cursor:zoom_factor"], 
                        text=True, capture_output=True)
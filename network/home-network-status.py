@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+home-network-status.py — Home Network Status Check
+
+Simple monitoring script for non-technical users. It checks the local
+services, server and internet connectivity, disk space and container health
+over SSH.
+
+Every probe runs at the same time and has its own timeout, so one hung
+service cannot stall the report. Each probe runs once and its result is
+reused for the summary. The remote commands share a single multiplexed SSH
+connection (an OpenSSH ControlMaster), which is closed when the report is
+done.
+
+With --daemon it becomes a monitor: every --interval seconds it probes the
+services, the main server and the internet, records status and latency in a
+time-series store (latency_store.py) and emails state changes through
+lib/python/email_sender.py. A service is reported down after DOWN_AFTER
+failed checks in a row and back up after UP_AFTER good ones. One that
+changes state FLAP_LIMIT times within FLAP_WINDOW gets a single "flapping"
+email and no more until it has been steady for a whole window. While the
+monitor is running, the report is printed from its latest round instead of
+probing again.
+
+Usage:
+  home-network-status.py [--live] [--db PATH]
+  home-network-status.py --daemon [--interval SECONDS] [--no-email] [--db PATH]
+  home-network-status.py --stats [--window 24h|7d|...] [--db PATH]
+
+Options:
+  --live       Probe now even if the monitor has a recent result
+  --daemon     Run the monitor loop (see systemd/home-network-monitor.service)
+  --interval   Seconds between monitor rounds (default: 60)
+  --no-email   Monitor without sending alert emails (alerts still logged)
+  --stats      Print uptime and p50/p95 latency per service
+  --window     Period for --stats: Nm, Nh or Nd (default: 24h)
+  --db         Store path (default: $XDG_STATE_HOME/home-network/monitor.db)
+
+Requirements:
+  - ping (iputils) and OpenSSH on this machine
+  - key-based SSH login to MAIN_SERVER (password prompts are never shown)
+  - for alerts: ~/.config/scripts/email.conf (see lib/python/email.conf.example)
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess as sp
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from latency_store import LatencyStore
+
+# ── configuration — edit these for your setup ────────────────────────────────
+
+MAIN_SERVER = "zeus"                         # SSH hostname of your server
+DASHBOARD_URL = "http://home.local"
+MEDIA_URL = "http://jellyfin.local"
+CLOUD_URL = "http://nextcloud.local"
+PASSWORD_MANAGER_URL = ""                    # e.g. http://192.168.1.x:PORT
+INTERNET_HOST = "one.one.one.one"
+
+DOCS_EMERGENCY = ""                          # path to emergency guide (optional)
+DOCS_REFERENCE = ""                          # path to quick-reference guide (optional)
+
+HTTP_TIMEOUT = 5                             # seconds per service request
+PING_TIMEOUT = 2                             # seconds to wait for a ping reply
+SSH_TIMEOUT = 5                              # seconds to connect to MAIN_SERVER
+REMOTE_TIMEOUT = 15                          # seconds per remote command
+
+DOWN_AFTER = 3                               # failed checks in a row before "down"
+UP_AFTER = 2                                 # good checks in a row before "back up"
+FLAP_WINDOW = 3600                           # seconds
+FLAP_LIMIT = 4                               # state changes per window that count as flapping
+
+STATE_DIR = Path(os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state") / "home-network"
+DEFAULT_DB = STATE_DIR / "monitor.db"
+EMAIL_LIB = Path(__file__).resolve().parent.parent / "lib" / "python"
+
+# ── output ───────────────────────────────────────────────────────────────────
+
+_COLOUR = sys.stdout.isatty() and "NO_COLOR" not in os.environ
+RED = "\033[0;31m" if _COLOUR else ""
+GREEN = "\033[0;32m" if _COLOUR else ""
+YELLOW = "\033[1;33m" if _COLOUR else ""
+NC = "\033[0m" if _COLOUR else ""
+
+
+def tag(colour: str, label: str) -> str:
+    return f"{colour}[{label}]{NC}"
+
+
+# ── probes ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class Probe:
+    ok: bool
+    latency_ms: float | None = None
+    output: str = ""
+
+
+def probe_http(url: str, timeout: float = HTTP_TIMEOUT) -> Probe:
+    """Up if the server answers at all — like `curl -s`, an HTTP error status still counts."""
+    start = time.monotonic()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            resp.read(1)
+    except urllib.error.HTTPError:
+        pass
+    except (OSError, ValueError):
+        return Probe(False)
+    return Probe(True, (time.monotonic() - start) * 1000)
+
+
+_PING_TIME = re.compile(r"time[=<]([\d.]+) ?ms")
+
+
+def probe_ping(host: str, timeout: float = PING_TIMEOUT) -> Probe:
+    try:
+        result = sp.run(["ping", "-c", "1", "-W", str(int(timeout)), host],
+                        capture_output=True, text=True, timeout=timeout + 3)
+    except (OSError, sp.TimeoutExpired):
+        return Probe(False)
+    if result.returncode != 0:
+        return Probe(False)
+    m = _PING_TIME.search(result.stdout)
+    return Probe(True, float(m.group(1)) if m else None)
+
+
+def probe_host(host: str) -> Probe:
+    """Ping the bare name and the mDNS .local name together; either reply counts."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(probe_ping, [host, f"{host}.local"]))
+    return next((r for r in results if r.ok), results[0])
+
+
+class SSHSession:
+    """One multiplexed SSH connection shared by every remote command.
+
+    The master connection is private to this process (its socket lives in a
+    temporary directory) and is closed on exit.
+    """
+
+    def __init__(self, host: str, connect_timeout: float = SSH_TIMEOUT):
+        self.host = host
+        self.connect_timeout = connect_timeout
+        self._dir = tempfile.TemporaryDirectory(prefix="netstatus-ssh-")
+        self.control_path = os.path.join(self._dir.name, "master")
+        self.connected: Probe | None = None
+
+    def _base(self) -> list[str]:
+        return ["ssh", "-o", "BatchMode=yes", "-o", f"ConnectTimeout={int(self.connect_timeout)}",
+                "-o", f"ControlPath={self.control_path}"]
+
+    def alive(self) -> bool:
+        if not (self.connected and self.connected.ok):
+            return False
+        try:
+            result = sp.run(self._base() + ["-O", "check", self.host],
+                            stdin=sp.DEVNULL, capture_output=True, timeout=5)
+        except (OSError, sp.TimeoutExpired):
+            return False
+        return result.returncode == 0
+
+    def ensure(self) -> Probe:
+        """Reuse the master connection if it is still up, otherwise (re)open it."""
+        return self.connected if self.alive() else self.open()
+
+    def open(self) -> Probe:
+        """Start the master connection; returns once it is authenticated."""
+        start = time.monotonic()
+        try:
+            result = sp.run(self._base() + ["-o", "ControlMaster=yes", "-o", "ControlPersist=yes",
+                                            "-f", "-N", self.host],
+                            stdin=sp.DEVNULL, capture_output=True, text=True,
+                            timeout=self.connect_timeout + 5)
+            ok = result.returncode == 0
+        except (OSError, sp.TimeoutExpired):
+            ok = False
+        self.connected = Probe(ok, (time.monotonic() - start) * 1000 if ok else None)
+        return self.connected
+
+    def run(self, command: str, timeout: float = REMOTE_TIMEOUT) -> Probe:
+        if not (self.connected and self.connected.ok):
+            return Probe(False)
+        start = time.monotonic()
+        try:
+            result = sp.run(self._base() + ["-o", "ControlMaster=no", self.host, command],
+                            stdin=sp.DEVNULL, capture_output=True, text=True, timeout=timeout)
+        except (OSError, sp.TimeoutExpired):
+            return Probe(False)
+        return Probe(result.returncode == 0, (time.monotonic() - start) * 1000, result.stdout)
+
+    def close(self) -> None:
+        if self.connected and self.connected.ok:
+            try:
+                sp.run(self._base() + ["-O", "exit", self.host],
+                       stdin=sp.DEVNULL, capture_output=True, timeout=5)
+            except (OSError, sp.TimeoutExpired):
+                pass        # unresponsive master; nothing more we can ask of it
+        self._dir.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+DISK_COMMAND = "df -h | grep library"
+CONTAINERS_COMMAND = r"docker ps --format 'table {{.Names}}\t{{.Status}}' 2>/dev/null | tail -n +2"
+
+
+@dataclass
+class Results:
+    services: list[tuple[str, str, Probe]]   # (key, display name, probe)
+    server: Probe
+    internet: Probe
+    disk: Probe
+    containers: Probe
+    time: float = field(default_factory=time.time)
+
+    def samples(self) -> list[tuple[str, bool, float | None]]:
+        """(service key, up, latency) for the time-series store."""
+        rows = [(key, p.ok, p.latency_ms) for key, _, p in self.services]
+        return rows + [("server", self.server.ok, self.server.latency_ms),
+                       ("internet", self.internet.ok, self.internet.latency_ms)]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text: str) -> "Results":
+        d = json.loads(text)
+        return cls(services=[(key, name, Probe(**p)) for key, name, p in d["services"]],
+                   server=Probe(**d["server"]), internet=Probe(**d["internet"]),
+                   disk=Probe(**d["disk"]), containers=Probe(**d["containers"]), time=d["time"])
+
+
+def services() -> list[tuple[str, str, str]]:
+    entries = [("dashboard", "Dashboard", DASHBOARD_URL), ("media", "Jellyfin (media)", MEDIA_URL),
+               ("cloud", "Nextcloud (files)", CLOUD_URL)]
+    if PASSWORD_MANAGER_URL:
+        entries.append(("passwords", "Password Manager", PASSWORD_MANAGER_URL))
+    return entries
+
+
+def display_names() -> dict[str, str]:
+    names = {key: name for key, name, _ in services()}
+    names.update(server=f"Main server ({MAIN_SERVER})", internet="Internet")
+    return names
+
+
+def collect(ssh: SSHSession | None = None) -> Results:
+    """Run every probe concurrently; each one is measured exactly once.
+
+    Without `ssh` a session is opened for this round and closed after it; the
+    monitor passes its own so the master connection persists between rounds.
+    """
+    own = ssh is None
+    ssh = ssh or SSHSession(MAIN_SERVER)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            started = time.time()
+            http = [(key, name, pool.submit(probe_http, url)) for key, name, url in services()]
+            server = pool.submit(probe_host, MAIN_SERVER)
+            internet = pool.submit(probe_ping, INTERNET_HOST)
+
+            # The remote commands wait for the shared connection, then run side by side
+            connected = pool.submit(ssh.ensure)
+
+            def remote(command: str) -> Probe:
+                connected.result()
+                return ssh.run(command)
+
+            disk = pool.submit(remote, DISK_COMMAND)
+            containers = pool.submit(remote, CONTAINERS_COMMAND)
+            return Results(services=[(key, name, f.result()) for key, name, f in http],
+                           server=server.result(), internet=internet.result(),
+                           disk=disk.result(), containers=containers.result(), time=started)
+    finally:
+        if own:
+            ssh.close()
+
+
+# ── report ───────────────────────────────────────────────────────────────────
+
+def disk_lines(output: str) -> list[str]:
+    lines = []
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) < 6 or not fields[4].rstrip("%").isdigit():
+            continue
+        usage, mount = int(fields[4].rstrip("%")), fields[5]
+        if usage > 90:
+            lines.append(f"  {tag(RED, 'CRIT')} {mount} at {usage}% — contact admin")
+        elif usage > 80:
+            lines.append(f"  {tag(YELLOW, 'WARN')} {mount} at {usage}% — getting full")
+        else:
+            lines.append(f"  {tag(GREEN, 'OK')}   {mount} at {usage}%")
+    return lines
+
+
+def container_lines(output: str) -> list[str]:
+    lines, healthy, unhealthy = [], 0, 0
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        if "Up" in line:
+            healthy += 1
+        else:
+            unhealthy += 1
+            lines.append(f"  {tag(YELLOW, 'WARN')} {line.split()[0]} may have issues")
+    if unhealthy == 0:
+        lines.append(f"  {tag(GREEN, 'OK')}   All {healthy} containers running")
+    else:
+        lines.append(f"  {tag(YELLOW, 'WARN')} {healthy} OK, {unhealthy} need attention")
+    return lines
+
+
+def render(r: Results, age: float | None = None) -> str:
+    out = ["Home Network Status Check", "===================================="]
+    if age is not None:
+        out.append(f"Checked by the background monitor {describe_age(age)} ago.")
+    out.append("")
+
+    out.append("Network Services:")
+    for _, name, probe in r.services:
+        out.append(f"  {tag(GREEN, 'OK')}   {name}" if probe.ok else f"  {tag(RED, 'DOWN')} {name}")
+    out.append("")
+
+    out.append(f"Main Server ({MAIN_SERVER}):")
+    out.append(f"  {tag(GREEN, 'OK')}   {MAIN_SERVER} responding" if r.server.ok
+               else f"  {tag(RED, 'DOWN')} {MAIN_SERVER} unreachable")
+    out.append("")
+
+    out.append("Internet:")
+    out.append(f"  {tag(GREEN, 'OK')}   Internet connection OK" if r.internet.ok
+               else f"  {tag(RED, 'DOWN')} Internet connection DOWN")
+    out.append("")
+
+    skip = f"  {tag(RED, 'SKIP')} Cannot check — {MAIN_SERVER} unreachable"
+    out.append(f"Storage (via SSH to {MAIN_SERVER}):")
+    out.extend(disk_lines(r.disk.output) if r.disk.ok else [skip])
+    out.append("")
+
+    out.append(f"Containers (via SSH to {MAIN_SERVER}):")
+    out.extend(container_lines(r.containers.output) if r.containers.ok else [skip])
+    out.append("")
+
+    # Same services as the original summary: the three web services and the server
+    counted = [probe for key, _, probe in r.services if key != "passwords"] + [r.server]
+    failed = sum(not p.ok for p in counted)
+    out.append("Summary:")
+    if failed == 0:
+        out.append(f"{GREEN}  All services OK. No action needed.{NC}")
+    elif failed == 1:
+        out.append(f"{YELLOW}  One service may need attention. Try restarting it.{NC}")
+    else:
+        out.append(f"{RED}  Multiple services down. Admin attention required.{NC}")
+    out.append("")
+
+    out.append("Next steps:")
+    if failed:
+        if DOCS_EMERGENCY:
+            out.append(f"  - Emergency guide: {DOCS_EMERGENCY}")
+        out.append(f"  - Try: ssh {MAIN_SERVER} && docker compose -f services.yml restart")
+    else:
+        out.append("  - No immediate action needed")
+        out.append("  - Run this check weekly for maintenance")
+
+    if DOCS_REFERENCE:
+        out += ["", f"More help: {DOCS_REFERENCE}"]
+    return "\n".join(out)
+
+
+def describe_age(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    if seconds < 120:
+        return f"{seconds} seconds"
+    return f"{seconds // 60} minutes"
+
+
+# ── alerts ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class AlertState:
+    confirmed: bool = True                    # state the monitor has settled on
+    streak: int = 0                           # checks in a row disagreeing with it
+    notified: bool = True                     # state the last email reported
+    flips: list[float] = field(default_factory=list)
+    flapping: bool = False
+
+    def update(self, ok: bool, now: float) -> str | None:
+        """Feed one check; returns "down", "up", "flapping" or "steady" when an email is due."""
+        if ok == self.confirmed:
+            self.streak = 0
+        else:
+            self.streak += 1
+            if self.streak >= (UP_AFTER if ok else DOWN_AFTER):
+                self.confirmed, self.streak = ok, 0
+                self.flips.append(now)
+        self.flips = [t for t in self.flips if t > now - FLAP_WINDOW]
+
+        if not self.flapping and len(self.flips) >= FLAP_LIMIT:
+            self.flapping = True
+            return "flapping"
+        if self.flapping:
+            if self.flips:
+                return None
+            # A whole window without a state change: report where it settled
+            self.flapping = False
+            self.notified = self.confirmed
+            return "steady"
+        if self.confirmed != self.notified:
+            self.notified = self.confirmed
+            return "up" if self.confirmed else "down"
+        return None
+
+
+class Alerter:
+    SUBJECTS = {
+        "down": "{name} is DOWN",
+        "up": "{name} is back up",
+        "flapping": "{name} keeps going up and down",
+        "steady": "{name} has settled ({state})",
+    }
+
+    def __init__(self, store: LatencyStore, email: bool = True):
+        self.store = store
+        self.names = display_names()
+        self.states: dict[str, AlertState] = {}
+        self.send = self._load_sender() if email else None
+
+    @staticmethod
+    def _load_sender():
+        sys.path.insert(0, str(EMAIL_LIB))
+        try:
+            from email_sender import send_email
+        except (ImportError, FileNotFoundError) as e:
+            log(f"Email alerts disabled: {e}")
+            return None
+        return send_email
+
+    def _state(self, service: str) -> AlertState:
+        if service not in self.states:
+            saved = self.store.alert_state(service)
+            self.states[service] = AlertState(**saved) if saved else AlertState()
+        return self.states[service]
+
+    def check(self, results: Results) -> None:
+        for service, ok, _ in results.samples():
+            state = self._state(service)
+            event = state.update(ok, results.time)
+            self.store.save_alert_state(service, asdict(state))
+            if event:
+                self.alert(service, event, state, results.time)
+
+    def alert(self, service: str, event: str, state: AlertState, now: float) -> None:
+        name = self.names.get(service, service)
+        subject = "[Home network] " + self.SUBJECTS[event].format(
+            name=name, state="up" if state.confirmed else "down")
+        day = self.store.stats(service, 86400, now)
+        lines = [f"{name}: {event} at {datetime.fromtimestamp(now):%Y-%m-%d %H:%M:%S}."]
+        if event == "flapping":
+            lines.append(f"It changed state {len(state.flips)} times in the last "
+                         f"{FLAP_WINDOW // 60} minutes. No more emails about it until it "
+                         f"has been steady for that long.")
+        if day.uptime is not None:
+            lines.append(f"Last 24 hours: up {day.uptime:.1f}% of {day.samples} checks" +
+                         (f", p50 {day.p50:.0f} ms, p95 {day.p95:.0f} ms." if day.p95 is not None else "."))
+        body = "\n".join(lines)
+        log(f"Alert: {subject}")
+        if self.send:
+            # SMTP can be slow; don't hold up the next probe round
+            threading.Thread(target=self.send, args=(subject, body), daemon=True).start()
+
+
+# ── monitor ──────────────────────────────────────────────────────────────────
+
+def log(msg: str) -> None:
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {msg}", flush=True)
+
+
+def run_daemon(store: LatencyStore, interval: float, email: bool) -> None:
+    alerter = Alerter(store, email=email)
+    store.set_meta("interval", str(interval))
+    log(f"Monitoring every {interval:g}s, store {store.path}")
+    with SSHSession(MAIN_SERVER) as ssh:
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    results = collect(ssh)
+                    store.add(results.time, results.samples())
+                    store.set_meta("snapshot", results.to_json())
+                    alerter.check(results)
+                except Exception as e:
+                    # A locked database or an SMTP failure costs one round,
+                    # not the monitor
+                    log(f"Round failed: {type(e).__name__}: {e}")
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            pass
+
+
+def snapshot(store: LatencyStore) -> tuple[Results, float] | None:
+    """The monitor's latest round and its age, if the monitor is keeping up."""
+    text, interval = store.get_meta("snapshot"), store.get_meta("interval")
+    if not text or not interval:
+        return None
+    results = Results.from_json(text)
+    age = time.time() - results.time
+    return (results, age) if age <= 2 * float(interval) + 30 else None
+
+
+def parse_window(text: str) -> float:
+    units = {"m": 60, "h": 3600, "d": 86400}
+    if len(text) < 2 or text[-1] not in units or not text[:-1].isdigit():
+        raise ValueError(f"--window: expected Nm, Nh or Nd, got {text!r}")
+    return int(text[:-1]) * units[text[-1]]
+
+
+def render_stats(store: LatencyStore, window: float, label: str) -> str:
+    names = display_names()
+    keys = [k for k in names if k in store.services()] + \
+           [k for k in store.services() if k not in names]
+    if not keys:
+        return "No measurements yet. Start the monitor with --daemon."
+    out = [f"Service health, last {label}:"]
+    width = max(len(names.get(k, k)) for k in keys)
+    for key in keys:
+        st = store.stats(key, window)
+        if not st.samples:
+            continue
+        line = f"  {names.get(key, key):<{width}}  up {st.uptime:5.1f}%"
+        if st.p50 is not None:
+            line += f"   p50 {st.p50:6.0f} ms   p95 {st.p95:6.0f} ms"
+        out.append(f"{line}   ({st.samples} checks)")
+    return "\n".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--live", action="store_true", help="Probe now instead of reading the monitor")
+    mode.add_argument("--daemon", action="store_true", help="Run the monitor loop")
+    mode.add_argument("--stats", action="store_true", help="Print uptime and latency percentiles")
+    parser.add_argument("--interval", type=float, default=60, help="Seconds between rounds (default: 60)")
+    parser.add_argument("--no-email", action="store_true", help="Don't send alert emails")
+    parser.add_argument("--window", default="24h", help="Period for --stats: Nm, Nh or Nd (default: 24h)")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help=f"Store path (default: {DEFAULT_DB})")
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon(LatencyStore(args.db), args.interval, email=not args.no_email)
+        return
+    if args.stats:
+        try:
+            window = parse_window(args.window)
+        except ValueError as e:
+            parser.error(str(e))
+        print(render_stats(LatencyStore(args.db), window, args.window))
+        return
+
+    latest = None
+    if not args.live and args.db.exists():
+        latest = snapshot(LatencyStore(args.db))
+    if latest:
+        print(render(*latest))
+    else:
+        print(render(collect()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+latency_store.py — Compact latency/availability time series for the network monitor
+
+One SQLite database (WAL) holds three tiers per service:
+
+  samples   every probe (time, up/down, latency) for the last RAW_RETENTION
+  rollups   hourly buckets for HOURLY_RETENTION and daily buckets for
+            DAILY_RETENTION: sample count, up count and a latency histogram
+
+Rollups are updated as each sample is written, so downsampling is just
+dropping raw rows and old buckets. The histogram has 64 log-scale bins (four
+per doubling, 1 ms to ~46 s) packed as uint32s, 256 bytes per bucket. Buckets
+merge by addition, so p50/p95 over any window are read from them to within
+about ±9%. Windows that fit in the raw tier use the exact samples instead.
+
+The same database keeps the monitor's alert state per service and the last
+full report snapshot (meta table), so the report can be printed without
+probing anything.
+"""
+
+import json
+import math
+import sqlite3
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+HOUR = 3600
+DAY = 86400
+RAW_RETENTION = 2 * DAY
+HOURLY_RETENTION = 35 * DAY
+DAILY_RETENTION = 400 * DAY
+PRUNE_EVERY = HOUR
+
+BINS = 64
+_HIST = struct.Struct(f"<{BINS}I")
+
+
+def latency_bin(ms: float) -> int:
+    # bin 0: under 1 ms; bin i: [2^((i-1)/4), 2^(i/4)) ms
+    if ms < 1:
+        return 0
+    return min(BINS - 1, int(math.log2(ms) * 4) + 1)
+
+
+def bin_value(i: int) -> float:
+    """Representative latency of a bin (its geometric midpoint)."""
+    return 0.5 if i == 0 else 2 ** ((i - 0.5) / 4)
+
+
+def hist_percentile(hist: list[int], q: float) -> float | None:
+    total = sum(hist)
+    if not total:
+        return None
+    rank, seen = max(1, math.ceil(q * total)), 0
+    for i, n in enumerate(hist):
+        seen += n
+        if seen >= rank:
+            return bin_value(i)
+    return bin_value(BINS - 1)
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile of unsorted values."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(1, math.ceil(q * len(values))) - 1]
+
+
+@dataclass
+class Stats:
+    samples: int
+    uptime: float | None          # percent of samples that were up
+    p50: float | None             # ms, over up samples with a latency
+    p95: float | None
+
+
+class LatencyStore:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS samples (
+            service    TEXT NOT NULL,
+            ts         REAL NOT NULL,
+            ok         INTEGER NOT NULL,
+            latency_ms REAL
+        );
+        CREATE INDEX IF NOT EXISTS samples_service_ts ON samples (service, ts);
+        CREATE TABLE IF NOT EXISTS rollups (
+            service    TEXT NOT NULL,
+            resolution INTEGER NOT NULL,
+            start      INTEGER NOT NULL,
+            count      INTEGER NOT NULL,
+            up         INTEGER NOT NULL,
+            hist       BLOB NOT NULL,
+            PRIMARY KEY (service, resolution, start)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS alerts (
+            service TEXT PRIMARY KEY,
+            state   TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.SCHEMA)
+        self._last_prune = 0.0
+
+    def close(self) -> None:
+        self.db.close()
+
+    # ── writing ──────────────────────────────────────────────────────────────
+
+    def add(self, ts: float, samples: list[tuple[str, bool, float | None]]) -> None:
+        """Record one probe round: (service, up, latency in ms or None) each."""
+        with self.db:
+            self.db.executemany("INSERT INTO samples VALUES (?, ?, ?, ?)",
+                                ((service, ts, int(ok), latency) for service, ok, latency in samples))
+            for service, ok, latency in samples:
+                for resolution in (HOUR, DAY):
+                    self._roll(service, resolution, int(ts // resolution * resolution), ok, latency)
+        if ts - self._last_prune >= PRUNE_EVERY:
+            self.prune(ts)
+
+    def _roll(self, service: str, resolution: int, start: int, ok: bool, latency: float | None) -> None:
+        row = self.db.execute("SELECT count, up, hist FROM rollups "
+                              "WHERE service = ? AND resolution = ? AND start = ?",
+                              (service, resolution, start)).fetchone()
+        count, up, hist = (row[0], row[1], list(_HIST.unpack(row[2]))) if row else (0, 0, [0] * BINS)
+        if ok and latency is not None:
+            hist[latency_bin(latency)] += 1
+        self.db.execute("INSERT OR REPLACE INTO rollups VALUES (?, ?, ?, ?, ?, ?)",
+                        (service, resolution, start, count + 1, up + int(ok), _HIST.pack(*hist)))
+
+    def prune(self, now: float) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM samples WHERE ts < ?", (now - RAW_RETENTION,))
+            self.db.execute("DELETE FROM rollups WHERE resolution = ? AND start < ?",
+                            (HOUR, now - HOURLY_RETENTION))
+            self.db.execute("DELETE FROM rollups WHERE resolution = ? AND start < ?",
+                            (DAY, now - DAILY_RETENTION))
+        self._last_prune = now
+
+    # ── reading ──────────────────────────────────────────────────────────────
+
+    def services(self) -> list[str]:
+        return [r[0] for r in self.db.execute("SELECT DISTINCT service FROM rollups ORDER BY service")]
+
+    def stats(self, service: str, window: float, now: float | None = None) -> Stats:
+        """Uptime and latency percentiles over the last `window` seconds.
+
+        Exact from raw samples when the window fits in RAW_RETENTION, otherwise
+        from hourly or daily buckets (whole buckets overlapping the window).
+        """
+        now = time.time() if now is None else now
+        since = now - window
+        if window <= RAW_RETENTION:
+            rows = self.db.execute("SELECT ok, latency_ms FROM samples WHERE service = ? AND ts >= ?",
+                                   (service, since)).fetchall()
+            latencies = [lat for ok, lat in rows if ok and lat is not None]
+            up = sum(ok for ok, _ in rows)
+            return Stats(samples=len(rows), uptime=up * 100 / len(rows) if rows else None,
+                         p50=percentile(latencies, 0.50), p95=percentile(latencies, 0.95))
+
+        resolution = HOUR if window <= HOURLY_RETENTION else DAY
+        count, up, hist = 0, 0, [0] * BINS
+        for c, u, blob in self.db.execute(
+                "SELECT count, up, hist FROM rollups WHERE service = ? AND resolution = ? AND start > ?",
+                (service, resolution, since - resolution)):
+            count += c
+            up += u
+            hist = [a + b for a, b in zip(hist, _HIST.unpack(blob))]
+        return Stats(samples=count, uptime=up * 100 / count if count else None,
+                     p50=hist_percentile(hist, 0.50), p95=hist_percentile(hist, 0.95))
+
+    # ── alert state and snapshot ─────────────────────────────────────────────
+
+    def alert_state(self, service: str) -> dict | None:
+        row = self.db.execute("SELECT state FROM alerts WHERE service = ?", (service,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_alert_state(self, service: str, state: dict) -> None:
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO alerts VALUES (?, ?)", (service, json.dumps(state)))
+
+    def get_meta(self, key: str) -> str | None:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
@@ -12,8 +12,34 @@
 # below, review the stow package list (STOW_PACKAGES) and the systemd
 # service arrays, and adjust to match your own dotfiles structure.
 #
-# Usage: bash ~/setup-tmp/install.sh
-# Safe to re-run — idempotent throughout.
+# Usage: bash ~/setup-tmp/install.sh [--dry-run] [--jobs N] [--force STAGE]...
+#   --dry-run      Print the plan (what each package manager is missing and
+#                  the stage graph), then exit without changing anything;
+#                  a normal run prints the same plan before it starts
+#   --jobs N       Run up to N independent stages at once (default: 4;
+#                  --jobs 1 runs them one after another)
+#   --force STAGE  Run STAGE even if its inputs are unchanged (repeatable;
+#                  --force all runs everything)
+# Safe to re-run — idempotent throughout. Each package manager is queried
+# once and only the missing set is installed, in one batch per manager.
+#
+# The work is split into stages with explicit dependencies (see "Stage
+# graph" below). A stage starts as soon as everything it depends on has
+# finished, so clones, Flatpak pulls, AUR builds and venv installs overlap.
+# Each stage writes its output to $STAGE_LOG_DIR/<stage>.log; the console
+# shows when stages start and finish.
+#
+# Stages with a fingerprint (package lists, requirements files, repo HEADs
+# and stow trees — see fingerprint_* below) record it in $FINGERPRINT_FILE
+# after a clean run. On the next run such a stage is skipped when the
+# fingerprint is unchanged and its cheap verify_* check still passes, so
+# editing one package list only re-runs that list's stage. The system update
+# fingerprints the date: it runs once a day.
+#
+# Failure tiers: a fatal stage that fails stops new stages from starting,
+# lets running ones finish, prints the summary and exits 1. Soft failures
+# (single packages, clones, stow packages, services) are collected in the
+# FAILURES list shown at the end and never stop the run.
 # =============================================================================
 
 set -euo pipefail
@@ -21,6 +47,27 @@ set -euo pipefail
 # --- Configuration (edit before running) -------------------------------------
 DOTFILES_REPO=""   # e.g. git@github.com:yourname/dotfiles.git
 SCRIPTS_REPO=""    # e.g. git@github.com:yourname/Scripts.git
+WALLRIZZ_REPO=""   # optional
+CURSOR_REPO=""     # optional, e.g. the future-cyan-hyprcursor repo
+
+# --- Arguments ---------------------------------------------------------------
+DRY_RUN=0
+JOBS=4
+declare -A FORCE=()
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --dry-run) DRY_RUN=1 ;;
+        --jobs)
+            [[ "${2:-}" =~ ^[1-9][0-9]*$ ]] || { echo "--jobs needs a positive number" >&2; exit 2; }
+            JOBS="$2"; shift ;;
+        --force)
+            [[ -n "${2:-}" ]] || { echo "--force needs a stage name (or all)" >&2; exit 2; }
+            FORCE[$2]=1; shift ;;
+        -h|--help) echo "Usage: bash install.sh [--dry-run] [--jobs N] [--force STAGE]..."; exit 0 ;;
+        *) echo "Unknown option: $1 (try --help)" >&2; exit 2 ;;
+    esac
+    shift
+done
 
 # --- Derived paths -----------------------------------------------------------
 SETUP_DIR="$(dirname "$(realpath "$0")")"
@@ -30,128 +77,366 @@ GIT_DIR="$HOME/Git"
 
 # --- Logging -----------------------------------------------------------------
 LOG_FILE="$HOME/setup-install.log"
-FAILURES=()
-
-log()    { echo "[$(date '+%H:%M:%S')] $*" | tee -a "$LOG_FILE"; }
+STAGE_LOG_DIR="$HOME/setup-install-logs"
+# Stages run in subshells, so soft failures are appended to a file rather
+# than a shell array; the summary reads it back
+FAILURES_FILE="$STAGE_LOG_DIR/FAILURES"
+FINGERPRINT_FILE="${XDG_STATE_HOME:-$HOME/.local/state}/setup-install/fingerprints"
+STAGE=""
+
+log()    { echo "[$(date '+%H:%M:%S')]${STAGE:+ [$STAGE]} $*" | tee -a "$LOG_FILE"; }
 info()   { log "INFO  $*"; }
 warn()   { log "WARN  $*"; }
-fail()   { log "FAIL  $*"; FAILURES+=("$*"); }
+# A stage with soft failures is not fingerprinted, so the next run retries it
+fail()   { log "FAIL  $*"; echo "$*" >> "$FAILURES_FILE"; [[ -z "$STAGE" ]] || : > "$STAGE_LOG_DIR/$STAGE.failed"; }
 section(){ echo; log "=== $* ==="; }
 
-# =============================================================================
-# Section 0: Preflight
-# =============================================================================
-section "0: Preflight"
+# --- Package sets ------------------------------------------------------------
+# Each manager is asked once for everything it has installed; what to install
+# is the set difference (comm -23) of the wanted list and that, both sorted.
 
-if [[ $EUID -eq 0 ]]; then
-    echo "ERROR: Do not run this script as root." >&2
-    exit 1
-fi
+PACMAN_LIST="$SETUP_DIR/packages/pacman.txt"
+AUR_LIST="$SETUP_DIR/packages/aur.txt"
+FLATPAK_LIST="$SETUP_DIR/packages/flatpak.txt"
+PIPX_PACKAGES=(
+    vdirsyncer
+)
 
-if ! sudo -v 2>/dev/null; then
-    echo "ERROR: sudo access required." >&2
-    exit 1
-fi
+# Package list file -> one name per line: comments and blank lines stripped
+read_list() {
+    [[ -f "$1" ]] || return 0
+    sed -e 's/#.*//' -e 's/^[[:space:]]*//' -e 's/[[:space:]]*$//' "$1" | sed '/^$/d' | sort -u
+}
 
-if [[ -z "$DOTFILES_REPO" || -z "$SCRIPTS_REPO" ]]; then
-    warn "DOTFILES_REPO and/or SCRIPTS_REPO are not set."
-    warn "Repo clone steps will be skipped. Continuing in 5 seconds..."
-    warn "Press Ctrl+C to abort and set them at the top of this script."
-    sleep 5
-fi
+# missing_from WANTED INSTALLED — newline-separated sets in, wanted-but-absent out
+missing_from() {
+    comm -23 <(printf '%s\n' "$1" | sed '/^$/d' | sort -u) \
+             <(printf '%s\n' "$2" | sed '/^$/d' | sort -u)
+}
+
+installed_pacman() {
+    pacman -Qq 2>/dev/null || true
+}
+
+installed_flatpak() {
+    command -v flatpak &>/dev/null || return 0
+    flatpak list --app --columns=application 2>/dev/null || true
+}
+
+installed_pipx() {
+    command -v pipx &>/dev/null || return 0
+    pipx list --json 2>/dev/null \
+        | python -c 'import json, sys; print("\n".join(json.load(sys.stdin).get("venvs", {})))' \
+        || true
+}
+
+# pacman -Qq only knows package names; one deptest call drops anything an
+# installed package already provides (e.g. a -git build of a listed package)
+unsatisfied() {
+    [[ $# -gt 0 ]] || return 0
+    pacman -T "$@" || true
+}
+
+count_lines() {
+    [[ -n "$1" ]] || { echo 0; return; }
+    printf '%s\n' "$1" | wc -l
+}
+
+plan_line() {   # plan_line LABEL WANTED_COUNT MISSING...
+    local label="$1" wanted="$2"
+    shift 2
+    if [[ $# -eq 0 ]]; then
+        info "  $label: all $wanted installed"
+    else
+        info "  $label: $# of $wanted to install: $*"
+    fi
+}
+
+# Install a batch in one transaction; if it fails, retry one at a time so the
+# FAILURES list names only the packages that really failed.
+batch_install() {   # batch_install LABEL INSTALL_FUNCTION PKG...
+    local label="$1" installer="$2"
+    shift 2
+    [[ $# -gt 0 ]] || return 0
+    info "Installing $# $label package(s): $*"
+    "$installer" "$@" && return 0
+    warn "Batch $label install failed; retrying one at a time"
+    local pkg
+    for pkg in "$@"; do
+        if ! "$installer" "$pkg"; then
+            fail "$label install failed: $pkg"
+        fi
+    done
+}
+
+# plan_* fill the *_MISSING arrays; each queries its manager once
+plan_pacman() {
+    local wanted
+    wanted=$(read_list "$PACMAN_LIST")
+    mapfile -t PACMAN_MISSING < <(missing_from "$wanted" "$(installed_pacman)")
+    mapfile -t PACMAN_MISSING < <(unsatisfied "${PACMAN_MISSING[@]}")
+    plan_line "pacman" "$(count_lines "$wanted")" "${PACMAN_MISSING[@]}"
+}
+
+plan_aur() {
+    local wanted
+    wanted=$(read_list "$AUR_LIST")
+    mapfile -t AUR_MISSING < <(missing_from "$wanted" "$(installed_pacman)")
+    mapfile -t AUR_MISSING < <(unsatisfied "${AUR_MISSING[@]}")
+    plan_line "AUR" "$(count_lines "$wanted")" "${AUR_MISSING[@]}"
+}
+
+plan_flatpak() {
+    local wanted
+    wanted=$(read_list "$FLATPAK_LIST")
+    mapfile -t FLATPAK_MISSING < <(missing_from "$wanted" "$(installed_flatpak)")
+    plan_line "Flatpak" "$(count_lines "$wanted")" "${FLATPAK_MISSING[@]}"
+}
+
+plan_pipx() {
+    local wanted
+    wanted=$(printf '%s\n' "${PIPX_PACKAGES[@]}")
+    mapfile -t PIPX_MISSING < <(missing_from "$wanted" "$(installed_pipx)")
+    plan_line "pipx" "$(count_lines "$wanted")" "${PIPX_MISSING[@]}"
+}
+
+# Succeeds if every package in a list file is installed (one pacman call)
+all_satisfied() {
+    local pkgs
+    mapfile -t pkgs < <(read_list "$1")
+    [[ ${#pkgs[@]} -eq 0 ]] || pacman -T "${pkgs[@]}" >/dev/null
+}
+
+# all_enabled [--user] UNIT... — one systemctl call, every unit enabled
+all_enabled() {
+    local scope=()
+    [[ "$1" != --user ]] || { scope=(--user); shift; }
+    local states
+    states=$(systemctl "${scope[@]}" is-enabled "$@" 2>/dev/null || true)
+    [[ $(count_lines "$states") -eq $# && -z "$(grep -vx enabled <<< "$states")" ]]
+}
+
+aur_install()     { yay -S --needed --noconfirm "$@"; }
+flatpak_install() { flatpak install -y flathub "$@"; }
+pipx_install()    { pipx install "$@"; }
+
+# --- Stage runner ------------------------------------------------------------
+# stage NAME fatal|soft "DEPS..." — declares stage_NAME (dashes become
+# underscores). A stage runs in a background subshell with errexit, output to
+# its own log, once every dependency has finished. A fatal stage exiting
+# non-zero aborts the run; a soft one is recorded in FAILURES and dependents
+# still run (they already cope with missing pieces, as before).
+
+declare -a STAGE_ORDER=()
+declare -A STAGE_KIND=() STAGE_DEPS=() STAGE_STATE=() STAGE_START=()
+declare -A SAVED_FP=() STAGE_FP=()
+
+stage() {
+    local name="$1" kind="$2" deps="$3"
+    STAGE_ORDER+=("$name")
+    STAGE_KIND[$name]="$kind"
+    STAGE_DEPS[$name]="$deps"
+    STAGE_STATE[$name]=pending
+}
+
+deps_done() {
+    local dep
+    for dep in ${STAGE_DEPS[$1]}; do
+        case "${STAGE_STATE[$dep]:-missing}" in
+            ok|failed) ;;
+            *) return 1 ;;
+        esac
+    done
+}
+
+load_fingerprints() {
+    [[ -f "$FINGERPRINT_FILE" ]] || return 0
+    local name fp
+    while read -r name fp; do
+        [[ -n "$name" ]] && SAVED_FP[$name]="$fp"
+    done < "$FINGERPRINT_FILE"
+}
 
-# Keep sudo alive for the duration of the script
-( while true; do sudo -v; sleep 55; done ) &
-SUDO_KEEP_ALIVE_PID=$!
-trap 'kill "$SUDO_KEEP_ALIVE_PID" 2>/dev/null' EXIT
+save_fingerprints() {
+    mkdir -p "$(dirname "$FINGERPRINT_FILE")"
+    local name
+    for name in "${!SAVED_FP[@]}"; do
+        printf '%s %s\n' "$name" "${SAVED_FP[$name]}"
+    done | sort > "$FINGERPRINT_FILE.tmp"
+    mv "$FINGERPRINT_FILE.tmp" "$FINGERPRINT_FILE"
+}
+
+# Succeeds if NAME can be skipped: it has a fingerprint_ function, the
+# fingerprint matches its last clean run, it isn't forced and its verify_
+# check (if any) passes. Computed when the stage becomes ready, since inputs
+# like cloned repos only exist once the stages before it have run.
+stage_cached() {
+    local name="$1" fn="${1//-/_}"
+    declare -F "fingerprint_$fn" >/dev/null || return 1
+    STAGE_FP[$name]=$("fingerprint_$fn" 2>/dev/null | sha256sum | cut -c1-16)
+    [[ -z "${FORCE[$name]:-}${FORCE[all]:-}" ]] || return 1
+    [[ "${SAVED_FP[$name]:-}" == "${STAGE_FP[$name]}" ]] || return 1
+    ! declare -F "verify_$fn" >/dev/null || "verify_$fn" &>/dev/null
+}
 
-info "Preflight passed. Logging to $LOG_FILE"
+start_stage() {
+    local name="$1"
+    rm -f "$STAGE_LOG_DIR/$name.failed"
+    STAGE_STATE[$name]=running
+    STAGE_START[$name]=$SECONDS
+    log "start  $name"
+    (
+        STAGE="$name"
+        "stage_${name//-/_}"
+    ) > "$STAGE_LOG_DIR/$name.log" 2>&1 < /dev/null &
+}
+
+# finish_stage NAME STATUS — returns 1 if the run must abort
+finish_stage() {
+    local name="$1" status="$2" took=$((SECONDS - STAGE_START[$1]))
+    if [[ $status -eq 0 ]]; then
+        STAGE_STATE[$name]=ok
+        log "done   $name (${took}s)"
+        if [[ -n "${STAGE_FP[$name]:-}" && ! -e "$STAGE_LOG_DIR/$name.failed" ]]; then
+            SAVED_FP[$name]="${STAGE_FP[$name]}"
+        else
+            unset "SAVED_FP[$name]"
+        fi
+        save_fingerprints
+        return 0
+    fi
+    STAGE_STATE[$name]=failed
+    unset "SAVED_FP[$name]"
+    save_fingerprints
+    log "FAILED $name (${took}s, exit $status) — log: $STAGE_LOG_DIR/$name.log"
+    tail -n 15 "$STAGE_LOG_DIR/$name.log" | sed 's/^/    | /'
+    if [[ ${STAGE_KIND[$name]} == fatal ]]; then
+        return 1
+    fi
+    fail "stage $name exited $status (see $STAGE_LOG_DIR/$name.log)"
+}
+
+# Sets RUN_STATUS instead of returning it: calling this as `run_stages || ...`
+# would switch off errexit inside every stage subshell.
+RUN_STATUS=0
+run_stages() {
+    local -A pid_stage=()
+    local name pid status aborted=0 progress
+    while true; do
+        progress=1
+        # Repeat while stages are being skipped: a skip can make others ready
+        while [[ $aborted -eq 0 && $progress -eq 1 ]]; do
+            progress=0
+            for name in "${STAGE_ORDER[@]}"; do
+                [[ ${#pid_stage[@]} -lt $JOBS ]] || break
+                [[ ${STAGE_STATE[$name]} == pending ]] && deps_done "$name" || continue
+                if stage_cached "$name"; then
+                    STAGE_STATE[$name]=ok
+                    log "skip   $name (inputs unchanged)"
+                    progress=1
+                    continue
+                fi
+                start_stage "$name"
+                pid_stage[$!]="$name"
+            done
+        done
+        [[ ${#pid_stage[@]} -gt 0 ]] || break
+        status=0
+        wait -n -p pid "${!pid_stage[@]}" || status=$?
+        name="${pid_stage[$pid]}"
+        unset "pid_stage[$pid]"
+        if ! finish_stage "$name" "$status"; then
+            aborted=1
+            [[ ${#pid_stage[@]} -eq 0 ]] || warn "Fatal stage failed; waiting for ${pid_stage[*]} to finish"
+        fi
+    done
+
+    if [[ $aborted -eq 1 ]]; then
+        RUN_STATUS=1
+        return 0
+    fi
+    for name in "${STAGE_ORDER[@]}"; do
+        if [[ ${STAGE_STATE[$name]} == pending ]]; then
+            log "FAILED stage $name never became ready (deps: ${STAGE_DEPS[$name]})"
+            RUN_STATUS=1
+        fi
+    done
+}
 
 # =============================================================================
-# Section 1: System Update
+# Stage: update — system update
 # =============================================================================
-section "1: System update"
+stage_update() {
+    sudo pacman -Syu --noconfirm
+}
 
-sudo pacman -Syu --noconfirm
+fingerprint_update() { date +%F; }
 
 # =============================================================================
-# Section 2: Install yay (AUR helper)
+# Stage: yay — install the AUR helper
 # =============================================================================
-section "2: Install yay"
-
-if command -v yay &>/dev/null; then
-    info "yay already installed, skipping."
-else
+stage_yay() {
+    if command -v yay &>/dev/null; then
+        info "yay already installed, skipping."
+        return
+    fi
     info "Installing yay from AUR..."
     sudo pacman -S --needed --noconfirm base-devel git
-    YAY_TMP=$(mktemp -d)
-    git clone https://aur.archlinux.org/yay.git "$YAY_TMP/yay"
-    ( cd "$YAY_TMP/yay" && makepkg -si --noconfirm )
-    rm -rf "$YAY_TMP"
+    local yay_tmp
+    yay_tmp=$(mktemp -d)
+    git clone https://aur.archlinux.org/yay.git "$yay_tmp/yay"
+    ( cd "$yay_tmp/yay" && makepkg -si --noconfirm )
+    rm -rf "$yay_tmp"
     info "yay installed."
-fi
+}
 
 # =============================================================================
-# Section 3: Pacman packages
+# Stage: pacman — packages/pacman.txt
 # =============================================================================
-section "3: Pacman packages"
-
-PACMAN_LIST="$SETUP_DIR/packages/pacman.txt"
-
-if [[ ! -f "$PACMAN_LIST" ]]; then
-    warn "packages/pacman.txt not found, skipping pacman installs."
-else
-    # Collect packages: strip comments and blank lines
-    mapfile -t PACMAN_PKGS < <(grep -v '^\s*#' "$PACMAN_LIST" | grep -v '^\s*$')
-    TO_INSTALL=()
-    for pkg in "${PACMAN_PKGS[@]}"; do
-        if pacman -Qi "$pkg" &>/dev/null; then
-            info "  [skip] $pkg (already installed)"
-        else
-            TO_INSTALL+=("$pkg")
-        fi
-    done
-    if [[ ${#TO_INSTALL[@]} -gt 0 ]]; then
-        info "Installing ${#TO_INSTALL[@]} pacman packages..."
-        sudo pacman -S --needed --noconfirm "${TO_INSTALL[@]}"
+stage_pacman() {
+    if [[ ! -f "$PACMAN_LIST" ]]; then
+        warn "packages/pacman.txt not found, skipping pacman installs."
+        return
+    fi
+    plan_pacman
+    if [[ ${#PACMAN_MISSING[@]} -gt 0 ]]; then
+        info "Installing ${#PACMAN_MISSING[@]} pacman packages..."
+        sudo pacman -S --needed --noconfirm "${PACMAN_MISSING[@]}"
     else
         info "All pacman packages already installed."
     fi
-fi
+}
+
+fingerprint_pacman() { read_list "$PACMAN_LIST"; }
+verify_pacman()      { all_satisfied "$PACMAN_LIST"; }
 
 # =============================================================================
-# Section 4: AUR packages
+# Stage: aur — packages/aur.txt
 # =============================================================================
-section "4: AUR packages"
-
-AUR_LIST="$SETUP_DIR/packages/aur.txt"
+stage_aur() {
+    if [[ ! -f "$AUR_LIST" ]]; then
+        warn "packages/aur.txt not found, skipping AUR installs."
+        return
+    fi
+    plan_aur
+    if [[ ${#AUR_MISSING[@]} -gt 0 ]]; then
+        batch_install "AUR" aur_install "${AUR_MISSING[@]}"
+    else
+        info "All AUR packages already installed."
+    fi
+}
 
-if [[ ! -f "$AUR_LIST" ]]; then
-    warn "packages/aur.txt not found, skipping AUR installs."
-else
-    mapfile -t AUR_PKGS < <(grep -v '^\s*#' "$AUR_LIST" | grep -v '^\s*$')
-    for pkg in "${AUR_PKGS[@]}"; do
-        if pacman -Qi "$pkg" &>/dev/null; then
-            info "  [skip] $pkg (already installed)"
-        else
-            info "  Installing AUR: $pkg"
-            if ! yay -S --needed --noconfirm "$pkg"; then
-                fail "AUR install failed: $pkg"
-            fi
-        fi
-    done
-fi
+fingerprint_aur() { read_list "$AUR_LIST"; }
+verify_aur()      { all_satisfied "$AUR_LIST"; }
 
 # =============================================================================
-# Section 5: Flatpaks
+# Stage: flatpak — packages/flatpak.txt
 # =============================================================================
-section "5: Flatpaks"
-
-FLATPAK_LIST="$SETUP_DIR/packages/flatpak.txt"
-
-if ! command -v flatpak &>/dev/null; then
-    warn "flatpak not found, skipping Flatpak installs."
-else
+stage_flatpak() {
+    if ! command -v flatpak &>/dev/null; then
+        warn "flatpak not found, skipping Flatpak installs."
+        return
+    fi
     # Add Flathub if not already present
     if ! flatpak remotes | grep -q flathub; then
         info "Adding Flathub remote..."
@@ -160,26 +445,22 @@ else
 
     if [[ ! -f "$FLATPAK_LIST" ]]; then
         warn "packages/flatpak.txt not found, skipping Flatpak installs."
+        return
+    fi
+    plan_flatpak
+    if [[ ${#FLATPAK_MISSING[@]} -gt 0 ]]; then
+        batch_install "Flatpak" flatpak_install "${FLATPAK_MISSING[@]}"
     else
-        mapfile -t FLATPAK_APPS < <(grep -v '^\s*#' "$FLATPAK_LIST" | grep -v '^\s*$')
-        for app in "${FLATPAK_APPS[@]}"; do
-            if flatpak list --app --columns=application | grep -qx "$app"; then
-                info "  [skip] $app (already installed)"
-            else
-                info "  Installing Flatpak: $app"
-                if ! flatpak install -y flathub "$app"; then
-                    fail "Flatpak install failed: $app"
-                fi
-            fi
-        done
+        info "All Flatpaks already installed."
     fi
-fi
+}
+
+fingerprint_flatpak() { read_list "$FLATPAK_LIST"; }
+verify_flatpak()      { [[ -z "$(missing_from "$(read_list "$FLATPAK_LIST")" "$(installed_flatpak)")" ]]; }
 
 # =============================================================================
-# Section 6: Clone repos
+# Stages: clone-* — one per repo so the clones download in parallel
 # =============================================================================
-section "6: Clone repos"
-
 clone_if_missing() {
     local repo="$1"
     local dest="$2"
@@ -199,23 +480,25 @@ clone_if_missing() {
     fi
 }
 
-clone_if_missing "$DOTFILES_REPO"  "$DOTFILES_DIR"                          "dotfiles"
-clone_if_missing "$SCRIPTS_REPO"   "$SCRIPTS_DEST"                          "Scripts"
-clone_if_missing "$WALLRIZZ_REPO"  "$GIT_DIR/WallRizz"                      "WallRizz"
-clone_if_missing "$CURSOR_REPO"    "$GIT_DIR/future-cyan-hyprcursor"        "future-cyan-hyprcursor"
+stage_clone_dotfiles() { clone_if_missing "$DOTFILES_REPO" "$DOTFILES_DIR"                   "dotfiles"; }
+stage_clone_scripts()  { clone_if_missing "$SCRIPTS_REPO"  "$SCRIPTS_DEST"                   "Scripts"; }
+stage_clone_wallrizz() { clone_if_missing "$WALLRIZZ_REPO" "$GIT_DIR/WallRizz"               "WallRizz"; }
+stage_clone_cursor()   { clone_if_missing "$CURSOR_REPO"   "$GIT_DIR/future-cyan-hyprcursor" "future-cyan-hyprcursor"; }
 
 # =============================================================================
-# Section 7: Hyprcursor theme
+# Stage: cursor — Hyprcursor theme
 # =============================================================================
-section "7: Hyprcursor theme"
-
 CURSOR_SRC="$GIT_DIR/future-cyan-hyprcursor"
 CURSOR_DEST="$HOME/.local/share/icons"
 
-if [[ -d "$CURSOR_SRC" ]]; then
+stage_cursor() {
+    if [[ ! -d "$CURSOR_SRC" ]]; then
+        warn "future-cyan-hyprcursor repo not found at $CURSOR_SRC, skipping."
+        return
+    fi
     mkdir -p "$CURSOR_DEST"
     # Copy all cursor theme directories found inside the repo
-    COPIED=0
+    local copied=0 theme_dir dest_name
     for theme_dir in "$CURSOR_SRC"/*/; do
         if [[ -d "$theme_dir" ]]; then
             dest_name="$(basename "$theme_dir")"
@@ -224,20 +507,16 @@ if [[ -d "$CURSOR_SRC" ]]; then
             else
                 info "  Copying cursor theme: $dest_name"
                 cp -r "$theme_dir" "$CURSOR_DEST/"
-                COPIED=$((COPIED + 1))
+                copied=$((copied + 1))
             fi
         fi
     done
-    [[ $COPIED -eq 0 ]] || info "Copied $COPIED cursor theme(s)."
-else
-    warn "future-cyan-hyprcursor repo not found at $CURSOR_SRC, skipping."
-fi
+    [[ $copied -eq 0 ]] || info "Copied $copied cursor theme(s)."
+}
 
 # =============================================================================
-# Section 8: Stow dotfiles
+# Stage: stow — symlink dotfiles into $HOME
 # =============================================================================
-section "8: Stow dotfiles"
-
 STOW_PACKAGES=(
     home
     alacritty kitty fuzzel gtk qt6ct starship
@@ -249,9 +528,12 @@ STOW_PACKAGES=(
     Scripts
 )
 
-if [[ ! -d "$DOTFILES_DIR" ]]; then
-    warn "Dotfiles directory $DOTFILES_DIR not found, skipping stow."
-else
+stage_stow() {
+    if [[ ! -d "$DOTFILES_DIR" ]]; then
+        warn "Dotfiles directory $DOTFILES_DIR not found, skipping stow."
+        return
+    fi
+    local pkg pkg_dir
     for pkg in "${STOW_PACKAGES[@]}"; do
         pkg_dir="$DOTFILES_DIR/$pkg"
         if [[ ! -d "$pkg_dir" ]]; then
@@ -263,99 +545,144 @@ else
             fail "stow failed: $pkg"
         fi
     done
-fi
+}
+
+# Stow only cares which paths exist in each package, so the trees' file lists
+# plus the repo HEADs are the inputs
+fingerprint_stow() {
+    printf '%s\n' "${STOW_PACKAGES[@]}"
+    git -C "$DOTFILES_DIR" rev-parse HEAD
+    git -C "$SCRIPTS_DEST" rev-parse HEAD
+    local pkg
+    for pkg in "${STOW_PACKAGES[@]}"; do
+        [[ -d "$DOTFILES_DIR/$pkg" ]] || continue
+        echo "== $pkg"
+        ( cd "$DOTFILES_DIR/$pkg" && find . -name .git -prune -o -printf '%P %y\n' | sort )
+    done
+}
+
+# One file per package must still resolve into the dotfiles tree
+verify_stow() {
+    local pkg rel
+    for pkg in "${STOW_PACKAGES[@]}"; do
+        [[ -d "$DOTFILES_DIR/$pkg" ]] || continue
+        rel=$(cd "$DOTFILES_DIR/$pkg" && find . -name .git -prune -o -type f -printf '%P\n' -quit)
+        [[ -z "$rel" ]] && continue
+        [[ "$(realpath -m "$HOME/$rel")" == "$(realpath "$DOTFILES_DIR/$pkg/$rel")" ]] || return 1
+    done
+}
 
 # =============================================================================
-# Section 9: pipx packages
+# Stage: pipx
 # =============================================================================
-section "9: pipx packages"
-
-if ! command -v pipx &>/dev/null; then
-    warn "pipx not found, skipping pipx installs."
-else
-    pipx_install() {
-        local pkg="$1"
-        if pipx list | grep -q "$pkg"; then
-            info "  [skip] $pkg (already installed via pipx)"
-        else
-            info "  Installing via pipx: $pkg"
-            if ! pipx install "$pkg"; then
-                fail "pipx install failed: $pkg"
-            fi
-        fi
-    }
+stage_pipx() {
+    if ! command -v pipx &>/dev/null; then
+        warn "pipx not found, skipping pipx installs."
+        return
+    fi
+    plan_pipx
+    if [[ ${#PIPX_MISSING[@]} -gt 0 ]]; then
+        batch_install "pipx" pipx_install "${PIPX_MISSING[@]}"
+    else
+        info "All pipx packages already installed."
+    fi
+}
 
-    pipx_install vdirsyncer
-fi
+fingerprint_pipx() { printf '%s\n' "${PIPX_PACKAGES[@]}"; }
+verify_pipx() {
+    local pkg
+    for pkg in "${PIPX_PACKAGES[@]}"; do
+        [[ -d "${PIPX_HOME:-$HOME/.local/share/pipx}/venvs/$pkg" || -d "$HOME/.local/pipx/venvs/$pkg" ]] || return 1
+    done
+}
 
 # =============================================================================
-# Section 10: Python venvs
+# Stages: venv-* — Python venvs, one stage each so the pip installs overlap
 # =============================================================================
-section "10: Python venvs"
-
 VENVS_DIR="$HOME/Scripts/.venvs"
-mkdir -p "$VENVS_DIR"
 
-# TTS venv
 TTS_VENV="$VENVS_DIR/tts"
 TTS_REQ="$HOME/Scripts/.venvs/tts-requirements.txt"
 TTS_FALLBACK_PKGS="openai piper-tts onnxruntime numpy"
 
-if [[ -d "$TTS_VENV" ]]; then
-    info "  [skip] TTS venv (already exists at $TTS_VENV)"
-else
-    info "  Creating TTS venv..."
-    python -m venv "$TTS_VENV"
+# These stages only run when their requirements (or Python) changed, so an
+# existing venv is updated in place rather than skipped; one whose
+# interpreter no longer runs (e.g. after a Python upgrade) is recreated
+ensure_venv() {   # ensure_venv DIR PIP_INSTALL_ARGS...
+    local venv="$1"
+    shift
+    if ! "$venv/bin/python" -c '' &>/dev/null; then
+        info "  Creating venv $venv..."
+        mkdir -p "$VENVS_DIR"
+        python -m venv --clear "$venv"
+    fi
+    "$venv/bin/pip" install "$@"
+}
+
+venv_ok() { [[ -x "$1/bin/python" ]] && "$1/bin/python" -c ''; }
+
+stage_venv_tts() {
     if [[ -f "$TTS_REQ" ]]; then
         info "  Installing TTS requirements from $TTS_REQ"
-        "$TTS_VENV/bin/pip" install -r "$TTS_REQ"
+        ensure_venv "$TTS_VENV" -r "$TTS_REQ"
     else
         warn "  tts-requirements.txt not found; installing fallback packages: $TTS_FALLBACK_PKGS"
         # shellcheck disable=SC2086
-        "$TTS_VENV/bin/pip" install $TTS_FALLBACK_PKGS
+        ensure_venv "$TTS_VENV" $TTS_FALLBACK_PKGS
     fi
-fi
+}
+
+fingerprint_venv_tts() {
+    python --version
+    if [[ -f "$TTS_REQ" ]]; then cat "$TTS_REQ"; else echo "$TTS_FALLBACK_PKGS"; fi
+}
+verify_venv_tts() { venv_ok "$TTS_VENV"; }
 
 # Torrent-monitor venv (only if requirements.txt exists)
 TORRENT_REQ="$HOME/Scripts/projects/torrent-monitor/requirements.txt"
 TORRENT_VENV="$VENVS_DIR/torrent-monitor"
 
-if [[ -f "$TORRENT_REQ" ]]; then
-    if [[ -d "$TORRENT_VENV" ]]; then
-        info "  [skip] torrent-monitor venv (already exists)"
-    else
-        info "  Creating torrent-monitor venv..."
-        python -m venv "$TORRENT_VENV"
-        "$TORRENT_VENV/bin/pip" install -r "$TORRENT_REQ"
+stage_venv_torrent() {
+    if [[ ! -f "$TORRENT_REQ" ]]; then
+        info "  [skip] torrent-monitor venv (no requirements.txt found)"
+        return
     fi
-else
-    info "  [skip] torrent-monitor venv (no requirements.txt found)"
-fi
+    info "  Installing torrent-monitor requirements from $TORRENT_REQ"
+    ensure_venv "$TORRENT_VENV" -r "$TORRENT_REQ"
+}
+
+fingerprint_venv_torrent() {
+    python --version
+    cat "$TORRENT_REQ" 2>/dev/null || echo "no requirements"
+}
+verify_venv_torrent() { [[ ! -f "$TORRENT_REQ" ]] || venv_ok "$TORRENT_VENV"; }
 
 # =============================================================================
-# Section 11: System services
+# Stage: system-services
 # =============================================================================
-section "11: System services"
-
 SYSTEM_SERVICES=(
     NetworkManager
     bluetooth
 )
 
-for svc in "${SYSTEM_SERVICES[@]}"; do
-    if systemctl is-enabled "$svc" &>/dev/null; then
-        info "  [skip] $svc (already enabled)"
-    else
-        info "  Enabling system service: $svc"
-        sudo systemctl enable "$svc"
-    fi
-done
+stage_system_services() {
+    local svc
+    for svc in "${SYSTEM_SERVICES[@]}"; do
+        if systemctl is-enabled "$svc" &>/dev/null; then
+            info "  [skip] $svc (already enabled)"
+        else
+            info "  Enabling system service: $svc"
+            sudo systemctl enable "$svc"
+        fi
+    done
+}
+
+fingerprint_system_services() { printf '%s\n' "${SYSTEM_SERVICES[@]}"; }
+verify_system_services()      { all_enabled "${SYSTEM_SERVICES[@]}"; }
 
 # =============================================================================
-# Section 12: User services
+# Stage: user-services
 # =============================================================================
-section "12: User services"
-
 USER_SERVICES=(
     hypridle.service
     syncthing.service
@@ -367,33 +694,145 @@ USER_TIMERS=(
     vdirsyncer.timer
 )
 
-systemctl --user daemon-reload
+stage_user_services() {
+    systemctl --user daemon-reload
 
-for svc in "${USER_SERVICES[@]}" "${USER_TIMERS[@]}"; do
-    if systemctl --user is-enabled "$svc" &>/dev/null; then
-        info "  [skip] $svc (already enabled)"
-    else
-        info "  Enabling user service: $svc"
-        if ! systemctl --user enable "$svc" 2>>"$LOG_FILE"; then
-            fail "systemctl --user enable failed: $svc"
+    local svc
+    for svc in "${USER_SERVICES[@]}" "${USER_TIMERS[@]}"; do
+        if systemctl --user is-enabled "$svc" &>/dev/null; then
+            info "  [skip] $svc (already enabled)"
+        else
+            info "  Enabling user service: $svc"
+            if ! systemctl --user enable "$svc" 2>>"$LOG_FILE"; then
+                fail "systemctl --user enable failed: $svc"
+            fi
         fi
+    done
+}
+
+fingerprint_user_services() { printf '%s\n' "${USER_SERVICES[@]}" "${USER_TIMERS[@]}"; }
+verify_user_services()      { all_enabled --user "${USER_SERVICES[@]}" "${USER_TIMERS[@]}"; }
+
+# =============================================================================
+# Stage: xdg — XDG user directories
+# =============================================================================
+stage_xdg() {
+    xdg-user-dirs-update
+    info "XDG user dirs updated."
+}
+
+fingerprint_xdg() { echo xdg-user-dirs; }
+verify_xdg()      { [[ -f "${XDG_CONFIG_HOME:-$HOME/.config}/user-dirs.dirs" ]]; }
+
+# =============================================================================
+# Stage graph
+# =============================================================================
+# Everything that takes the pacman database lock (update, yay, pacman, aur)
+# is chained, since pacman refuses to run twice at once. Clones only need
+# git, which yay guarantees, so they download while the pacman batch runs.
+#
+#     name              kind   depends on
+stage update            fatal  ""
+stage yay               fatal  "update"
+stage pacman            fatal  "yay"
+stage aur               soft   "pacman"
+stage flatpak           fatal  "pacman"
+stage clone-dotfiles    soft   "yay"
+stage clone-scripts     soft   "clone-dotfiles"     # lives inside the dotfiles repo
+stage clone-wallrizz    soft   "yay"
+stage clone-cursor      soft   "yay"
+stage cursor            fatal  "clone-cursor"
+stage stow              soft   "pacman clone-dotfiles clone-scripts"
+stage pipx              soft   "pacman"
+stage venv-tts          fatal  "pacman stow"        # requirements come from ~/Scripts
+stage venv-torrent      fatal  "pacman stow"
+stage system-services   fatal  "pacman"
+stage user-services     fatal  "stow aur pipx"      # unit files come from dotfiles/packages
+stage xdg               fatal  "pacman"
+
+for name in "${!FORCE[@]}"; do
+    if [[ $name != all && -z "${STAGE_KIND[$name]:-}" ]]; then
+        echo "Unknown stage for --force: $name (stages: ${STAGE_ORDER[*]})" >&2
+        exit 2
+    fi
+done
+
+# =============================================================================
+# Preflight
+# =============================================================================
+section "Preflight"
+
+if [[ $EUID -eq 0 ]]; then
+    echo "ERROR: Do not run this script as root." >&2
+    exit 1
+fi
+
+if [[ $DRY_RUN -eq 0 ]] && ! sudo -v 2>/dev/null; then
+    echo "ERROR: sudo access required." >&2
+    exit 1
+fi
+
+if [[ $DRY_RUN -eq 0 ]] && [[ -z "$DOTFILES_REPO" || -z "$SCRIPTS_REPO" ]]; then
+    warn "DOTFILES_REPO and/or SCRIPTS_REPO are not set."
+    warn "Repo clone steps will be skipped. Continuing in 5 seconds..."
+    warn "Press Ctrl+C to abort and set them at the top of this script."
+    sleep 5
+fi
+
+mkdir -p "$STAGE_LOG_DIR"
+: > "$FAILURES_FILE"
+info "Preflight passed. Logging to $LOG_FILE, stage logs in $STAGE_LOG_DIR"
+
+# =============================================================================
+# Plan: what each package manager is missing
+# =============================================================================
+section "Plan"
+
+load_fingerprints
+
+# A real run only queries the managers whose stage will run, so an unchanged
+# re-run stays quick; each stage plans again when its turn comes, since the
+# stages before it may have changed what is installed
+verb="will"
+[[ $DRY_RUN -eq 0 ]] || verb="would"
+for name in pacman aur flatpak pipx; do
+    if [[ $DRY_RUN -eq 1 ]] || ! stage_cached "$name"; then
+        "plan_$name"
+    fi
+done
+info "Stages (up to $JOBS at once):"
+for name in "${STAGE_ORDER[@]}"; do
+    if stage_cached "$name"; then
+        note="unchanged, $verb skip"
+    else
+        note="$verb run"
     fi
+    info "  $name (${STAGE_KIND[$name]}, $note)${STAGE_DEPS[$name]:+ after: ${STAGE_DEPS[$name]}}"
 done
+if [[ $DRY_RUN -eq 1 ]]; then
+    info "Dry run — nothing was changed."
+    exit 0
+fi
+
+# Keep sudo alive for the duration of the script; stop it and any stages
+# still running on exit (including Ctrl+C)
+( while true; do sudo -v; sleep 55; done ) >/dev/null 2>&1 &
+trap 'kill $(jobs -p) 2>/dev/null' EXIT
 
 # =============================================================================
-# Section 13: XDG directories
+# Run
 # =============================================================================
-section "13: XDG dirs"
+section "Stages"
 
-xdg-user-dirs-update
-info "XDG user dirs updated."
+run_stages
 
 # =============================================================================
-# Section 14: Summary & Post-Install Checklist
+# Summary & Post-Install Checklist
 # =============================================================================
-section "14: Summary"
+section "Summary"
 
 # Report failures
+mapfile -t FAILURES < "$FAILURES_FILE"
 if [[ ${#FAILURES[@]} -gt 0 ]]; then
     echo
     echo "============================================================"
@@ -402,10 +841,18 @@ if [[ ${#FAILURES[@]} -gt 0 ]]; then
     for f in "${FAILURES[@]}"; do
         echo "  - $f"
     done
-    echo "Full log: $LOG_FILE"
+    echo "Full log: $LOG_FILE (per stage: $STAGE_LOG_DIR)"
     echo
 fi
 
+if [[ $RUN_STATUS -ne 0 ]]; then
+    echo "============================================================"
+    echo "  SETUP STOPPED — a required stage failed (see FAILED above)."
+    echo "  Fix it and re-run; finished stages are safe to repeat."
+    echo "============================================================"
+    exit 1
+fi
+
 echo "============================================================"
 echo "  POST-INSTALL CHECKLIST — complete these manually:"
 echo "============================================================"
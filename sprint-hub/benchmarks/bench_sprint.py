@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""
+bench_sprint.py — push and read synthetic sprints against the local Google stand-in
+
+Builds a sprint of N captures (half sheet cells, half doc headings), then
+times each operation against tests/fake_google.py over real HTTP:
+
+  push        push_all() of the whole buffer
+  read_doc    read_doc_text() of the report doc (N/2 sections)
+  headings    get_doc_headings() of the report doc
+  read_sheet  read_sheet() of every worksheet tab
+
+For each size and operation it reports wall time (median of --repeat runs),
+requests, bytes sent, bytes received and errors, as seen by the server.
+
+Request and byte counts don't depend on the machine, so they are compared
+with benchmarks/bench_sprint_baselines.json: any count above its baseline is
+a regression (a push that went back to one request per capture, a read that
+stopped asking for a field mask). Wall time is reported, not compared. Runs
+with --quota-every are not compared either, since the injected errors change
+the counts.
+
+Usage:
+  python benchmarks/bench_sprint.py               # run, compare with baselines
+  python benchmarks/bench_sprint.py --sizes 10,100 --latency 40 --json results.json
+  python benchmarks/bench_sprint.py --save        # record new baselines
+
+Options:
+  --sizes N,N,...   Sprint sizes in captures (default: 4,16,64)
+  --repeat N        Runs per operation; wall time is the median (default: 3)
+  --latency MS      Delay the stand-in adds to every request (default: 0)
+  --quota-every N   Answer every Nth request with a 429 quota error
+  --json PATH       Also write the results as JSON
+  --save            Write the counts as the new baselines (merged by size/op)
+  --baseline PATH   Baseline file (default: benchmarks/bench_sprint_baselines.json)
+
+Exit status is 1 if any request or byte count grew.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sprint_hub.capture import Buffer
+from sprint_hub.config import Capture, SprintConfig, SprintDoc
+from sprint_hub.google_api import GoogleAPI
+from sprint_hub.push import push_all
+from tests.fake_google import FakeGoogle
+
+BASELINE = Path(__file__).with_name("bench_sprint_baselines.json")
+COUNTS = ("requests", "bytes_sent", "bytes_received")
+
+DOC_ID = "bench-report"
+SHEET_ID = "bench-worksheet"
+TABS = ["Enumeration", "Exploitation", "Loot"]
+
+NMAP_LINE = "{port}/tcp   open  {svc:<12} OpenSSH 8.9p1 Ubuntu 3ubuntu0.6 (Ubuntu Linux; protocol 2.0)"
+SERVICES = ["ssh", "http", "https", "smb", "mysql", "rdp", "ftp", "imap"]
+
+
+@dataclass
+class Result:
+    size: int
+    op: str
+    wall_ms: float
+    requests: int
+    bytes_sent: int
+    bytes_received: int
+    errors: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.op}[{self.size}]"
+
+
+# ── synthetic sprint ─────────────────────────────────────────────────────────
+
+def capture_text(n: int, lines: int = 30) -> str:
+    """Something shaped like a pasted nmap run (~2.5 KB)."""
+    head = [f"Nmap scan report for 10.10.{n // 256}.{n % 256}", "PORT     STATE SERVICE      VERSION"]
+    body = [NMAP_LINE.format(port=20 + i * 37 % 9000, svc=SERVICES[i % len(SERVICES)]) for i in range(lines)]
+    return "\n".join(head + body)
+
+
+def build_sprint(size: int, tmp: Path) -> tuple[SprintConfig, Buffer, dict, dict]:
+    cfg = SprintConfig.create(f"bench-{size}", config_dir=tmp)
+    cfg.add_doc(SprintDoc(id=SHEET_ID, type="sheet", label="Worksheet", added_chapter=1))
+    cfg.add_doc(SprintDoc(id=DOC_ID, type="doc", label="Report", added_chapter=1))
+    buf = Buffer(path=tmp / f"buffer-{size}.json")
+
+    grid = {tab: [["Host", "Output"]] for tab in TABS}
+    sections = {}
+    for n in range(size):
+        label = f"capture_{n:03d}"
+        if n % 2 == 0:
+            tab = TABS[n // 2 % len(TABS)]
+            row = len(grid[tab]) + 1
+            grid[tab].append([f"10.10.0.{n}", ""])
+            cfg.add_capture(label, Capture(destination_id=SHEET_ID, type="sheet",
+                                           sheet_name=tab, cell=f"B{row}"))
+        else:
+            heading = f"Finding {n:03d}"
+            sections[heading] = "Pending write-up.\n" + capture_text(n, lines=8)
+            cfg.add_capture(label, Capture(destination_id=DOC_ID, type="doc", heading=heading))
+        buf.add(label, capture_text(n), source="pipe")
+    sections["Appendix"] = "End of report."      # so the last finding is not at the end index
+    return cfg, buf, grid, sections
+
+
+# ── runner ───────────────────────────────────────────────────────────────────
+
+def measure(google: FakeGoogle, size: int, op: str, fn, repeat: int, setup=None) -> Result:
+    walls, totals = [], None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        google.reset_log()
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            pass        # injected quota errors; the server log counts them
+        walls.append((time.perf_counter() - start) * 1000)
+        totals = google.totals()
+    return Result(size=size, op=op, wall_ms=round(statistics.median(walls), 2),
+                  requests=totals["requests"], bytes_sent=totals["bytes_in"],
+                  bytes_received=totals["bytes_out"], errors=totals["errors"])
+
+
+def bench_size(size: int, repeat: int, latency: float, quota_every: int, tmp: Path) -> list[Result]:
+    cfg, buf, grid, sections = build_sprint(size, tmp)
+    with FakeGoogle(latency=latency, quota_every=quota_every) as google:
+        def reset():
+            google.add_spreadsheet(SHEET_ID, grid)
+            google.add_document(DOC_ID, sections)
+
+        reset()
+        api = GoogleAPI.for_endpoint(google.url)
+        return [
+            measure(google, size, "push", lambda: push_all(buf, cfg, api=api), repeat, setup=reset),
+            measure(google, size, "read_doc", lambda: api.read_doc_text(DOC_ID), repeat),
+            measure(google, size, "headings", lambda: api.get_doc_headings(DOC_ID), repeat),
+            measure(google, size, "read_sheet", lambda: api.read_sheet(SHEET_ID), repeat),
+        ]
+
+
+def compare(results: list[Result], baselines: dict) -> list[tuple[Result, list[str] | None]]:
+    """(result, counts that grew past the baseline, or None if new) per result."""
+    rows = []
+    for r in results:
+        base = baselines.get(r.key)
+        grew = None if base is None else [c for c in COUNTS if getattr(r, c) > base.get(c, 0)]
+        rows.append((r, grew))
+    return rows
+
+
+def render(rows: list[tuple[Result, list[str] | None]]) -> str:
+    lines = [f"{'size':>5}  {'op':<11} {'wall ms':>9}  {'requests':>8}  {'sent':>9}  {'received':>10}  "
+             f"{'errors':>6}  vs baseline"]
+    for r, grew in rows:
+        verdict = "new" if grew is None else f"REGRESSION ({', '.join(grew)})" if grew else "ok"
+        lines.append(f"{r.size:>5}  {r.op:<11} {r.wall_ms:>9.1f}  {r.requests:>8}  "
+                     f"{r.bytes_sent:>9}  {r.bytes_received:>10}  {r.errors or '-':>6}  {verdict}")
+    return "\n".join(lines)
+
+
+def run(sizes: list[int], repeat: int = 3, latency_ms: float = 0, quota_every: int = 0) -> list[Result]:
+    import tempfile
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            results.extend(bench_size(size, repeat, latency_ms / 1000, quota_every, Path(tmp)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="4,16,64", help="Comma-separated sprint sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0, help="Per-request delay in ms")
+    parser.add_argument("--quota-every", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Write results as JSON")
+    parser.add_argument("--save", action="store_true", help="Record the counts as baselines")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    if args.save and args.quota_every:
+        sys.exit("--save with --quota-every would record the injected errors' counts")
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    results = run(sizes, args.repeat, args.latency, args.quota_every)
+    # Injected quota errors change the counts, so there is nothing to compare
+    rows = compare(results, {} if args.quota_every else baselines.get("results", {}))
+    print(render(rows))
+    if args.json:
+        args.json.write_text(json.dumps([asdict(r) for r in results], indent=2) + "\n")
+        print(f"\nResults written to {args.json}")
+
+    regressed = sum(1 for _, grew in rows if grew)
+    if args.save:
+        merged = dict(baselines.get("results", {}),
+                      **{r.key: {c: getattr(r, c) for c in COUNTS} for r in results})
+        args.baseline.write_text(json.dumps({
+            "note": "requests and body bytes per operation, as counted by tests/fake_google.py; "
+                    "a run fails when any count grows",
+            "results": dict(sorted(merged.items())),
+        }, indent=2) + "\n")
+        print(f"\nBaselines written to {args.baseline}")
+    elif regressed:
+        print(f"\n{regressed} operation(s) made more requests or moved more bytes than baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
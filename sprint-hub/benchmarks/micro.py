@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+"""
+micro.py — micro-benchmarks for sprint-hub's local hot paths
+
+Times the code that runs on every capture, push or TUI refresh against
+generated fixtures far bigger than a normal sprint — thousands of buffer
+entries, multi-megabyte captures, docs with thousands of paragraphs and
+nested tables — and compares each result with benchmarks/baselines.json.
+
+Most paths are measured at two sizes, so a function that turns quadratic
+shows up as its large case regressing while the small one stays put.
+
+Timings are divided by a fixed pure-Python calibration loop timed in the
+same run, so baselines recorded on one machine still mean something on
+another. A benchmark fails when its normalised time exceeds the baseline
+by more than --threshold (default 50%; micro timings are noisy).
+
+Usage:
+  python benchmarks/micro.py                 # run all, compare with baselines
+  python benchmarks/micro.py -k buffer       # only names containing "buffer"
+  python benchmarks/micro.py --save          # record new baselines
+
+Options:
+  -k TEXT          Only run benchmarks whose name contains TEXT
+  --save           Write the results as the new baselines (merged by name)
+  --threshold F    Allowed slowdown as a fraction of baseline (default: 0.5)
+  --rounds N       Timed rounds per benchmark; best is kept (default: 5)
+  --min-time SECS  Minimum duration of one round (default: 0.1)
+  --baseline PATH  Baseline file (default: benchmarks/baselines.json)
+
+Exit status is 1 if any benchmark regressed.
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sprint_hub.capture import Buffer, BufferEntry
+from sprint_hub.config import Capture, SprintConfig, SprintDoc
+from sprint_hub.google_api import GoogleAPI
+from sprint_hub.suggest import _to_snake, suggest_label
+
+BASELINE = Path(__file__).with_name("baselines.json")
+WORDS = ("nmap scan report open filtered closed tcp udp service version http ssl "
+         "apache nginx openssh finding critical high medium low evidence host").split()
+
+BENCHMARKS: dict[str, Callable[[Path], Callable[[], object]]] = {}
+
+
+def bench(name: str):
+    """Register a setup function: it builds fixtures and returns the timed callable."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: float        # best per-call time
+    normalised: float     # seconds / calibration
+    loops: int
+
+
+# ── fixtures ─────────────────────────────────────────────────────────────────
+
+def text(rng: random.Random, size: int) -> str:
+    """~size characters of capture-like lines."""
+    lines, total = [], 0
+    while total < size:
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14)))
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)[:size]
+
+
+def make_buffer(tmp: Path, entries: int, size: int, seed: int = 1) -> Buffer:
+    rng = random.Random(seed)
+    buf = Buffer(path=tmp / f"buffer-{entries}-{size}.json")
+    buf.entries = [BufferEntry(label=f"capture_{i:05d}", content=text(rng, size), source="pipe")
+                   for i in range(entries)]
+    return buf
+
+
+def make_config(tmp: Path, captures: int) -> SprintConfig:
+    cfg = SprintConfig.create(f"bench-{captures}", config_dir=tmp)
+    for d in range(captures // 10):
+        cfg.add_doc(SprintDoc(id=f"doc{d:04d}", type="doc" if d % 2 else "sheet",
+                              label=f"Document {d}", added_chapter=d // 5 + 1))
+    for i in range(captures):
+        if i % 2:
+            cfg.add_capture(f"capture_{i:05d}", Capture(destination_id=f"doc{i % 100:04d}", type="doc",
+                                                        heading=f"Finding {i}"))
+        else:
+            cfg.add_capture(f"capture_{i:05d}", Capture(destination_id=f"doc{i % 100:04d}", type="sheet",
+                                                        sheet_name="Enumeration", cell=f"B{i + 2}"))
+    return cfg
+
+
+def paragraph(content: str, style: str = "NORMAL_TEXT", end: int = 0) -> dict:
+    return {"endIndex": end, "paragraph": {
+        "paragraphStyle": {"namedStyleType": style},
+        "elements": [{"textRun": {"content": content, "textStyle": {}}}],
+    }}
+
+
+def make_doc(paragraphs: int, tables: int = 0, seed: int = 2) -> dict:
+    """Doc body with a heading every 10 paragraphs and nested tables sprinkled in."""
+    rng = random.Random(seed)
+    content, index = [], 1
+    for i in range(paragraphs):
+        style = "HEADING_2" if i % 10 == 0 else "NORMAL_TEXT"
+        line = f"Section {i // 10}\n" if style != "NORMAL_TEXT" else text(rng, 120) + "\n"
+        index += len(line)
+        content.append(paragraph(line, style, end=index))
+        if tables and i % (paragraphs // tables or 1) == 5:
+            inner = {"table": {"tableRows": [{"tableCells": [
+                {"content": [paragraph(f"{rng.choice(WORDS)}\n")]} for _ in range(3)]}]}}
+            content.append({"table": {"tableRows": [
+                {"tableCells": [{"content": [paragraph("port\n"), inner]},
+                                {"content": [paragraph(text(rng, 60) + "\n")]}]}
+                for _ in range(4)]}})
+    return {"body": {"content": content}}
+
+
+def make_tabbed_doc(paragraphs: int, tables: int) -> dict:
+    per_tab = paragraphs // 4
+    tab = lambda n, children=(): {"tabProperties": {"title": f"Tab {n}"},
+                                   "documentTab": make_doc(per_tab, tables // 4, seed=n),
+                                   "childTabs": list(children)}
+    return {"tabs": [tab(1, [tab(2), tab(3)]), tab(4)]}
+
+
+def doc_api(doc: dict) -> GoogleAPI:
+    """A GoogleAPI whose documents().get() returns `doc` without any I/O."""
+    api = GoogleAPI.__new__(GoogleAPI)
+    request = SimpleNamespace(execute=lambda: doc)
+    api._documents = SimpleNamespace(get=lambda **kwargs: request)
+    return api
+
+
+# ── benchmarks ───────────────────────────────────────────────────────────────
+
+for entries, size in ((200, 1_000), (2_000, 1_000), (8, 2_000_000)):
+    tag = f"{entries}x{size // 1000}KB"
+
+    @bench(f"buffer.load[{tag}]")
+    def _(tmp, entries=entries, size=size):
+        buf = make_buffer(tmp, entries, size)
+        buf.save()
+        return Buffer(path=buf.path).load
+
+    @bench(f"buffer.save[{tag}]")
+    def _(tmp, entries=entries, size=size):
+        return make_buffer(tmp, entries, size).save
+
+
+for entries in (200, 2_000):
+    @bench(f"buffer.add[{entries}]")
+    def _(tmp, entries=entries):
+        buf = make_buffer(tmp, entries, 200)
+        label = f"capture_{entries // 2:05d}"
+        return lambda: buf.add(label, "replacement", source="clipboard")
+
+
+for captures in (200, 2_000):
+    @bench(f"config.load[{captures}]")
+    def _(tmp, captures=captures):
+        make_config(tmp, captures).save()
+        return lambda: SprintConfig.load(f"bench-{captures}", config_dir=tmp)
+
+    @bench(f"config.save[{captures}]")
+    def _(tmp, captures=captures):
+        return make_config(tmp, captures).save
+
+
+@bench("suggest_label.command")
+def _(tmp):
+    capture = text(random.Random(3), 2_000_000)
+    return lambda: suggest_label(capture, command="/usr/bin/nmap -sV 10.0.0.1")
+
+
+for size in (10_000, 2_000_000):
+    @bench(f"suggest_label.headings[{size // 1000}KB]")
+    def _(tmp, size=size):
+        capture = "## Finding 0420 — exposed admin panel\n" + text(random.Random(4), size)
+        headings = [f"Finding {i:04d}" for i in range(500)]
+        return lambda: suggest_label(capture, headings=headings)
+
+
+@bench("_to_snake[10KB]")
+def _(tmp):
+    raw = text(random.Random(5), 10_000).replace("\n", " -- ")
+    return lambda: _to_snake(raw)
+
+
+for paragraphs, tables in ((500, 10), (5_000, 100)):
+    @bench(f"read_doc_text[{paragraphs}p]")
+    def _(tmp, paragraphs=paragraphs, tables=tables):
+        return lambda api=doc_api(make_doc(paragraphs, tables)): api.read_doc_text("doc")
+
+    @bench(f"read_doc_text.tabs[{paragraphs}p]")
+    def _(tmp, paragraphs=paragraphs, tables=tables):
+        return lambda api=doc_api(make_tabbed_doc(paragraphs, tables)): api.read_doc_text("doc")
+
+    @bench(f"find_heading_end_index[{paragraphs}p]")
+    def _(tmp, paragraphs=paragraphs):
+        doc = make_doc(paragraphs)
+        last = f"Section {(paragraphs - 1) // 10}"
+        return lambda: GoogleAPI._find_heading_end_index(doc, last)
+
+
+# ── timing ───────────────────────────────────────────────────────────────────
+
+def calibrate(rounds: int = 5) -> float:
+    """Seconds for a fixed pure-Python workload (dicts, strings, json)."""
+    payload = [{"label": f"capture_{i}", "content": "x" * 40} for i in range(300)]
+
+    def work():
+        seen = {}
+        for item in payload:
+            seen[item["label"].upper()] = item["content"].replace("x", "y")
+        json.loads(json.dumps(payload))
+        return sorted(seen)
+
+    return min(time_call(work, 0.05)[0] for _ in range(rounds))
+
+
+def time_call(fn: Callable[[], object], min_time: float) -> tuple[float, int]:
+    """(seconds per call, loops) for one round of at least min_time."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / loops, loops
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)) + 1)
+
+
+def run(names: list[str], rounds: int, min_time: float) -> tuple[float, list[Result]]:
+    unit = calibrate()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            fn = BENCHMARKS[name](Path(tmp))
+            fn()                                    # warm-up (and first-touch caches)
+            best, loops = min(time_call(fn, min_time) for _ in range(rounds))
+            results.append(Result(name=name, seconds=best, normalised=best / unit, loops=loops))
+    return unit, results
+
+
+def compare(results: list[Result], baselines: dict, threshold: float) -> list[tuple[Result, float | None, bool]]:
+    """(result, ratio to baseline or None if new, regressed) per result."""
+    rows = []
+    for r in results:
+        base = baselines.get(r.name)
+        ratio = r.normalised / base if base else None
+        rows.append((r, ratio, ratio is not None and ratio > 1 + threshold))
+    return rows
+
+
+def fmt_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filter", default="", help="Only names containing this")
+    parser.add_argument("--save", action="store_true", help="Record results as baselines")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    args = parser.parse_args()
+
+    names = [n for n in BENCHMARKS if args.filter in n]
+    if not names:
+        sys.exit(f"No benchmarks match '{args.filter}'")
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    unit, results = run(names, args.rounds, args.min_time)
+
+    print(f"calibration: {fmt_time(unit)} per unit\n")
+    width = max(len(n) for n in names)
+    print(f"{'benchmark':<{width}}  {'per call':>10}  {'units':>9}  {'vs baseline':>11}")
+    regressed = 0
+    for r, ratio, bad in compare(results, baselines.get("benchmarks", {}), args.threshold):
+        verdict = "new" if ratio is None else f"{ratio:.2f}x"
+        flag = "  REGRESSION" if bad else ""
+        regressed += bad
+        print(f"{r.name:<{width}}  {fmt_time(r.seconds):>10}  {r.normalised:>9.2f}  {verdict:>11}{flag}")
+
+    if args.save:
+        merged = dict(baselines.get("benchmarks", {}), **{r.name: round(r.normalised, 6) for r in results})
+        args.baseline.write_text(json.dumps({
+            "note": "per-call time in calibration units (see calibrate()); lower is faster",
+            "benchmarks": dict(sorted(merged.items())),
+        }, indent=2) + "\n")
+        print(f"\nBaselines written to {args.baseline}")
+    elif regressed:
+        print(f"\n{regressed} benchmark(s) more than {args.threshold:.0%} slower than baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
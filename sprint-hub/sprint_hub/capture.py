@@ -1,11 +1,12 @@
 from __future__ import annotations
 import json
 import sys
-import subprocess
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Optional
 
+from sprint_hub import trace
+
 CONFIG_DIR = Path.home() / ".config" / "sprint-hub"
 
 
@@ -22,13 +23,19 @@ class Buffer:
     entries: list[BufferEntry] = field(default_factory=list)
 
     def load(self) -> None:
-        if self.path.exists():
-            data = json.loads(self.path.read_text())
-            self.entries = [BufferEntry(**e) for e in data]
+        with trace.span("buffer.load") as s:
+            if self.path.exists():
+                text = self.path.read_text()
+                data = json.loads(text)
+                self.entries = [BufferEntry(**e) for e in data]
+                s.set(bytes=len(text), entries=len(self.entries))
 
     def save(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps([asdict(e) for e in self.entries], indent=2))
+        with trace.span("buffer.save", entries=len(self.entries)) as s:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            text = json.dumps([asdict(e) for e in self.entries], indent=2)
+            self.path.write_text(text)
+            s.set(bytes=len(text))
 
     def add(self, label: str, content: str, source: str = "unknown") -> None:
         self.entries = [e for e in self.entries if e.label != label]
@@ -53,6 +60,7 @@ class Buffer:
 
 def read_from_clipboard() -> str:
     """Read text from Wayland clipboard using wl-paste."""
+    import subprocess       # deferred: piped captures never need it
     result = subprocess.run(
         ["wl-paste", "--no-newline"],
         capture_output=True, text=True
@@ -1,13 +1,36 @@
 from __future__ import annotations
+import functools
 import click
 from pathlib import Path
 
+from sprint_hub import trace
 from sprint_hub.config import SprintConfig, SprintDoc, Capture
 from sprint_hub.capture import Buffer, read_from_clipboard, read_from_stdin
+from sprint_hub.outbox import Outbox
 from sprint_hub.suggest import suggest_label
 
 
+def traced(fn):
+    """Give a command a --trace [PATH] option (SPRINT_HUB_TRACE=1|PATH works too)."""
+    @click.option("--trace", "trace_path", is_flag=False, flag_value="auto", default=None,
+                  metavar="[PATH]", help="Write a JSON trace and print a timing summary.")
+    @functools.wraps(fn)
+    def wrapper(*args, trace_path: str | None = None, **kwargs):
+        name = click.get_current_context().info_name or fn.__name__
+        if trace_path:
+            trace.start(trace_path, command=name)
+        else:
+            trace.start_from_env(name)
+        try:
+            with trace.span(f"cli.{name}"):
+                return fn(*args, **kwargs)
+        finally:
+            trace.finish()
+    return wrapper
+
+
 @click.command("sprint-init")
+@traced
 @click.option("--name", prompt="Sprint name (e.g. sprint-11)")
 @click.option("--url", default=None, help="Google Doc or Sheet URL (optional)")
 def init(name: str, url: str | None):
@@ -21,6 +44,7 @@ def init(name: str, url: str | None):
 
 
 @click.command("sprint-add")
+@traced
 @click.option("--url", prompt="Google Doc or Sheet URL")
 @click.option("--chapter", default=None, type=int)
 def add(url: str, chapter: int | None):
@@ -37,6 +61,7 @@ def add(url: str, chapter: int | None):
 
 
 @click.command("sprint-capture")
+@traced
 @click.option("--from-clipboard", "from_clip", is_flag=True)
 @click.option("--label", default=None)
 @click.option("--command", default=None, help="Hint for auto-suggest (e.g. nmap)")
@@ -76,6 +101,7 @@ def capture(from_clip: bool, label: str | None, command: str | None):
 
 
 @click.command("sprint-remove")
+@traced
 @click.argument("label")
 def remove(label: str):
     """Remove a labeled entry from the buffer."""
@@ -90,6 +116,7 @@ def remove(label: str):
 
 
 @click.command("sprint-relabel")
+@traced
 @click.argument("old_label")
 @click.argument("new_label")
 def relabel(old_label: str, new_label: str):
@@ -106,6 +133,7 @@ def relabel(old_label: str, new_label: str):
 
 
 @click.command("sprint-edit")
+@traced
 @click.argument("label")
 def edit_entry(label: str):
     """Open a buffer entry's content in $EDITOR."""
@@ -124,7 +152,50 @@ def edit_entry(label: str):
     click.echo(f"Updated '{label}'.")
 
 
+@click.command("sprint-drain")
+@traced
+@click.option("--status", is_flag=True, help="List queued pushes without retrying.")
+@click.option("--now", "force", is_flag=True, help="Ignore backoff and retry everything.")
+@click.option("--retry-failed", is_flag=True, help="Give rejected pushes another try.")
+def drain(status: bool, force: bool, retry_failed: bool):
+    """Retry pushes queued while Google was unreachable.
+
+    Run by sprint-drain.timer every couple of minutes; safe to run by hand.
+    """
+    if status and retry_failed:
+        click.echo("--status only lists the queue; run --retry-failed on its own.", err=True)
+        raise SystemExit(1)
+    from sprint_hub.push import drain_outbox   # lazy import: pulls in the Google client
+    outbox = Outbox.for_config_dir()
+    results: dict[str, str] = {}
+    try:
+        with outbox.locked(wait=False):
+            if retry_failed:
+                for item in outbox.items:
+                    item.failed, item.next_attempt = False, 0.0
+            if not status:
+                results = drain_outbox(outbox, force=force)
+    except BlockingIOError:
+        click.echo("Outbox is busy (a push is running); try again shortly.", err=True)
+        return
+    if outbox.set_aside:
+        click.echo(f"Outbox was unreadable; moved to {outbox.set_aside} and started empty.",
+                   err=True)
+
+    for label, result in results.items():
+        click.echo(f"  {label}: {result}")
+    if status:
+        for item in outbox.items:
+            state = "failed" if item.failed else f"{item.attempts} attempts"
+            click.echo(f"  {item.label:<20} {item.capture.destination_id:<16} {state:<12} "
+                       f"{item.last_error}")
+    waiting, failed = outbox.depth()
+    pushed = sum(1 for v in results.values() if v == "ok")
+    click.echo(f"{pushed} pushed, {waiting} waiting, {failed} failed.")
+
+
 @click.command("sprint-hub")
+@traced
 def hub():
     """Open the Sprint Hub TUI."""
     from sprint_hub.tui import SprintHubApp
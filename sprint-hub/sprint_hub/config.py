@@ -4,8 +4,15 @@ from pathlib import Path
 from typing import Optional
 import yaml
 
+from sprint_hub import trace
+
 CONFIG_DIR = Path.home() / ".config" / "sprint-hub"
 
+# libyaml's C loader/dumper when PyYAML was built with it — same output,
+# an order of magnitude faster on big sprints
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 @dataclass
 class SprintDoc:
@@ -54,12 +61,18 @@ class SprintConfig:
                 for name, c in self.captures.items()
             },
         }
-        path.write_text(yaml.safe_dump(data, default_flow_style=False))
+        with trace.span("config.save", sprint=self.sprint) as s:
+            text = yaml.dump(data, Dumper=_Dumper, default_flow_style=False)
+            path.write_text(text)
+            s.set(bytes=len(text))
 
     @classmethod
     def load(cls, sprint: str, config_dir: Path = CONFIG_DIR) -> "SprintConfig":
         path = config_dir / f"{sprint}.yaml"
-        data = yaml.safe_load(path.read_text())
+        with trace.span("config.load", sprint=sprint) as s:
+            text = path.read_text()
+            data = yaml.load(text, Loader=_Loader)
+            s.set(bytes=len(text))
         docs = [SprintDoc(**d) for d in data.get("docs", [])]
         captures = {
             name: Capture(**vals)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import json
 import re
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
@@ -9,6 +10,8 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
+from sprint_hub import trace
+
 CONFIG_DIR = Path.home() / ".config" / "sprint-hub"
 SCOPES = [
     "https://www.googleapis.com/auth/documents",
@@ -17,33 +20,80 @@ SCOPES = [
 ]
 
 
+class AuthRequired(RuntimeError):
+    """The OAuth consent flow is needed but nobody is there to click through it."""
+
+
 class GoogleAPI:
-    def __init__(self, config_dir: Path = CONFIG_DIR):
-        creds = self._get_credentials(config_dir)
-        self.sheets = build("sheets", "v4", credentials=creds)
-        self.docs   = build("docs",   "v1", credentials=creds)
+    def __init__(self, config_dir: Path = CONFIG_DIR, interactive: bool = True):
+        with trace.span("google.credentials"):
+            creds = self._get_credentials(config_dir, interactive)
+        http = self._traced_http(creds) if trace.enabled() else None
+        with trace.span("google.build", api="sheets"):
+            self.sheets = build("sheets", "v4", **self._auth(creds, http))
+        with trace.span("google.build", api="docs"):
+            self.docs   = build("docs",   "v1", **self._auth(creds, http))
+
+    @classmethod
+    def for_endpoint(cls, endpoint: str) -> "GoogleAPI":
+        """Unauthenticated client for a local stand-in server (tests, benchmarks)."""
+        import httplib2
+        http = httplib2.Http()
+        if trace.enabled():
+            http = trace.TracedHttp(http)
+        api = cls.__new__(cls)
+        options = {"api_endpoint": endpoint}
+        api.sheets = build("sheets", "v4", http=http, client_options=options)
+        api.docs   = build("docs",   "v1", http=http, client_options=options)
+        return api
+
+    @staticmethod
+    def _auth(creds: Credentials, http) -> dict:
+        # build() takes either credentials or an authorized http, not both
+        return {"http": http} if http is not None else {"credentials": creds}
+
+    @staticmethod
+    def _traced_http(creds: Credentials):
+        """Authorized http whose round trips show up as trace spans."""
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.http import build_http
+        return AuthorizedHttp(creds, http=trace.TracedHttp(build_http()))
+
+    @staticmethod
+    def _execute(name: str, request) -> dict:
+        with trace.span(f"google.{name}"):
+            return request.execute()
 
     # ── auth ──────────────────────────────────────────────────────────────────
 
     @staticmethod
-    def _get_credentials(config_dir: Path) -> Credentials:
-        """Load or refresh OAuth2 credentials. Token stored as JSON."""
+    def _get_credentials(config_dir: Path, interactive: bool = True) -> Credentials:
+        """Load or refresh OAuth2 credentials. Token stored as JSON.
+
+        With interactive=False (background drains) a missing or revoked token
+        raises AuthRequired instead of opening a browser.
+        """
         token_path = config_dir / "token.json"
         creds_path = config_dir / "credentials.json"
         creds: Optional[Credentials] = None
 
         if token_path.exists():
             creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
+            trace.current().set(source="token")
 
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
+                trace.current().set(source="refresh")
                 creds.refresh(Request())
             else:
+                trace.current().set(source="flow")
                 if not creds_path.exists():
                     raise FileNotFoundError(
                         f"credentials.json not found at {creds_path}\n"
                         "See the Pre-Flight steps in the implementation plan."
                     )
+                if not interactive:
+                    raise AuthRequired("Google sign-in needed: open sprint-hub and push once")
                 flow = InstalledAppFlow.from_client_secrets_file(
                     str(creds_path), SCOPES
                 )
@@ -55,6 +105,23 @@ class GoogleAPI:
 
         return creds
 
+    # ── collections ───────────────────────────────────────────────────────────
+    # Each spreadsheets()/values()/documents() call builds a new Resource and
+    # renders docstrings for all its methods from the discovery schema, which
+    # costs tens of milliseconds — far more than a local request. Build once.
+
+    @cached_property
+    def _spreadsheets(self):
+        return self.sheets.spreadsheets()
+
+    @cached_property
+    def _values(self):
+        return self._spreadsheets.values()
+
+    @cached_property
+    def _documents(self):
+        return self.docs.documents()
+
     # ── sheets ────────────────────────────────────────────────────────────────
 
     def read_sheet(self, spreadsheet_id: str, sheet_name: str | None = None) -> str:
@@ -69,11 +136,9 @@ class GoogleAPI:
 
         chunks = []
         for name in sheet_names:
-            result = (
-                self.sheets.spreadsheets()
-                .values()
-                .get(spreadsheetId=spreadsheet_id, range=name)
-                .execute()
+            result = self._execute(
+                "sheets.values.get",
+                self._values.get(spreadsheetId=spreadsheet_id, range=name),
             )
             rows = result.get("values", [])
             chunks.append(f"\n=== {name} ===\n")
@@ -83,10 +148,9 @@ class GoogleAPI:
         return "".join(chunks)
 
     def get_sheet_names(self, spreadsheet_id: str) -> list[str]:
-        result = (
-            self.sheets.spreadsheets()
-            .get(spreadsheetId=spreadsheet_id, fields="sheets/properties/title")
-            .execute()
+        result = self._execute(
+            "sheets.get",
+            self._spreadsheets.get(spreadsheetId=spreadsheet_id, fields="sheets/properties/title"),
         )
         return [s["properties"]["title"] for s in result.get("sheets", [])]
 
@@ -98,18 +162,21 @@ class GoogleAPI:
         value: str,
     ) -> None:
         range_notation = f"{sheet_name}!{cell}"
-        self.sheets.spreadsheets().values().update(
+        self._execute("sheets.values.update", self._values.update(
             spreadsheetId=spreadsheet_id,
             range=range_notation,
             valueInputOption="RAW",
             body={"values": [[value]]},
-        ).execute()
+        ))
 
     # ── docs ──────────────────────────────────────────────────────────────────
 
     def read_doc_text(self, document_id: str) -> str:
         """Return the full plain text content of a Google Doc, including all tabs and tables."""
-        doc = self.docs.documents().get(documentId=document_id, includeTabsContent=True).execute()
+        doc = self._execute(
+            "docs.get",
+            self._documents.get(documentId=document_id, includeTabsContent=True),
+        )
         chunks = []
 
         def extract_paragraph(para: dict) -> None:
@@ -149,7 +216,7 @@ class GoogleAPI:
         return "".join(chunks)
 
     def get_doc_headings(self, document_id: str) -> list[str]:
-        doc = self.docs.documents().get(documentId=document_id).execute()
+        doc = self._execute("docs.get", self._documents.get(documentId=document_id))
         headings = []
         for elem in doc.get("body", {}).get("content", []):
             para = elem.get("paragraph", {})
@@ -170,12 +237,12 @@ class GoogleAPI:
         content: str,
     ) -> None:
         """Append content after the first heading matching heading_text."""
-        doc = self.docs.documents().get(documentId=document_id).execute()
+        doc = self._execute("docs.get", self._documents.get(documentId=document_id))
         insert_index = self._find_heading_end_index(doc, heading_text)
         if insert_index is None:
             raise ValueError(f"Heading '{heading_text}' not found in document")
 
-        self.docs.documents().batchUpdate(
+        self._execute("docs.batchUpdate", self._documents.batchUpdate(
             documentId=document_id,
             body={
                 "requests": [{
@@ -185,7 +252,7 @@ class GoogleAPI:
                     }
                 }]
             },
-        ).execute()
+        ))
 
     @staticmethod
     def _find_heading_end_index(doc: dict, heading_text: str) -> Optional[int]:
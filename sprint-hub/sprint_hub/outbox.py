@@ -0,0 +1,134 @@
+from __future__ import annotations
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+
+from sprint_hub import trace
+from sprint_hub.config import Capture
+
+CONFIG_DIR = Path.home() / ".config" / "sprint-hub"
+
+BACKOFF_BASE = 60.0         # seconds before the first retry; doubles per failure
+BACKOFF_MAX = 900.0
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class QueuedPush:
+    label: str
+    content: str
+    capture: Capture                # resolved target, so config edits don't reroute it
+    source: str = "unknown"
+    queued_at: float = 0.0
+    attempts: int = 0
+    next_attempt: float = 0.0
+    last_error: str = ""
+    failed: bool = False            # rejected for a non-transient reason; not retried
+
+    def due(self, now: float) -> bool:
+        return not self.failed and self.next_attempt <= now
+
+    def retry_later(self, error: Exception, now: float) -> None:
+        self.attempts += 1
+        self.last_error = str(error)
+        self.next_attempt = now + min(BACKOFF_BASE * 2 ** (self.attempts - 1), BACKOFF_MAX)
+
+
+@dataclass
+class Outbox:
+    """Pushes that failed for transient reasons, in the order they were made.
+
+    Shared by the TUI and the sprint-drain timer, so every read-modify-write
+    goes through locked().
+    """
+    path: Path
+    items: list[QueuedPush] = field(default_factory=list)
+    set_aside: Path | None = None   # where locked() moved an unreadable file
+
+    def load(self) -> None:
+        """Read the queue. Raises ValueError if the file isn't a valid outbox."""
+        with trace.span("outbox.load") as s:
+            self.items = []
+            if self.path.exists():
+                text = self.path.read_text()
+                try:
+                    for item in json.loads(text):
+                        item["capture"] = Capture(**item["capture"])
+                        self.items.append(QueuedPush(**item))
+                except (TypeError, KeyError) as e:
+                    self.items = []
+                    raise ValueError(f"{self.path}: not an outbox: {e!r}") from None
+                s.set(bytes=len(text), items=len(self.items))
+
+    def save(self) -> None:
+        with trace.span("outbox.save", items=len(self.items)) as s:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            text = json.dumps([asdict(i) for i in self.items], indent=2)
+            # Atomic: the TUI reads the depth without taking the lock
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(text)
+            os.replace(tmp, self.path)
+            s.set(bytes=len(text))
+
+    @contextmanager
+    def locked(self, wait: bool = True):
+        """Hold the outbox lock: items are loaded on entry and saved on exit.
+
+        An unreadable outbox.json is moved aside to outbox.json.corrupt-<time>
+        (recorded in set_aside) and the queue starts empty, so one damaged
+        file doesn't stop every later push. Raises BlockingIOError if wait is
+        False and another process has the lock.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            try:
+                self.load()
+            except ValueError:
+                # Only under the lock: no writer can be replacing the file
+                self.set_aside = self.path.with_name(f"{self.path.name}.corrupt-{int(time.time())}")
+                os.replace(self.path, self.set_aside)
+            try:
+                yield self
+            finally:
+                self.save()
+
+    def add(self, label: str, content: str, capture: Capture,
+            source: str = "unknown", error: str = "") -> QueuedPush:
+        item = QueuedPush(label=label, content=content, capture=capture, source=source,
+                          queued_at=time.time(), last_error=error)
+        self.items.append(item)
+        return item
+
+    def pending(self, destination_id: str) -> bool:
+        """True if a push to this document is still waiting (new ones must queue behind it)."""
+        return any(not i.failed and i.capture.destination_id == destination_id
+                   for i in self.items)
+
+    def depth(self) -> tuple[int, int]:
+        """(waiting, failed) counts."""
+        failed = sum(1 for i in self.items if i.failed)
+        return len(self.items) - failed, failed
+
+    @classmethod
+    def for_config_dir(cls, config_dir: Path = CONFIG_DIR) -> "Outbox":
+        """Return an Outbox at config_dir/outbox.json. Like Buffer, not auto-loaded."""
+        return cls(path=config_dir / "outbox.json")
+
+
+def is_transient(error: Exception) -> bool:
+    """Worth retrying later: network trouble, quota/5xx responses, auth that
+    needs a human (expired token, missing credentials.json)."""
+    import httplib2
+    from google.auth.exceptions import RefreshError, TransportError
+    from googleapiclient.errors import HttpError
+    from sprint_hub.google_api import AuthRequired
+
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRY_STATUSES
+    return isinstance(error, (OSError, TimeoutError, httplib2.HttpLib2Error,
+                              TransportError, RefreshError, AuthRequired))
@@ -1,7 +1,12 @@
 from __future__ import annotations
+import time
+from contextlib import nullcontext
+
+from sprint_hub import trace
 from sprint_hub.capture import Buffer, BufferEntry
-from sprint_hub.config import SprintConfig
+from sprint_hub.config import Capture, SprintConfig
 from sprint_hub.google_api import GoogleAPI
+from sprint_hub.outbox import Outbox, is_transient
 
 
 def push_entry(
@@ -23,18 +28,24 @@ def push_entry(
 
     cap = config.captures[entry.label]
 
+    with trace.span("push.entry", label=entry.label, type=cap.type, bytes=len(entry.content)):
+        deliver(cap, entry.content, api)
+
+
+def deliver(cap: Capture, content: str, api: GoogleAPI) -> None:
+    """Write content to a resolved destination. Raises ValueError for an unknown type."""
     if cap.type == "sheet":
         api.write_sheet_cell(
             spreadsheet_id=cap.destination_id,
             sheet_name=cap.sheet_name,
             cell=cap.cell,
-            value=entry.content,
+            value=content,
         )
     elif cap.type == "doc":
         api.append_to_heading(
             document_id=cap.destination_id,
             heading_text=cap.heading,
-            content=entry.content,
+            content=content,
         )
     else:
         raise ValueError(f"Unknown destination type: {cap.type}")
@@ -44,20 +55,110 @@ def push_all(
     buffer: Buffer,
     config: SprintConfig,
     api: GoogleAPI | None = None,
+    outbox: Outbox | None = None,
+    drained: dict[str, str] | None = None,
 ) -> dict[str, str]:
-    """Push all buffer entries. Returns {label: 'ok' | 'error: ...'} for each.
+    """Push all buffer entries. Returns {label: 'ok' | 'queued: ...' | 'error: ...'}.
 
     Never raises — errors are captured in the result dict so the full
-    buffer is attempted even if some entries fail.
+    buffer is attempted even if some entries fail. With an outbox, entries
+    that fail for transient reasons (or can't be tried because GoogleAPI()
+    failed) are queued there instead, and so is anything bound for a
+    document that already has queued pushes, to keep their order.
+
+    Queued pushes are retried first; their results go into `drained` if
+    given (kept apart because an outbox label can match a buffer label).
     """
-    if api is None:
-        api = GoogleAPI()
+    with (trace.span("push.all", entries=len(buffer.entries)) as s,
+          outbox.locked() if outbox is not None else nullcontext()):
+        unavailable = None
+        if api is None:
+            try:
+                api = GoogleAPI()
+            except Exception as e:
+                if outbox is None or not is_transient(e):
+                    raise
+                unavailable = e
+        if outbox is not None and unavailable is None:
+            results = drain_outbox(outbox, api, force=True)
+            if drained is not None:
+                drained.update(results)
+
+        results: dict[str, str] = {}
+        for entry in buffer.entries:
+            cap = config.captures.get(entry.label)
+            if outbox is not None and cap is not None and (
+                    unavailable is not None or outbox.pending(cap.destination_id)):
+                reason = unavailable or "waiting behind earlier pushes"
+                outbox.add(entry.label, entry.content, cap, entry.source, error=str(reason))
+                results[entry.label] = f"queued: {reason}"
+                continue
+            try:
+                push_entry(entry, config, api=api)
+                results[entry.label] = "ok"
+            except Exception as e:
+                if outbox is not None and cap is not None and is_transient(e):
+                    outbox.add(entry.label, entry.content, cap, entry.source, error=str(e))
+                    results[entry.label] = f"queued: {e}"
+                else:
+                    results[entry.label] = f"error: {e}"
+        s.set(errors=sum(1 for v in results.values() if v.startswith("error")),
+              queued=sum(1 for v in results.values() if v.startswith("queued")))
+    return results
 
+
+def drain_outbox(
+    outbox: Outbox,
+    api: GoogleAPI | None = None,
+    force: bool = False,
+) -> dict[str, str]:
+    """Retry queued pushes, oldest first. Call with outbox.locked() held.
+
+    Items wait out their backoff unless force is set. Once a document's
+    oldest item can't go, later items for that document wait too; other
+    documents carry on. Non-transient failures are marked failed and left
+    in the outbox rather than dropped. Returns results like push_all().
+    """
+    now = time.time()
     results: dict[str, str] = {}
-    for entry in buffer.entries:
-        try:
-            push_entry(entry, config, api=api)
-            results[entry.label] = "ok"
-        except Exception as e:
-            results[entry.label] = f"error: {e}"
+    due = [i for i in outbox.items if i.due(now) or (force and not i.failed)]
+    if not due:
+        return results
+
+    with trace.span("push.drain", due=len(due)) as s:
+        if api is None:
+            try:
+                api = GoogleAPI(interactive=False)
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                for item in due:
+                    item.retry_later(e, now)
+                    results[item.label] = f"queued: {e}"
+                return results
+
+        blocked: set[str] = set()
+        for item in list(outbox.items):
+            dest = item.capture.destination_id
+            if item.failed or dest in blocked:
+                continue
+            if not (force or item.due(now)):
+                blocked.add(dest)       # still backing off; later items for it wait
+                continue
+            try:
+                with trace.span("push.entry", label=item.label, type=item.capture.type,
+                                bytes=len(item.content)):
+                    deliver(item.capture, item.content, api)
+                outbox.items.remove(item)
+                results[item.label] = "ok"
+            except Exception as e:
+                if is_transient(e):
+                    item.retry_later(e, now)
+                    blocked.add(dest)
+                    results[item.label] = f"queued: {e}"
+                else:
+                    item.failed, item.last_error = True, str(e)
+                    results[item.label] = f"error: {e}"
+        s.set(pushed=sum(1 for v in results.values() if v == "ok"))
     return results
+
@@ -0,0 +1,88 @@
+from __future__ import annotations
+import os
+import sys
+
+from sprint_hub import trace
+from sprint_hub.capture import Buffer, read_from_clipboard, read_from_stdin
+from sprint_hub.suggest import suggest_label
+
+# Fast path for sprint-capture, which runs from a keybinding where every
+# millisecond before the prompt shows is visible. Importing sprint_hub.cli
+# costs click plus yaml (via config) up front; this module handles the
+# everyday flags itself and only pays for yaml when a heading suggestion
+# actually needs the sprint config. Anything it doesn't recognise (--help,
+# --trace, typos) is handed to the Click command unchanged.
+
+_VALUE_OPTIONS = ("--label", "--command")
+
+
+def _parse(argv: list[str]) -> dict | None:
+    """Parse sprint-capture's options, or return None to defer to Click."""
+    opts = {"from_clipboard": False, "label": None, "command": None}
+    args = iter(argv)
+    for arg in args:
+        name, eq, value = arg.partition("=")
+        if arg == "--from-clipboard":
+            opts["from_clipboard"] = True
+        elif name in _VALUE_OPTIONS:
+            if not eq:
+                value = next(args, None)
+                if value is None:
+                    return None
+            opts[name[2:]] = value
+        else:
+            return None
+    return opts
+
+
+def _headings() -> list[str]:
+    from sprint_hub.config import SprintConfig
+    active = SprintConfig.get_active()
+    if active:
+        try:
+            return list(SprintConfig.load(active).captures.keys())
+        except Exception:
+            pass
+    return []
+
+
+def _prompt(text: str, default: str) -> str:
+    """click.prompt() look-alike: empty answer takes the default."""
+    try:
+        answer = input(f"{text} [{default}]: ")
+    except (EOFError, KeyboardInterrupt):
+        print("Aborted!", file=sys.stderr)
+        raise SystemExit(1)
+    return answer or default
+
+
+def capture(argv: list[str] | None = None) -> None:
+    """Entry point for sprint-capture."""
+    argv = sys.argv[1:] if argv is None else argv
+    opts = _parse(argv)
+    if opts is None or os.environ.get(trace.ENV_VAR, "0") not in ("", "0"):
+        from sprint_hub.cli import capture as click_capture
+        click_capture.main(args=argv, prog_name="sprint-capture")
+        return
+
+    if opts["from_clipboard"]:
+        content = read_from_clipboard()
+        source = "clipboard"
+    else:
+        content = read_from_stdin()
+        if content is None:
+            print("No input. Pipe something or use --from-clipboard.", file=sys.stderr)
+            raise SystemExit(1)
+        source = "pipe"
+
+    suggestion = opts["label"]
+    if not suggestion:
+        headings = [] if opts["command"] else _headings()
+        suggestion = suggest_label(content, command=opts["command"], headings=headings)
+    final_label = _prompt("Label", suggestion)
+
+    buf = Buffer.for_active_sprint()
+    buf.load()
+    buf.add(final_label, content, source=source)
+    buf.save()
+    print(f"Captured {content.count(chr(10)) + 1} lines as '{final_label}'.")
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import functools
 import re
 from typing import Optional
 
@@ -33,8 +34,9 @@ def suggest_label(
         return _COMMAND_MAP.get(base, _to_snake(f"{base}_output"))
 
     if headings:
-        first_line = text.strip().splitlines()[0] if text.strip() else ""
-        clean = re.sub(r"^#+\s*", "", first_line).strip()
+        # Only the first non-blank line matters; don't copy a multi-MB capture
+        first_line = _pattern(r"\s*([^\r\n]*)").match(text)[1]
+        clean = _pattern(r"^#+\s*").sub("", first_line).strip()
         for heading in headings:
             if heading.lower() in clean.lower():
                 return _to_snake(heading)
@@ -43,7 +45,14 @@ def suggest_label(
 
 
 def _to_snake(text: str) -> str:
-    text = re.sub(r"[^\w\s]", "_", text)
-    text = re.sub(r"\s+", "_", text.strip())
-    text = re.sub(r"_+", "_", text)
+    text = _pattern(r"[^\w\s]").sub("_", text)
+    text = _pattern(r"\s+").sub("_", text.strip())
+    text = _pattern(r"_+").sub("_", text)
     return text.lower().strip("_")
+
+
+@functools.cache
+def _pattern(regex: str) -> re.Pattern:
+    # Compiled on first use rather than at import: `sprint-capture --label`
+    # never suggests anything, so it shouldn't pay for the compiles
+    return re.compile(regex)
@@ -0,0 +1,236 @@
+from __future__ import annotations
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+ENV_VAR = "SPRINT_HUB_TRACE"
+TRACE_DIR = Path.home() / ".cache" / "sprint-hub" / "traces"
+
+# Module-level state: one trace per process. Everything below checks
+# _active first, so a disabled tracer costs a global lookup per span.
+_active = False
+_path: Optional[Path] = None
+_command = ""
+_origin = 0.0
+_spans: list["Span"] = []
+_lock = threading.Lock()
+_local = threading.local()
+
+
+@dataclass
+class Span:
+    name: str
+    start: float                     # seconds since the trace started
+    parent: Optional[int] = None
+    id: int = 0
+    duration: float = 0.0
+    attrs: dict = field(default_factory=dict)
+    error: Optional[str] = None
+    thread: int = 0
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, key: str, n: int = 1) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + n
+
+    # ── context manager ──────────────────────────────────────────────────────
+
+    def __enter__(self) -> "Span":
+        stack = _stack()
+        self.parent = stack[-1].id if stack else None
+        self.thread = threading.get_ident()
+        with _lock:
+            self.id = len(_spans) + 1
+            _spans.append(self)
+        stack.append(self)
+        self.start = time.perf_counter() - _origin
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration = time.perf_counter() - _origin - self.start
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        return False
+
+
+class _NoopSpan:
+    """Stand-in returned by span() when tracing is off."""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def add(self, key: str, n: int = 1) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def _stack() -> list[Span]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+# ── public API ────────────────────────────────────────────────────────────────
+
+def span(name: str, **attrs):
+    """Time a block: `with span("config.load", sprint=name) as s: ...`.
+
+    Returns a shared no-op object when tracing is disabled.
+    """
+    if not _active:
+        return _NOOP
+    return Span(name=name, start=0.0, attrs=attrs)
+
+
+def current():
+    """The innermost open span on this thread (a no-op span if none)."""
+    if not _active:
+        return _NOOP
+    stack = _stack()
+    return stack[-1] if stack else _NOOP
+
+
+def enabled() -> bool:
+    return _active
+
+
+def start(path: Optional[Path | str] = None, command: str = "sprint-hub") -> Path:
+    """Begin recording. Without a path the trace goes to TRACE_DIR."""
+    global _active, _path, _command, _origin
+    if path is None or str(path) in ("", "1", "auto"):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = TRACE_DIR / f"{command}-{stamp}.json"
+    _path = Path(path).expanduser()
+    _command = command
+    _origin = time.perf_counter()
+    _spans.clear()
+    _local.stack = []
+    _active = True
+    return _path
+
+
+def start_from_env(command: str) -> Optional[Path]:
+    """Start tracing if SPRINT_HUB_TRACE is set (to 1 or a file path)."""
+    value = os.environ.get(ENV_VAR, "")
+    if not value or value == "0":
+        return None
+    return start(value, command=command)
+
+
+def pop_argv(argv: list[str], command: str) -> Optional[Path]:
+    """Handle `--trace` / `--trace=PATH` for the bin/ tools and strip it from argv."""
+    for i, arg in enumerate(argv[1:], 1):
+        if arg == "--trace" or arg.startswith("--trace="):
+            del argv[i]
+            return start(arg.partition("=")[2] or None, command=command)
+    return start_from_env(command)
+
+
+def finish(out=None) -> Optional[Path]:
+    """Stop recording, write the JSON trace and print the summary table."""
+    global _active
+    if not _active:
+        return None
+    _active = False
+    out = out or sys.stderr
+    try:
+        _path.parent.mkdir(parents=True, exist_ok=True)
+        _path.write_text(json.dumps(to_chrome_trace(_spans, _command), indent=1))
+    except OSError as e:
+        print(f"trace: could not write {_path}: {e}", file=out)
+    print(summary(_spans), file=out)
+    print(f"trace: {len(_spans)} spans written to {_path}", file=out)
+    return _path
+
+
+def spans() -> list[Span]:
+    return list(_spans)
+
+
+# ── output ────────────────────────────────────────────────────────────────────
+
+def to_chrome_trace(recorded: list[Span], command: str) -> dict:
+    """Trace Event Format: loads in chrome://tracing and ui.perfetto.dev."""
+    events = []
+    for s in recorded:
+        args = dict(s.attrs, id=s.id, parent=s.parent)
+        if s.error:
+            args["error"] = s.error
+        events.append({
+            "name": s.name, "cat": s.name.split(".")[0], "ph": "X",
+            "ts": round(s.start * 1e6, 1), "dur": round(s.duration * 1e6, 1),
+            "pid": os.getpid(), "tid": s.thread, "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms",
+            "otherData": {"command": command}}
+
+
+def summary(recorded: list[Span]) -> str:
+    """Per-name totals: count, total/max time, bytes moved and retries."""
+    rows: dict[str, dict] = {}
+    for s in recorded:
+        row = rows.setdefault(s.name, {"count": 0, "total": 0.0, "max": 0.0,
+                                       "bytes": 0, "retries": 0, "errors": 0})
+        row["count"] += 1
+        row["total"] += s.duration
+        row["max"] = max(row["max"], s.duration)
+        row["bytes"] += s.attrs.get("bytes_in", 0) + s.attrs.get("bytes_out", 0) + s.attrs.get("bytes", 0)
+        row["retries"] += s.attrs.get("retries", 0)
+        row["errors"] += s.error is not None
+
+    width = max([len(n) for n in rows] + [4])
+    lines = [f"{'span':<{width}}  {'count':>5}  {'total ms':>9}  {'max ms':>8}  "
+             f"{'bytes':>9}  {'retries':>7}  {'errors':>6}"]
+    for name, r in sorted(rows.items(), key=lambda kv: -kv[1]["total"]):
+        lines.append(f"{name:<{width}}  {r['count']:>5}  {r['total'] * 1000:>9.1f}  "
+                     f"{r['max'] * 1000:>8.1f}  {r['bytes'] or '-':>9}  "
+                     f"{r['retries'] or '-':>7}  {r['errors'] or '-':>6}")
+    return "\n".join(lines)
+
+
+# ── http instrumentation ──────────────────────────────────────────────────────
+
+class TracedHttp:
+    """Wraps an httplib2.Http-like object so every round trip is a span.
+
+    Also counts attempts on the enclosing span, which is how GoogleAPI
+    works out retries for a single .execute().
+    """
+
+    def __init__(self, http):
+        self._http = http
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        parent = current()
+        sent = len(body) if isinstance(body, (bytes, str)) else 0
+        with span(f"http.{method}", url=str(uri).split("?")[0], bytes_out=sent) as s:
+            resp, content = self._http.request(uri, method, body, headers, *args, **kwargs)
+            s.set(status=getattr(resp, "status", None), bytes_in=len(content or b""))
+        if isinstance(parent, Span):
+            parent.add("attempts")
+            if parent.attrs["attempts"] > 1:
+                parent.add("retries")
+            parent.add("bytes_in", len(content or b""))
+            parent.add("bytes_out", sent)
+        return resp, content
+
+    def __getattr__(self, name):
+        return getattr(self._http, name)
@@ -8,8 +8,8 @@ import sprint_hub.capture as _cap_mod
 import sprint_hub.config as _cfg_mod
 from sprint_hub.capture import Buffer
 from sprint_hub.config import SprintConfig
+from sprint_hub.outbox import Outbox
 from sprint_hub.push import push_all
-from sprint_hub.google_api import GoogleAPI
 
 
 class BufferPanel(Vertical):
@@ -68,6 +68,8 @@ class SprintHubApp(App):
 
     def on_mount(self) -> None:
         self._load_state()
+        # sprint-drain runs in the background, so keep the count current
+        self.set_interval(30, self._refresh_outbox)
 
     def _load_state(self) -> None:
         config_dir = _cfg_mod.CONFIG_DIR
@@ -81,6 +83,24 @@ class SprintHubApp(App):
             self.query_one(SectionPanel).refresh_sections(
                 list(self._config.captures.keys())
             )
+        self._refresh_outbox()
+
+    def _outbox(self) -> Outbox:
+        return Outbox.for_config_dir(config_dir=_cfg_mod.CONFIG_DIR)
+
+    def _refresh_outbox(self) -> None:
+        outbox = self._outbox()
+        try:
+            outbox.load()
+        except (OSError, ValueError):
+            # Runs from a timer: a damaged outbox.json must not take the app down
+            self.sub_title = f"outbox: unreadable ({outbox.path})"
+            return
+        waiting, failed = outbox.depth()
+        parts = [f"{waiting} queued"] if waiting else []
+        if failed:
+            parts.append(f"{failed} failed (sprint-drain --status)")
+        self.sub_title = "outbox: " + ", ".join(parts) if parts else ""
 
     def action_delete_entry(self) -> None:
         lv = self.query_one("#buffer-list", ListView)
@@ -103,14 +123,26 @@ class SprintHubApp(App):
             return
         self.notify("Pushing…")
         try:
-            results = push_all(self._buffer, self._config, api=GoogleAPI())
-            ok  = sum(1 for v in results.values() if v == "ok")
-            err = sum(1 for v in results.values() if v != "ok")
-            self.notify(f"Done: {ok} pushed, {err} errors.")
-            if err == 0:
-                self._buffer.clear()
-                self._buffer.save()
-                self._load_state()
+            drained: dict[str, str] = {}
+            outbox = self._outbox()
+            results = push_all(self._buffer, self._config, outbox=outbox, drained=drained)
+            if outbox.set_aside:
+                self.notify(f"Outbox was unreadable; moved to {outbox.set_aside}.",
+                            severity="warning")
+            ok     = sum(1 for v in results.values() if v == "ok")
+            queued = sum(1 for v in results.values() if v.startswith("queued"))
+            err    = sum(1 for v in results.values() if v.startswith("error"))
+            message = f"Done: {ok} pushed, {queued} queued, {err} errors."
+            if drained:
+                sent = sum(1 for v in drained.values() if v == "ok")
+                message += f" Outbox: {sent} of {len(drained)} earlier pushes sent."
+            self.notify(message)
+            # Queued entries live in the outbox now; only errors stay here to fix
+            for label, result in results.items():
+                if not result.startswith("error"):
+                    self._buffer.remove(label)
+            self._buffer.save()
+            self._load_state()
         except Exception as e:
             # Strip extra quotes that KeyError.__str__ adds
             msg = str(e).strip('"')
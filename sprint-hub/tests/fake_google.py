@@ -0,0 +1,511 @@
+"""Local stand-in for the Google Docs and Sheets REST APIs.
+
+Serves the endpoints sprint-hub uses, with response bodies shaped like the
+real ones (section breaks, named styles, paragraph indices, tabs), so request
+counts and payload sizes are close to production:
+
+  Docs    GET  /v1/documents/{id}                     documents.get
+          POST /v1/documents/{id}:batchUpdate         insertText, replaceAllText
+  Sheets  GET  /v4/spreadsheets/{id}                  spreadsheets.get (fields=)
+          GET  /v4/spreadsheets/{id}/values/{range}   values.get
+          PUT  /v4/spreadsheets/{id}/values/{range}   values.update
+          GET  /v4/spreadsheets/{id}/values:batchGet
+          POST /v4/spreadsheets/{id}/values:batchUpdate
+
+Point a client at it with GoogleAPI.for_endpoint(server.url). Every request is
+logged with its operation, status, bytes and time; `latency` adds a fixed
+delay per request and `quota_every` / fail_next() inject 429 quota errors.
+"""
+from __future__ import annotations
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+QUOTA_ERROR = {
+    "code": 429,
+    "message": "Quota exceeded for quota metric 'Requests' and limit 'Requests per "
+               "minute per user' of service 'docs.googleapis.com'.",
+    "status": "RESOURCE_EXHAUSTED",
+}
+
+_STYLE_NAMES = ["NORMAL_TEXT", "TITLE", "SUBTITLE"] + [f"HEADING_{i}" for i in range(1, 7)]
+
+
+class ApiError(Exception):
+    def __init__(self, code: int, message: str, status: str):
+        super().__init__(message)
+        self.code, self.message, self.status = code, message, status
+
+
+@dataclass
+class LoggedRequest:
+    method: str
+    op: str
+    status: int
+    bytes_in: int
+    bytes_out: int
+    seconds: float
+
+
+@dataclass
+class FakeDoc:
+    title: str
+    paragraphs: list[list[str]]          # [namedStyleType, text ending in "\n"]
+    revision: int = 1
+
+    def text(self) -> str:
+        return "".join(text for _, text in self.paragraphs)
+
+
+@dataclass
+class FakeSheet:
+    title: str
+    sheets: dict[str, list[list[str]]] = field(default_factory=dict)
+
+
+# ── A1 notation ───────────────────────────────────────────────────────────────
+
+_CELL = re.compile(r"^([A-Z]+)?(\d+)?$")
+
+
+def _col_index(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n - 1
+
+
+def _col_letters(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def parse_range(a1: str) -> tuple[str, int, int, int | None, int | None]:
+    """'Sheet!B2:C5' → (sheet, row0, col0, row1, col1); open ends are None."""
+    sheet, _, cells = a1.partition("!")
+    sheet = sheet.strip("'")
+    if not cells:
+        return sheet, 0, 0, None, None
+    start, _, end = cells.upper().partition(":")
+    m1, m2 = _CELL.match(start), _CELL.match(end or start)
+    if not m1 or not m2:
+        raise ApiError(400, f"Unable to parse range: {a1}", "INVALID_ARGUMENT")
+    row0 = int(m1[2]) - 1 if m1[2] else 0
+    col0 = _col_index(m1[1]) if m1[1] else 0
+    row1 = int(m2[2]) - 1 if m2[2] else None
+    col1 = _col_index(m2[1]) if m2[1] else None
+    return sheet, row0, col0, row1, col1
+
+
+# ── response shapes ───────────────────────────────────────────────────────────
+
+def _named_styles() -> dict:
+    styles = []
+    for i, name in enumerate(_STYLE_NAMES):
+        size = {"TITLE": 26, "SUBTITLE": 15}.get(name, 11 if name == "NORMAL_TEXT" else 20 - 2 * i)
+        styles.append({
+            "namedStyleType": name,
+            "textStyle": {
+                "bold": name.startswith("HEADING") and i < 5, "italic": False, "underline": False,
+                "strikethrough": False, "smallCaps": False,
+                "backgroundColor": {},
+                "foregroundColor": {"color": {"rgbColor": {"red": 0.26, "green": 0.26, "blue": 0.26}}},
+                "fontSize": {"magnitude": size, "unit": "PT"},
+                "weightedFontFamily": {"fontFamily": "Arial", "weight": 400},
+                "baselineOffset": "NONE",
+            },
+            "paragraphStyle": {
+                "namedStyleType": name, "alignment": "START", "lineSpacing": 115,
+                "direction": "LEFT_TO_RIGHT", "spacingMode": "COLLAPSE_LISTS",
+                "spaceAbove": {"magnitude": 20 if name != "NORMAL_TEXT" else 0, "unit": "PT"},
+                "spaceBelow": {"magnitude": 6 if name != "NORMAL_TEXT" else 0, "unit": "PT"},
+                "borderBetween": {"color": {}, "width": {"unit": "PT"}, "padding": {"unit": "PT"},
+                                  "dashStyle": "SOLID"},
+                "indentFirstLine": {"unit": "PT"}, "indentStart": {"unit": "PT"},
+                "indentEnd": {"unit": "PT"}, "keepLinesTogether": False,
+                "keepWithNext": name != "NORMAL_TEXT", "avoidWidowAndOrphan": True,
+                "shading": {"backgroundColor": {}}, "pageBreakBefore": False,
+            },
+        })
+    return {"styles": styles}
+
+
+def _document_style() -> dict:
+    return {
+        "background": {"color": {}},
+        "pageNumberStart": 1,
+        "marginTop": {"magnitude": 72, "unit": "PT"}, "marginBottom": {"magnitude": 72, "unit": "PT"},
+        "marginRight": {"magnitude": 72, "unit": "PT"}, "marginLeft": {"magnitude": 72, "unit": "PT"},
+        "pageSize": {"height": {"magnitude": 792, "unit": "PT"}, "width": {"magnitude": 612, "unit": "PT"}},
+        "marginHeader": {"magnitude": 36, "unit": "PT"}, "marginFooter": {"magnitude": 36, "unit": "PT"},
+        "useCustomHeaderFooterMargins": True,
+    }
+
+
+def _body(doc: FakeDoc) -> dict:
+    content = [{"endIndex": 1, "sectionBreak": {"sectionStyle": {
+        "columnSeparatorStyle": "NONE", "contentDirection": "LEFT_TO_RIGHT",
+        "sectionType": "CONTINUOUS"}}}]
+    index = 1
+    for n, (style, text) in enumerate(doc.paragraphs):
+        end = index + len(text)
+        para_style = {"namedStyleType": style, "direction": "LEFT_TO_RIGHT"}
+        if style.startswith("HEADING"):
+            para_style["headingId"] = f"h.{n:06x}fake"
+        content.append({
+            "startIndex": index, "endIndex": end,
+            "paragraph": {
+                "elements": [{"startIndex": index, "endIndex": end,
+                              "textRun": {"content": text, "textStyle": {}}}],
+                "paragraphStyle": para_style,
+            },
+        })
+        index = end
+    return {"content": content}
+
+
+def _doc_resource(doc_id: str, doc: FakeDoc, tabs: bool) -> dict:
+    resource = {"title": doc.title, "documentId": doc_id,
+                "revisionId": f"ALm37BV{doc.revision:08d}", "suggestionsViewMode": "SUGGESTIONS_INLINE"}
+    parts = {"body": _body(doc), "documentStyle": _document_style(), "namedStyles": _named_styles()}
+    if tabs:
+        resource["tabs"] = [{"tabProperties": {"tabId": "t.0", "title": "Tab 1", "index": 0},
+                             "documentTab": parts}]
+    else:
+        resource.update(parts)
+    return resource
+
+
+def _select(obj, paths: list[list[str]]):
+    """Minimal `fields=` support: keep only the slash-separated paths given."""
+    if isinstance(obj, list):
+        return [_select(item, paths) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for key in {p[0] for p in paths}:
+        if key in obj:
+            rest = [p[1:] for p in paths if p[0] == key and len(p) > 1]
+            out[key] = _select(obj[key], rest) if rest else obj[key]
+    return out
+
+
+# ── server ────────────────────────────────────────────────────────────────────
+
+class FakeGoogle:
+    """Threaded stand-in server. Use as a context manager or start()/stop()."""
+
+    def __init__(self, latency: float = 0.0, quota_every: int = 0):
+        self.latency = latency              # seconds added to every request
+        self.quota_every = quota_every      # every Nth request gets a 429 (0: never)
+        self.documents: dict[str, FakeDoc] = {}
+        self.spreadsheets: dict[str, FakeSheet] = {}
+        self.log: list[LoggedRequest] = []
+        self._fail_next: list[int] = []
+        self._count = 0
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    # ── lifecycle ────────────────────────────────────────────────────────────
+
+    def start(self) -> "FakeGoogle":
+        fake = self
+
+        class Handler(_Handler):
+            server_fake = fake
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeGoogle":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/"
+
+    # ── fixtures ─────────────────────────────────────────────────────────────
+
+    def add_document(self, doc_id: str, sections: dict[str, str], title: str = "Report",
+                     heading_style: str = "HEADING_1") -> FakeDoc:
+        """A doc with one heading per section, each followed by its body text."""
+        paragraphs = [["TITLE", f"{title}\n"]]
+        for heading, body in sections.items():
+            paragraphs.append([heading_style, f"{heading}\n"])
+            for line in body.splitlines() or [""]:
+                paragraphs.append(["NORMAL_TEXT", f"{line}\n"])
+        doc = FakeDoc(title=title, paragraphs=paragraphs)
+        self.documents[doc_id] = doc
+        return doc
+
+    def add_spreadsheet(self, sheet_id: str, sheets: dict[str, list[list[str]]],
+                        title: str = "Worksheet") -> FakeSheet:
+        sheet = FakeSheet(title=title, sheets={k: [list(r) for r in v] for k, v in sheets.items()})
+        self.spreadsheets[sheet_id] = sheet
+        return sheet
+
+    def fail_next(self, count: int = 1, status: int = 429) -> None:
+        """Answer the next `count` requests with `status` (quota error body)."""
+        self._fail_next.extend([status] * count)
+
+    # ── stats ────────────────────────────────────────────────────────────────
+
+    def reset_log(self) -> None:
+        with self._lock:
+            self.log.clear()
+
+    def totals(self) -> dict:
+        return {
+            "requests": len(self.log),
+            "errors": sum(1 for r in self.log if r.status >= 400),
+            "bytes_in": sum(r.bytes_in for r in self.log),
+            "bytes_out": sum(r.bytes_out for r in self.log),
+        }
+
+    def ops(self) -> list[str]:
+        return [r.op for r in self.log]
+
+    # ── dispatch ─────────────────────────────────────────────────────────────
+
+    def _injected_failure(self) -> int | None:
+        with self._lock:
+            self._count += 1
+            if self._fail_next:
+                return self._fail_next.pop(0)
+            if self.quota_every and self._count % self.quota_every == 0:
+                return 429
+        return None
+
+    def dispatch(self, method: str, path: str, query: dict, body: dict | None) -> tuple[str, dict]:
+        m = re.fullmatch(r"/v1/documents/([^/:]+)(:batchUpdate)?", path)
+        if m:
+            doc = self.documents.get(m[1])
+            if doc is None:
+                raise ApiError(404, "Requested entity was not found.", "NOT_FOUND")
+            if m[2] and method == "POST":
+                return "docs.batchUpdate", self._doc_batch_update(m[1], doc, body or {})
+            if method == "GET":
+                tabs = query.get("includeTabsContent", ["false"])[0] == "true"
+                return "docs.get", _doc_resource(m[1], doc, tabs)
+
+        m = re.fullmatch(r"/v4/spreadsheets/([^/:]+)(?:/values(?:/(.+)|:(batchGet|batchUpdate)))?", path)
+        if m:
+            sheet = self.spreadsheets.get(m[1])
+            if sheet is None:
+                raise ApiError(404, "Requested entity was not found.", "NOT_FOUND")
+            if m[3] == "batchGet" and method == "GET":
+                return "sheets.values.batchGet", {
+                    "spreadsheetId": m[1],
+                    "valueRanges": [self._values_get(sheet, r) for r in query.get("ranges", [])],
+                }
+            if m[3] == "batchUpdate" and method == "POST":
+                return "sheets.values.batchUpdate", self._values_batch_update(m[1], sheet, body or {})
+            if m[2] and method == "GET":
+                return "sheets.values.get", self._values_get(sheet, m[2])
+            if m[2] and method == "PUT":
+                if "valueInputOption" not in query:
+                    raise ApiError(400, "'valueInputOption' is required but not specified",
+                                   "INVALID_ARGUMENT")
+                return "sheets.values.update", dict(self._values_update(sheet, m[2], body or {}),
+                                                    spreadsheetId=m[1])
+            if not m[2] and not m[3] and method == "GET":
+                resource = self._spreadsheet_resource(m[1], sheet)
+                if "fields" in query:
+                    paths = [f.strip().split("/") for f in query["fields"][0].split(",")]
+                    resource = _select(resource, paths)
+                return "sheets.get", resource
+        raise ApiError(404, f"Method not found: {method} {path}", "NOT_FOUND")
+
+    # ── docs ─────────────────────────────────────────────────────────────────
+
+    def _doc_batch_update(self, doc_id: str, doc: FakeDoc, body: dict) -> dict:
+        replies = []
+        with self._lock:
+            for n, request in enumerate(body.get("requests", [])):
+                if "insertText" in request:
+                    op = request["insertText"]
+                    self._insert_text(doc, op.get("location", {}).get("index", 0), op.get("text", ""), n)
+                    replies.append({})
+                elif "replaceAllText" in request:
+                    op = request["replaceAllText"]
+                    replies.append({"replaceAllText": {"occurrencesChanged": self._replace_all(doc, op)}})
+                else:
+                    raise ApiError(400, f"Invalid requests[{n}]: not supported by the stand-in",
+                                   "INVALID_ARGUMENT")
+            doc.revision += 1
+        return {"documentId": doc_id, "replies": replies,
+                "writeControl": {"requiredRevisionId": f"ALm37BV{doc.revision:08d}"}}
+
+    @staticmethod
+    def _insert_text(doc: FakeDoc, index: int, text: str, n: int) -> None:
+        # Body indices start at 1 (index 0 is the section break); inserting at
+        # the final newline's end is outside the segment, as in the real API.
+        end = 1 + len(doc.text())
+        if not 1 <= index < end:
+            raise ApiError(400, f"Invalid requests[{n}].insertText: Index {index} must be "
+                                f"less than the end index of the referenced segment, {end}.",
+                           "INVALID_ARGUMENT")
+        start = 1
+        for k, (style, para) in enumerate(doc.paragraphs):
+            if start <= index < start + len(para):
+                offset = index - start
+                merged = para[:offset] + text + para[offset:]
+                doc.paragraphs[k:k + 1] = [[style, line] for line in merged.splitlines(keepends=True)]
+                return
+            start += len(para)
+
+    @staticmethod
+    def _replace_all(doc: FakeDoc, op: dict) -> int:
+        contains = op.get("containsText", {})
+        flags = 0 if contains.get("matchCase") else re.IGNORECASE
+        pattern = re.compile(re.escape(contains.get("text", "")), flags)
+        replacement = op.get("replaceText", "")
+        total = 0
+        for para in doc.paragraphs:
+            para[1], count = pattern.subn(lambda _: replacement, para[1])
+            total += count
+        return total
+
+    # ── sheets ───────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _spreadsheet_resource(sheet_id: str, sheet: FakeSheet) -> dict:
+        return {
+            "spreadsheetId": sheet_id,
+            "properties": {"title": sheet.title, "locale": "en_GB", "autoRecalc": "ON_CHANGE",
+                           "timeZone": "Europe/London"},
+            "sheets": [
+                {"properties": {"sheetId": i, "title": name, "index": i, "sheetType": "GRID",
+                                "gridProperties": {"rowCount": max(1000, len(rows)), "columnCount": 26}}}
+                for i, (name, rows) in enumerate(sheet.sheets.items())
+            ],
+            "spreadsheetUrl": f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit",
+        }
+
+    @staticmethod
+    def _grid(sheet: FakeSheet, a1: str) -> tuple[list[list[str]], str, int, int, int | None, int | None]:
+        name, row0, col0, row1, col1 = parse_range(unquote(a1))
+        if name not in sheet.sheets:
+            raise ApiError(400, f"Unable to parse range: {a1}", "INVALID_ARGUMENT")
+        return sheet.sheets[name], name, row0, col0, row1, col1
+
+    def _values_get(self, sheet: FakeSheet, a1: str) -> dict:
+        grid, name, row0, col0, row1, col1 = self._grid(sheet, a1)
+        rows = grid[row0:None if row1 is None else row1 + 1]
+        values = [row[col0:None if col1 is None else col1 + 1] for row in rows]
+        while values and not any(values[-1]):
+            values.pop()
+        values = [list(_rstrip(r)) for r in values]
+        last_row = (row1 if row1 is not None else max(len(grid), 1000) - 1) + 1
+        last_col = _col_letters(col1 if col1 is not None else 25)
+        result = {"range": f"{name}!{_col_letters(col0)}{row0 + 1}:{last_col}{last_row}",
+                  "majorDimension": "ROWS"}
+        if values:
+            result["values"] = values
+        return result
+
+    def _values_update(self, sheet: FakeSheet, a1: str, body: dict) -> dict:
+        with self._lock:
+            grid, name, row0, col0, _, _ = self._grid(sheet, a1)
+            values = body.get("values", [])
+            for r, row in enumerate(values):
+                while len(grid) <= row0 + r:
+                    grid.append([])
+                target = grid[row0 + r]
+                for c, value in enumerate(row):
+                    while len(target) <= col0 + c:
+                        target.append("")
+                    target[col0 + c] = str(value)
+        cols = max((len(r) for r in values), default=0)
+        end = f"{_col_letters(col0 + max(cols, 1) - 1)}{row0 + max(len(values), 1)}"
+        return {"updatedRange": f"{name}!{_col_letters(col0)}{row0 + 1}:{end}",
+                "updatedRows": len(values), "updatedColumns": cols,
+                "updatedCells": sum(len(r) for r in values)}
+
+    def _values_batch_update(self, sheet_id: str, sheet: FakeSheet, body: dict) -> dict:
+        if "valueInputOption" not in body:
+            raise ApiError(400, "'valueInputOption' is required but not specified", "INVALID_ARGUMENT")
+        responses = [dict(self._values_update(sheet, d["range"], d), spreadsheetId=sheet_id)
+                     for d in body.get("data", [])]
+        return {
+            "spreadsheetId": sheet_id,
+            "totalUpdatedRows": sum(r["updatedRows"] for r in responses),
+            "totalUpdatedColumns": sum(r["updatedColumns"] for r in responses),
+            "totalUpdatedCells": sum(r["updatedCells"] for r in responses),
+            "totalUpdatedSheets": len({r["updatedRange"].split("!")[0] for r in responses}),
+            "responses": responses,
+        }
+
+
+def _rstrip(row: list[str]) -> list[str]:
+    while row and row[-1] == "":
+        row = row[:-1]
+    return row
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True      # otherwise delayed ACKs add ~40 ms per request
+    server_fake: FakeGoogle
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _handle(self, method: str) -> None:
+        started = time.perf_counter()
+        fake = self.server_fake
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        op = f"{method} {url.path}"
+        try:
+            if fake.latency:
+                time.sleep(fake.latency)
+            failure = fake._injected_failure()
+            if failure:
+                raise ApiError(failure, QUOTA_ERROR["message"], QUOTA_ERROR["status"])
+            body = json.loads(raw) if raw else None
+            op, payload = fake.dispatch(method, url.path, query, body)
+            status = 200
+        except ApiError as e:
+            status, payload = e.code, {"error": {"code": e.code, "message": e.message, "status": e.status}}
+        except (ValueError, KeyError, TypeError) as e:
+            status, payload = 400, {"error": {"code": 400, "message": str(e), "status": "INVALID_ARGUMENT"}}
+        data = json.dumps(payload, indent=2).encode()     # Google pretty-prints too
+        # Logged before replying so a client that has its answer sees the entry
+        with fake._lock:
+            fake.log.append(LoggedRequest(method, op, status, len(raw), len(data),
+                                          time.perf_counter() - started))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
@@ -0,0 +1,41 @@
+import json
+
+from benchmarks import bench_sprint
+from benchmarks.micro import BENCHMARKS, Result, compare
+
+
+def test_compare_flags_only_regressions_past_threshold():
+    results = [
+        Result(name="buffer.load", seconds=0.001, normalised=1.4, loops=10),
+        Result(name="config.load", seconds=0.001, normalised=1.6, loops=10),
+        Result(name="brand.new", seconds=0.001, normalised=9.0, loops=10),
+    ]
+    rows = compare(results, {"buffer.load": 1.0, "config.load": 1.0}, threshold=0.5)
+    assert [(r.name, bad) for r, _, bad in rows] == [
+        ("buffer.load", False), ("config.load", True), ("brand.new", False)]
+    assert rows[2][1] is None
+
+
+def test_benchmark_fixtures_build_and_run(tmp_path):
+    for name in ("buffer.add[200]", "config.load[200]", "find_heading_end_index[500p]"):
+        result = BENCHMARKS[name](tmp_path)()
+    assert result is not None       # the last heading exists in the generated doc
+
+
+def test_bench_sprint_flags_any_count_that_grew():
+    def result(op, requests, received):
+        return bench_sprint.Result(size=4, op=op, wall_ms=1.0, requests=requests,
+                                   bytes_sent=0, bytes_received=received, errors=0)
+    base = {"requests": 2, "bytes_sent": 0, "bytes_received": 1000}
+    rows = bench_sprint.compare(
+        [result("push", 2, 900), result("read_doc", 3, 1000), result("headings", 2, 1001),
+         result("read_sheet", 9, 9)],
+        {"push[4]": base, "read_doc[4]": base, "headings[4]": base})
+    assert [grew for _, grew in rows] == [[], ["requests"], ["bytes_received"], None]
+
+
+def test_bench_sprint_counts_match_baselines():
+    """Request and byte counts are deterministic, so the committed baselines must hold."""
+    baselines = json.loads(bench_sprint.BASELINE.read_text())["results"]
+    rows = bench_sprint.compare(bench_sprint.run([4], repeat=1), baselines)
+    assert [(r.key, grew) for r, grew in rows if grew or grew is None] == []
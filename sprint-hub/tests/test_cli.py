@@ -3,7 +3,8 @@ from unittest.mock import patch, MagicMock
 from click.testing import CliRunner
 import sprint_hub.config as cfg_mod
 import sprint_hub.capture as cap_mod
-from sprint_hub.cli import init, capture, remove, relabel, edit_entry
+from sprint_hub.cli import init, capture, remove, relabel, edit_entry, drain
+from sprint_hub.outbox import Outbox
 
 
 @pytest.fixture(autouse=True)
@@ -43,6 +44,7 @@ def patch_dirs(tmp_path, monkeypatch):
     monkeypatch.setattr(cfg_mod.SprintConfig, "load", classmethod(_load))
     monkeypatch.setattr(cfg_mod.SprintConfig, "create", classmethod(_create))
     monkeypatch.setattr(cap_mod.Buffer, "for_active_sprint", classmethod(_for_active))
+    monkeypatch.setattr(Outbox, "for_config_dir", classmethod(lambda cls: cls(path=cfg_dir / "outbox.json")))
 
 
 def test_init_creates_sprint():
@@ -126,6 +128,22 @@ def test_remove_nonexistent_label_exits_with_error():
     assert "not found" in result.output.lower()
 
 
+def test_remove_with_trace_writes_trace(tmp_path):
+    import json
+    from sprint_hub.capture import Buffer
+    runner = CliRunner()
+    runner.invoke(init, ["--name", "sprint-test"])
+    buf = Buffer(path=tmp_path / ".config" / "sprint-hub" / "buffer.json")
+    buf.add("port_scan", "nmap output")
+    buf.save()
+
+    trace_path = tmp_path / "trace.json"
+    result = runner.invoke(remove, ["port_scan", "--trace", str(trace_path)])
+    assert result.exit_code == 0, result.output
+    names = [e["name"] for e in json.loads(trace_path.read_text())["traceEvents"]]
+    assert names == ["cli.sprint-remove", "buffer.load", "buffer.save"]
+
+
 def test_relabel_renames_entry_in_place(tmp_path):
     from sprint_hub.capture import Buffer
     runner = CliRunner()
@@ -222,3 +240,92 @@ def test_init_without_credentials_still_creates_sprint(tmp_path, monkeypatch):
         )
     assert result.exit_code == 0, result.output
     assert "sprint-nocreds" in result.output
+
+
+def test_quick_capture_uses_heading_suggestion(monkeypatch, capsys):
+    from sprint_hub import quick
+    from sprint_hub.config import SprintConfig, Capture
+    runner = CliRunner()
+    runner.invoke(init, ["--name", "sprint-test"])
+    cfg = SprintConfig.load("sprint-test")
+    cfg.add_capture("Attack Vectors", Capture(destination_id="doc1", type="doc"))
+    cfg.save()
+    monkeypatch.setattr(quick, "read_from_stdin", lambda: "## Attack Vectors\nphishing")
+    monkeypatch.setattr("builtins.input", lambda prompt: "")
+
+    quick.capture([])
+    assert "'attack_vectors'" in capsys.readouterr().out
+    buf = cap_mod.Buffer.for_active_sprint()
+    buf.load()
+    assert [(e.label, e.source) for e in buf.entries] == [("attack_vectors", "pipe")]
+
+
+def test_quick_capture_label_option_and_abort(monkeypatch, capsys):
+    from sprint_hub import quick
+    monkeypatch.setattr(quick, "read_from_stdin", lambda: "loot")
+    monkeypatch.setattr("builtins.input", lambda prompt: "")
+    quick.capture(["--label=creds"])
+    assert "'creds'" in capsys.readouterr().out
+
+    def eof(prompt):
+        raise EOFError
+    monkeypatch.setattr("builtins.input", eof)
+    with pytest.raises(SystemExit) as exc:
+        quick.capture(["--command", "nmap"])
+    assert exc.value.code == 1
+    assert "Aborted!" in capsys.readouterr().err
+
+
+def test_quick_capture_defers_unknown_options_to_click(capsys):
+    from sprint_hub import quick
+    with pytest.raises(SystemExit) as exc:
+        quick.capture(["--help"])
+    assert exc.value.code == 0
+    assert "Usage: sprint-capture" in capsys.readouterr().out
+
+
+def test_drain_pushes_queued_and_reports_depth():
+    from sprint_hub.config import Capture
+    outbox = Outbox.for_config_dir()
+    with outbox.locked():
+        outbox.add("port_scan", "nmap output",
+                   Capture(destination_id="sheet123", type="sheet", sheet_name="Enum", cell="B4"))
+        outbox.add("notes", "text", Capture(destination_id="doc456", type="doc", heading="Notes"))
+        outbox.items[1].failed = True
+
+    runner = CliRunner()
+    result = runner.invoke(drain, ["--status"])
+    assert "1 waiting, 1 failed" in result.output
+
+    api = MagicMock()
+    with patch("sprint_hub.push.GoogleAPI", return_value=api) as google:
+        result = runner.invoke(drain, [])
+    assert result.exit_code == 0, result.output
+    google.assert_called_once_with(interactive=False)
+    api.write_sheet_cell.assert_called_once()
+    assert "1 pushed, 0 waiting, 1 failed." in result.output
+
+
+def test_drain_status_does_not_reset_failed_pushes():
+    from sprint_hub.config import Capture
+    outbox = Outbox.for_config_dir()
+    with outbox.locked():
+        outbox.add("notes", "text", Capture(destination_id="doc456", type="doc",
+                                            heading="Notes")).failed = True
+
+    result = CliRunner().invoke(drain, ["--status", "--retry-failed"])
+    assert result.exit_code == 1
+    outbox.load()
+    assert outbox.items[0].failed
+
+
+def test_drain_sets_a_corrupt_outbox_aside():
+    outbox = Outbox.for_config_dir()
+    outbox.path.parent.mkdir(parents=True, exist_ok=True)
+    outbox.path.write_text("not json")
+
+    result = CliRunner().invoke(drain, [])
+    assert result.exit_code == 0, result.output
+    assert "Outbox was unreadable; moved to" in result.output
+    assert "0 pushed, 0 waiting, 0 failed." in result.output
+    assert list(outbox.path.parent.glob("outbox.json.corrupt-*"))
@@ -127,3 +127,53 @@ def test_find_heading_end_index_returns_endIndex():
 def test_find_heading_end_index_returns_none_when_missing():
     doc = {"body": {"content": []}}
     assert GoogleAPI._find_heading_end_index(doc, "Missing Heading") is None
+
+
+def test_collections_are_built_once():
+    api = GoogleAPI.__new__(GoogleAPI)
+    api.sheets = MagicMock()
+    api.sheets.spreadsheets.return_value.get.return_value.execute.return_value = {"sheets": []}
+    api.get_sheet_names("sheet123")
+    api.get_sheet_names("sheet123")
+    assert api.sheets.spreadsheets.call_count == 1
+
+
+# ── against the local stand-in server ─────────────────────────────────────────
+
+@pytest.fixture
+def google():
+    from tests.fake_google import FakeGoogle
+    with FakeGoogle() as server:
+        server.add_spreadsheet("sheet123", {"Enumeration": [["Host", "Ports"], ["10.0.0.1", ""]],
+                                            "Loot": []})
+        server.add_document("doc456", {"Executive Summary": "Draft", "Findings": "TBD"})
+        yield server
+
+
+def test_fake_sheet_write_then_read(google):
+    api = GoogleAPI.for_endpoint(google.url)
+    api.write_sheet_cell("sheet123", "Enumeration", "B2", "22,80")
+    text = api.read_sheet("sheet123")
+    assert "10.0.0.1\t22,80" in text
+    assert "=== Loot ===" in text
+    assert google.ops() == ["sheets.values.update", "sheets.get",
+                            "sheets.values.get", "sheets.values.get"]
+
+
+def test_fake_doc_append_to_heading(google):
+    api = GoogleAPI.for_endpoint(google.url)
+    assert api.get_doc_headings("doc456") == ["Executive Summary", "Findings"]
+    api.append_to_heading("doc456", "executive summary", "nmap output")
+    assert "nmap output" in api.read_doc_text("doc456")
+    assert google.ops()[1:3] == ["docs.get", "docs.batchUpdate"]
+
+
+def test_fake_quota_error_surfaces_as_http_error(google):
+    from googleapiclient.errors import HttpError
+    api = GoogleAPI.for_endpoint(google.url)
+    google.fail_next(1)
+    with pytest.raises(HttpError) as exc:
+        api.get_sheet_names("sheet123")
+    assert exc.value.resp.status == 429
+    assert api.get_sheet_names("sheet123") == ["Enumeration", "Loot"]
+    assert google.totals()["errors"] == 1
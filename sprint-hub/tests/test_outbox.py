@@ -0,0 +1,156 @@
+import httplib2
+import pytest
+from unittest.mock import MagicMock
+from googleapiclient.errors import HttpError
+from sprint_hub.capture import Buffer
+from sprint_hub.config import Capture, SprintConfig
+from sprint_hub.google_api import AuthRequired
+from sprint_hub.outbox import Outbox, is_transient
+from sprint_hub.push import drain_outbox, push_all
+
+SHEET = Capture(destination_id="sheet123", type="sheet", sheet_name="Enumeration", cell="B4")
+DOC = Capture(destination_id="doc456", type="doc", heading="Executive Summary")
+
+
+def http_error(status: int) -> HttpError:
+    return HttpError(httplib2.Response({"status": status}), b"{}")
+
+
+@pytest.fixture
+def config(tmp_path):
+    cfg = SprintConfig.create("sprint-test", config_dir=tmp_path)
+    cfg.add_capture("port_scan", SHEET)
+    cfg.add_capture("exec_summary", DOC)
+    return cfg
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return Outbox.for_config_dir(tmp_path)
+
+
+def test_outbox_round_trip_keeps_target(outbox):
+    with outbox.locked():
+        outbox.add("port_scan", "nmap output", SHEET, source="pipe", error="offline")
+    reloaded = Outbox(path=outbox.path)
+    reloaded.load()
+    item = reloaded.items[0]
+    assert (item.label, item.content, item.capture) == ("port_scan", "nmap output", SHEET)
+    assert reloaded.depth() == (1, 0)
+
+
+def test_is_transient():
+    assert is_transient(http_error(503))
+    assert is_transient(http_error(429))
+    assert is_transient(FileNotFoundError("credentials.json not found"))
+    assert is_transient(httplib2.ServerNotFoundError("no network"))
+    assert is_transient(AuthRequired("sign in"))
+    assert not is_transient(http_error(400))
+    assert not is_transient(ValueError("Heading 'X' not found in document"))
+
+
+def test_push_all_queues_when_api_unavailable(config, outbox, tmp_path, monkeypatch):
+    def offline():
+        raise httplib2.ServerNotFoundError("Unable to find the server at oauth2.googleapis.com")
+    monkeypatch.setattr("sprint_hub.push.GoogleAPI", offline)
+    buf = Buffer(path=tmp_path / "buffer.json")
+    buf.add("port_scan", "nmap output")
+    buf.add("unmapped", "text")
+
+    results = push_all(buf, config, outbox=outbox)
+    assert results["port_scan"].startswith("queued: Unable to find")
+    assert results["unmapped"].startswith("error:")
+    outbox.load()
+    assert [i.label for i in outbox.items] == ["port_scan"]
+
+
+def test_push_all_queues_behind_pending_document(config, outbox, tmp_path):
+    with outbox.locked():
+        outbox.add("older", "first", DOC).next_attempt = float("inf")
+    buf = Buffer(path=tmp_path / "buffer.json")
+    buf.add("exec_summary", "second")
+    buf.add("port_scan", "nmap output")
+    api = MagicMock()
+    api.append_to_heading.side_effect = http_error(503)     # the forced retry of "older"
+
+    results = push_all(buf, config, api=api, outbox=outbox)
+    assert results["exec_summary"] == "queued: waiting behind earlier pushes"
+    assert results["port_scan"] == "ok"
+    outbox.load()
+    assert [i.content for i in outbox.items] == ["first", "second"]
+
+
+def test_push_all_reports_drained_pushes_separately(config, outbox, tmp_path):
+    with outbox.locked():
+        outbox.add("port_scan", "yesterday's scan", SHEET)
+    buf = Buffer(path=tmp_path / "buffer.json")
+    buf.add("port_scan", "today's scan")
+    api = MagicMock()
+    api.write_sheet_cell.side_effect = [None, http_error(400)]
+
+    drained = {}
+    results = push_all(buf, config, api=api, outbox=outbox, drained=drained)
+    # Same label, different pushes: the queued one went, the new one was rejected
+    assert drained == {"port_scan": "ok"}
+    assert results["port_scan"].startswith("error:")
+    outbox.load()
+    assert outbox.items == []
+
+
+def test_drain_keeps_per_document_order(outbox):
+    outbox.add("a", "doc 1", DOC)
+    outbox.add("b", "sheet 1", SHEET)
+    outbox.add("c", "doc 2", DOC)
+    api = MagicMock()
+    api.append_to_heading.side_effect = [http_error(503)]
+
+    results = drain_outbox(outbox, api=api)
+    # doc456 stopped at its first failure, so "c" was not tried ahead of "a"
+    assert results["a"].startswith("queued: <HttpError 503")
+    assert results["b"] == "ok"
+    assert "c" not in results
+    assert [i.label for i in outbox.items] == ["a", "c"]
+    assert outbox.items[0].attempts == 1
+    assert outbox.items[0].next_attempt > outbox.items[0].queued_at
+
+    # Still backing off: nothing for doc456 goes until "a" is due
+    assert drain_outbox(outbox, api=api) == {}
+    api.append_to_heading.side_effect = None
+    assert drain_outbox(outbox, api=api, force=True) == {"a": "ok", "c": "ok"}
+    assert [c.kwargs["content"] for c in api.append_to_heading.call_args_list[1:]] == ["doc 1", "doc 2"]
+
+
+def test_drain_marks_rejected_pushes_failed(outbox):
+    outbox.add("a", "doc 1", DOC)
+    outbox.add("c", "doc 2", DOC)
+    api = MagicMock()
+    api.append_to_heading.side_effect = [ValueError("Heading 'Executive Summary' not found"), None]
+
+    results = drain_outbox(outbox, api=api)
+    assert results["a"].startswith("error:")
+    assert results["c"] == "ok"
+    assert outbox.depth() == (0, 1)
+    assert drain_outbox(outbox, api=api, force=True) == {}
+
+
+def test_push_all_sets_a_corrupt_outbox_aside_and_still_pushes(config, outbox, tmp_path):
+    outbox.path.write_text('[{"label": "half-writ')
+    buf = Buffer(path=tmp_path / "buffer.json")
+    buf.add("port_scan", "nmap output")
+    api = MagicMock()
+
+    results = push_all(buf, config, api=api, outbox=outbox)
+    assert results == {"port_scan": "ok"}
+    api.write_sheet_cell.assert_called_once()
+    assert outbox.set_aside is not None
+    assert outbox.set_aside.read_text() == '[{"label": "half-writ'
+    assert outbox.set_aside.name.startswith("outbox.json.corrupt-")
+    outbox.load()                   # a fresh, valid (empty) queue was saved
+    assert outbox.items == []
+
+
+@pytest.mark.parametrize("text", ['{"label": "x"}', '[{"label": "x"}]', '[1]', '7'])
+def test_load_reports_foreign_json_as_value_error(outbox, text):
+    outbox.path.write_text(text)
+    with pytest.raises(ValueError, match="not an outbox"):
+        outbox.load()
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Import time of the sprint-capture fast path, measured with -S so site
+# packages can't pre-import anything on its behalf. Around 45ms when the
+# budget was set, most of it json, dataclasses and pathlib.
+STARTUP_BUDGET_MS = 75
+
+# What the fast path exists to avoid loading
+DEFERRED = {"click", "yaml", "sprint_hub.cli", "sprint_hub.config", "subprocess",
+            "textual", "googleapiclient"}
+
+
+def importtime(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds for each module, from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-S", "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_quick_capture_defers_heavy_imports():
+    loaded = importtime("sprint_hub.quick")
+    assert DEFERRED.isdisjoint(loaded), DEFERRED & loaded.keys()
+
+
+def test_quick_capture_import_within_budget():
+    # Best of three: the budget is for regressions, not a noisy neighbour
+    best = min(importtime("sprint_hub.quick")["sprint_hub.quick"] for _ in range(3)) / 1000
+    assert best < STARTUP_BUDGET_MS, f"sprint_hub.quick imports in {best:.1f}ms (budget {STARTUP_BUDGET_MS}ms)"
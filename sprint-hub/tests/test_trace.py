@@ -0,0 +1,92 @@
+import json
+import pytest
+from types import SimpleNamespace
+from sprint_hub import trace
+from sprint_hub.google_api import GoogleAPI
+
+
+@pytest.fixture
+def tracing(tmp_path):
+    path = trace.start(tmp_path / "trace.json", command="test")
+    yield path
+    trace.finish()
+
+
+class FakeHttp:
+    """httplib2-style object: answers with each (status, body) in turn."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        status, content = self.responses.pop(0)
+        return SimpleNamespace(status=status), content
+
+
+def test_span_is_noop_when_disabled():
+    assert not trace.enabled()
+    before = len(trace.spans())
+    with trace.span("config.load") as s:
+        s.set(bytes=10)
+    assert s is trace.span("anything else")
+    assert len(trace.spans()) == before
+
+
+def test_nested_spans_record_parent_and_error(tracing):
+    with trace.span("push.all") as outer:
+        with pytest.raises(ValueError):
+            with trace.span("push.entry", label="port_scan"):
+                raise ValueError("bad cell")
+    inner = trace.spans()[1]
+    assert inner.parent == outer.id
+    assert inner.attrs["label"] == "port_scan"
+    assert inner.error == "ValueError: bad cell"
+    assert outer.duration >= inner.duration
+
+
+def test_finish_writes_chrome_trace_and_summary(tmp_path, capsys):
+    path = trace.start(tmp_path / "out" / "trace.json", command="sprint-capture")
+    with trace.span("buffer.save") as s:
+        s.set(bytes=512)
+    assert trace.finish() == path
+    assert not trace.enabled()
+
+    data = json.loads(path.read_text())
+    event = data["traceEvents"][0]
+    assert event["name"] == "buffer.save"
+    assert event["ph"] == "X"
+    assert event["args"]["bytes"] == 512
+    err = capsys.readouterr().err
+    assert "buffer.save" in err
+    assert "512" in err
+
+
+def test_traced_http_counts_bytes_and_retries(tracing):
+    http = trace.TracedHttp(FakeHttp((503, b"busy"), (200, b'{"title": "Report"}')))
+    with trace.span("google.docs.get") as s:
+        http.request("https://docs.googleapis.com/v1/documents/abc?alt=json", "GET")
+        http.request("https://docs.googleapis.com/v1/documents/abc?alt=json", "GET")
+    assert s.attrs["attempts"] == 2
+    assert s.attrs["retries"] == 1
+    assert s.attrs["bytes_in"] == len(b"busy") + len(b'{"title": "Report"}')
+    http_spans = [x for x in trace.spans() if x.name == "http.GET"]
+    assert [x.attrs["status"] for x in http_spans] == [503, 200]
+    assert http_spans[0].attrs["url"] == "https://docs.googleapis.com/v1/documents/abc"
+
+
+def test_google_execute_is_wrapped_in_a_span(tracing):
+    request = SimpleNamespace(execute=lambda: {"sheets": []})
+    assert GoogleAPI._execute("sheets.get", request) == {"sheets": []}
+    assert [s.name for s in trace.spans()] == ["google.sheets.get"]
+
+
+def test_pop_argv_strips_flag(tmp_path, monkeypatch):
+    monkeypatch.delenv(trace.ENV_VAR, raising=False)
+    argv = ["gdoc-read", f"--trace={tmp_path / 't.json'}", "doc123"]
+    try:
+        assert trace.pop_argv(argv, "gdoc-read") == tmp_path / "t.json"
+        assert argv == ["gdoc-read", "doc123"]
+        assert trace.enabled()
+    finally:
+        trace.finish()
+    assert trace.pop_argv(["gdoc-read", "doc123"], "gdoc-read") is None
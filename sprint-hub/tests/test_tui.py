@@ -72,3 +72,36 @@ async def test_tui_shows_buffer_entries(tmp_path):
     async with app.run_test() as pilot:
         assert "sprint-test" in app.title
         await pilot.press("q")
+
+
+@pytest.mark.asyncio
+async def test_tui_shows_outbox_depth(tmp_path):
+    from sprint_hub.tui import SprintHubApp
+    from sprint_hub.outbox import Outbox
+
+    outbox = Outbox.for_config_dir(tmp_path / ".config" / "sprint-hub")
+    with outbox.locked():
+        outbox.add("port_scan", "nmap output", cfg_mod.Capture(destination_id="s1", type="sheet"))
+        outbox.add("notes", "text", cfg_mod.Capture(destination_id="d1", type="doc"))
+
+    app = SprintHubApp()
+    async with app.run_test() as pilot:
+        assert app.sub_title == "outbox: 2 queued"
+        await pilot.press("q")
+
+
+@pytest.mark.asyncio
+async def test_tui_survives_unreadable_outbox(tmp_path):
+    from sprint_hub.tui import SprintHubApp
+
+    path = tmp_path / ".config" / "sprint-hub" / "outbox.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('[{"label": "half-writ')
+
+    app = SprintHubApp()
+    async with app.run_test() as pilot:
+        assert app.sub_title == f"outbox: unreadable ({path})"
+        path.write_text("[]")
+        app._refresh_outbox()       # what the 30s timer does
+        assert app.sub_title == ""
+        await pilot.press("q")